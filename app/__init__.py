@@ -4,6 +4,8 @@ import os
 from dotenv import load_dotenv
 from pathlib import Path
 from app.logger import get_logger
+from app.gemini_client import GeminiClientRegistry
+from app.answer_cache import AnswerCache
 
 load_dotenv()
 logger = get_logger()
@@ -36,6 +38,21 @@ def create_app():
     else:
         logger.warning('Gemini API key is not configured!')
 
+    # 공용 GeminiClient 레지스트리 (요청마다 새 연결을 만들지 않도록 프로세스당 1회 생성)
+    http_timeout = os.getenv('GEMINI_HTTP_TIMEOUT_MS')
+    app.config['GEMINI_HTTP_OPTIONS'] = {'timeout': int(http_timeout)} if http_timeout else None
+    app.extensions['gemini_clients'] = GeminiClientRegistry(app.config['GEMINI_HTTP_OPTIONS'])
+    logger.info('Gemini client registry initialized')
+
+    # 검색 답변 캐시 (정규화된 질문 + 활성 스토어 + 스토어 버전 기준)
+    app.config['ANSWER_CACHE_TTL'] = int(os.getenv('ANSWER_CACHE_TTL', 3600))
+    app.config['ANSWER_CACHE_MAX_ENTRIES'] = int(os.getenv('ANSWER_CACHE_MAX_ENTRIES', 512))
+    app.extensions['answer_cache'] = AnswerCache(
+        max_entries=app.config['ANSWER_CACHE_MAX_ENTRIES'],
+        ttl_seconds=app.config['ANSWER_CACHE_TTL']
+    )
+    logger.info('Answer cache initialized')
+
     # Route registration
     from app import routes
     app.register_blueprint(routes.bp)
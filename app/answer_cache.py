@@ -0,0 +1,196 @@
+"""
+Answer cache for FileSearch chat
+Caches generated answers keyed by normalized query, active store set and store content version
+"""
+import re
+import time
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Optional, List, Dict, Any, Tuple
+from app.logger import get_logger
+from app.db import get_store_versions, bump_store_version
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a query for cache lookup
+
+    Applies NFKC, lowercases, strips punctuation and collapses whitespace
+    (e.g., '  주차 요금?? ' -> '주차 요금')
+    """
+    text = unicodedata.normalize('NFKC', query or '').lower()
+    text = re.sub(r'[^\w\s]', ' ', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def _char_bigrams(text: str) -> frozenset:
+    """Character bigrams of a normalized query (whitespace ignored)"""
+    compact = text.replace(' ', '')
+    if len(compact) < 2:
+        return frozenset([compact]) if compact else frozenset()
+    return frozenset(compact[i:i + 2] for i in range(len(compact) - 1))
+
+
+def _jaccard(a: frozenset, b: frozenset) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class AnswerCache:
+    """
+    Thread-safe TTL + LRU cache of FileSearch answers
+
+    Entries are keyed by (normalized query, sorted store names, store versions).
+    A lookup first tries an exact match, then a near-duplicate match based on
+    character bigram similarity among entries for the same store set/version.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: int = 3600, similarity_threshold: float = 0.85):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Maximum number of cached answers (least recently used are evicted)
+            ttl_seconds: Time-to-live of a cached answer
+            similarity_threshold: Minimum bigram Jaccard similarity for a near-duplicate hit
+        """
+        self.logger = get_logger()
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+
+        # key -> {'result': dict, 'expires_at': float, 'bigrams': frozenset}
+        self._entries: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._stats = {
+            'hits': 0,
+            'near_hits': 0,
+            'misses': 0,
+            'stores': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'invalidations': 0
+        }
+
+    def _scope(self, store_names: List[str]) -> Tuple:
+        """(store names, store versions) part of the cache key"""
+        stores = tuple(sorted(store_names))
+        versions = get_store_versions(stores)
+        return stores, tuple(versions[name] for name in stores)
+
+    def get(self, query: str, store_names: List[str]) -> Tuple[Optional[Dict[str, Any]], Optional[Tuple]]:
+        """
+        Look up a cached answer
+
+        Args:
+            query: Raw user query
+            store_names: Active FileSearchStore names
+
+        Returns:
+            (cached search result dict or None on miss, scope used for the lookup)
+            Pass the scope to put() so an answer generated on a miss is stored under
+            the store versions it was generated against, even if a store is bumped meanwhile.
+        """
+        normalized = normalize_query(query)
+        if not normalized:
+            return None, None
+
+        scope = self._scope(store_names)
+        key = (normalized,) + scope
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry['expires_at'] > now:
+                    self._entries.move_to_end(key)
+                    self._stats['hits'] += 1
+                    return entry['result'], scope
+                del self._entries[key]
+                self._stats['expirations'] += 1
+
+            # Near-duplicate lookup within the same store set/version
+            query_bigrams = _char_bigrams(normalized)
+            best_key, best_score = None, 0.0
+            for entry_key, candidate in self._entries.items():
+                if entry_key[1:] != scope or candidate['expires_at'] <= now:
+                    continue
+                score = _jaccard(query_bigrams, candidate['bigrams'])
+                if score > best_score:
+                    best_key, best_score = entry_key, score
+
+            if best_key is not None and best_score >= self.similarity_threshold:
+                self._entries.move_to_end(best_key)
+                self._stats['near_hits'] += 1
+                self.logger.debug(f"Answer cache near-duplicate hit: '{normalized}' ~ '{best_key[0]}' ({best_score:.2f})")
+                return self._entries[best_key]['result'], scope
+
+            self._stats['misses'] += 1
+            return None, scope
+
+    def put(self, query: str, store_names: List[str], result: Dict[str, Any],
+            scope: Optional[Tuple] = None) -> None:
+        """
+        Store a successful search result
+
+        Args:
+            query: Raw user query
+            store_names: Active FileSearchStore names
+            result: Search result dict returned by GeminiClient
+            scope: Scope returned by the get() that missed (defaults to the current store versions)
+        """
+        normalized = normalize_query(query)
+        if not normalized or not result.get('success'):
+            return
+
+        key = (normalized,) + (scope if scope is not None else self._scope(store_names))
+
+        with self._lock:
+            self._entries[key] = {
+                'result': result,
+                'expires_at': time.time() + self.ttl_seconds,
+                'bigrams': _char_bigrams(normalized)
+            }
+            self._entries.move_to_end(key)
+            self._stats['stores'] += 1
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def invalidate_store(self, store_name: str) -> None:
+        """
+        Invalidate cached answers that depend on a store
+
+        Bumps the persisted store version (so other processes miss as well)
+        and drops local entries that include the store.
+        """
+        bump_store_version(store_name)
+
+        with self._lock:
+            stale_keys = [key for key in self._entries if store_name in key[1]]
+            for key in stale_keys:
+                del self._entries[key]
+            self._stats['invalidations'] += 1
+
+        self.logger.info(f"Answer cache invalidated for store {store_name} ({len(stale_keys)} entries dropped)")
+
+    def clear(self) -> None:
+        """Drop all cached answers"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = len(self._entries)
+
+        lookups = stats['hits'] + stats['near_hits'] + stats['misses']
+        stats['hit_rate'] = (stats['hits'] + stats['near_hits']) / lookups if lookups else 0.0
+        stats['max_entries'] = self.max_entries
+        stats['ttl_seconds'] = self.ttl_seconds
+        return stats
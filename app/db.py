@@ -1,7 +1,11 @@
 import sqlite3
 import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Optional, Dict, Iterable, List, Tuple, Any
 from app.logger import get_logger
 
 logger = get_logger()
@@ -11,35 +15,275 @@ DB_DIR = Path(__file__).parent.parent / 'data'
 DB_DIR.mkdir(exist_ok=True)
 DB_PATH = DB_DIR / 'document_mappings.db'
 
+# Touched on every config write so other processes can detect changes with a stat()
+CONFIG_STAMP_PATH = DB_DIR / 'config.stamp'
+
+# Config key prefix for per-store content versions
+STORE_VERSION_PREFIX = 'store_version:'
+
+# Connection pool settings
+POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 8))
+BUSY_TIMEOUT_SECONDS = 30
+# Per-connection prepared statement cache (statements are keyed by SQL text)
+STATEMENT_CACHE_SIZE = 256
+
+# SQLite limits bound parameters per statement (999 on older builds)
+MAX_BULK_PARAMS = 900
+
+
+class _ConnectionPool:
+    """
+    Pool of SQLite connections shared by all threads
+
+    Connections run in WAL mode so readers never block the writer, and each
+    keeps its own prepared statement cache. A thread that already holds a
+    connection (nested helper calls) keeps using it instead of borrowing another.
+    """
+
+    def __init__(self, db_path: Path, size: int):
+        self.db_path = db_path
+        self.size = size
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=size)
+        self._local = threading.local()
+        self._pid = os.getpid()
+        self._reset_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=BUSY_TIMEOUT_SECONDS,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE
+        )
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA busy_timeout={BUSY_TIMEOUT_SECONDS * 1000}')
+        return conn
+
+    def _check_fork(self) -> None:
+        """Drop connections inherited from a parent process (e.g. pre-forking servers)"""
+        if self._pid == os.getpid():
+            return
+        with self._reset_lock:
+            if self._pid != os.getpid():
+                self._idle = queue.LifoQueue(maxsize=self.size)
+                self._local = threading.local()
+                self._pid = os.getpid()
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._connect()
+
+    def _release(self, conn: sqlite3.Connection) -> None:
+        if conn.in_transaction:
+            conn.rollback()
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection for the current thread"""
+        self._check_fork()
+        local = self._local
+        if getattr(local, 'conn', None) is not None:
+            local.depth += 1
+            try:
+                yield local.conn
+            finally:
+                local.depth -= 1
+            return
+
+        local.conn = self._acquire()
+        local.depth = 1
+        local.tx_depth = 0
+        try:
+            yield local.conn
+        finally:
+            conn = local.conn
+            local.conn = None
+            local.depth = 0
+            self._release(conn)
+
+    @contextmanager
+    def transaction(self):
+        """Borrow a connection; commit when the outermost transaction succeeds, roll back on error"""
+        with self.connection() as conn:
+            local = self._local
+            local.tx_depth += 1
+            try:
+                yield conn
+                if local.tx_depth == 1:
+                    conn.commit()
+            except Exception:
+                if local.tx_depth == 1 and conn.in_transaction:
+                    conn.rollback()
+                raise
+            finally:
+                local.tx_depth -= 1
+
+    def close_all(self) -> None:
+        """Close idle connections"""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+_pool = _ConnectionPool(DB_PATH, POOL_SIZE)
+
+
+def db_connection():
+    """
+    Context manager yielding a pooled connection (read access)
+
+    Example:
+        with db_connection() as conn:
+            rows = conn.execute('SELECT ...', params).fetchall()
+    """
+    return _pool.connection()
+
+
+def db_transaction():
+    """
+    Context manager yielding a pooled connection inside a transaction
+
+    Commits on success and rolls back on error. Nested use in the same thread
+    joins the outer transaction.
+    """
+    return _pool.transaction()
+
+
+def fetch_one(sql: str, params: Iterable[Any] = ()) -> Optional[Tuple]:
+    """Run a query and return the first row (or None)"""
+    with db_connection() as conn:
+        return conn.execute(sql, tuple(params)).fetchone()
+
+
+def fetch_all(sql: str, params: Iterable[Any] = ()) -> List[Tuple]:
+    """Run a query and return all rows"""
+    with db_connection() as conn:
+        return conn.execute(sql, tuple(params)).fetchall()
+
+
+def execute(sql: str, params: Iterable[Any] = ()) -> int:
+    """Run a write statement in its own transaction and return the affected row count"""
+    with db_transaction() as conn:
+        return conn.execute(sql, tuple(params)).rowcount
+
+
+def execute_many(sql: str, rows: Iterable[Iterable[Any]]) -> int:
+    """Run a write statement for many parameter rows in one transaction"""
+    with db_transaction() as conn:
+        return conn.executemany(sql, (tuple(row) for row in rows)).rowcount
+
+
+def _chunks(items: List[Any], size: int = MAX_BULK_PARAMS):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+class _ConfigCache:
+    """
+    In-process copy of the config table
+
+    Reads are served from memory. Every config write replaces a small stamp
+    file next to the database; readers compare its stat() signature, so changes
+    made by other processes (e.g. data updaters bumping store versions) are
+    picked up without querying SQLite on each read.
+    """
+
+    def __init__(self, stamp_path: Path):
+        self.stamp_path = stamp_path
+        self._lock = threading.Lock()
+        self._values: Optional[Dict[str, str]] = None
+        self._signature = None
+        self._version = 0
+
+    def _stamp_signature(self):
+        try:
+            st = os.stat(self.stamp_path)
+            return (st.st_mtime_ns, st.st_size, st.st_ino)
+        except FileNotFoundError:
+            return None
+
+    def snapshot(self) -> Tuple[int, Dict[str, str]]:
+        """
+        Current config values and their version stamp
+
+        Returns:
+            (version, values): version increases whenever the values are reloaded
+        """
+        signature = self._stamp_signature()
+        with self._lock:
+            if self._values is not None and signature == self._signature:
+                return self._version, self._values
+
+        # Signature is read before the query, so a concurrent write only causes one extra reload
+        rows = fetch_all('SELECT key, value FROM config')
+
+        with self._lock:
+            self._values = dict(rows)
+            self._signature = signature
+            self._version += 1
+            return self._version, self._values
+
+    def invalidate(self) -> None:
+        """Publish a config change to this and other processes"""
+        tmp_path = self.stamp_path.with_name(f"{self.stamp_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            tmp_path.write_text(f"{time.time_ns()} {os.getpid()}")
+            os.replace(tmp_path, self.stamp_path)
+        except OSError as e:
+            logger.warning(f"Failed to update config stamp {self.stamp_path}: {e}")
+
+        with self._lock:
+            self._values = None
+
+
+_config_cache = _ConfigCache(CONFIG_STAMP_PATH)
+
+
+def close_db() -> None:
+    """Close idle pooled connections (e.g. at shutdown)"""
+    _pool.close_all()
+
+
 def init_db():
     """Initialize the database and create tables if they don't exist"""
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-
-        # Create document_mappings table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS document_mappings (
-                document_name TEXT PRIMARY KEY,
-                original_filename TEXT NOT NULL,
-                file_id TEXT,
-                store_name TEXT,
-                category TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-
-        # Create config table for storing application settings
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS config (
-                key TEXT PRIMARY KEY,
-                value TEXT NOT NULL,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-
-        conn.commit()
-        conn.close()
+        with db_transaction() as conn:
+            # Create document_mappings table
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS document_mappings (
+                    document_name TEXT PRIMARY KEY,
+                    original_filename TEXT NOT NULL,
+                    file_id TEXT,
+                    store_name TEXT,
+                    category TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+
+            # Create config table for storing application settings
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS config (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+
+            # Category lookups/deletes filter by store and category
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_document_mappings_store_category
+                ON document_mappings (store_name, category)
+            ''')
+
         logger.info(f"Database initialized at {DB_PATH}")
     except Exception as e:
         logger.error(f"Error initializing database: {str(e)}", exc_info=True)
@@ -60,23 +304,49 @@ def save_mapping(document_name: str, original_filename: str, file_id: Optional[s
         True if successful, False otherwise
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-
-        cursor.execute('''
+        execute('''
             INSERT OR REPLACE INTO document_mappings
             (document_name, original_filename, file_id, store_name, category)
             VALUES (?, ?, ?, ?, ?)
         ''', (document_name, original_filename, file_id, store_name, category))
 
-        conn.commit()
-        conn.close()
         logger.info(f"Saved mapping: {document_name} -> {original_filename} (category: {category})")
         return True
     except Exception as e:
         logger.error(f"Error saving mapping: {str(e)}", exc_info=True)
         return False
 
+def save_mappings(mappings: Iterable[Dict[str, Any]]) -> int:
+    """
+    Save many document mappings in one transaction
+
+    Args:
+        mappings: Iterable of dicts with document_name, original_filename and
+            optional file_id, store_name, category
+
+    Returns:
+        Number of saved mappings (0 on error)
+    """
+    rows = [
+        (m['document_name'], m['original_filename'], m.get('file_id'), m.get('store_name'), m.get('category'))
+        for m in mappings
+    ]
+    if not rows:
+        return 0
+
+    try:
+        execute_many('''
+            INSERT OR REPLACE INTO document_mappings
+            (document_name, original_filename, file_id, store_name, category)
+            VALUES (?, ?, ?, ?, ?)
+        ''', rows)
+
+        logger.info(f"Saved {len(rows)} mappings")
+        return len(rows)
+    except Exception as e:
+        logger.error(f"Error saving mappings: {str(e)}", exc_info=True)
+        return 0
+
 def get_mapping(document_name: str) -> Optional[str]:
     """
     Get original filename for a document name
@@ -88,17 +358,11 @@ def get_mapping(document_name: str) -> Optional[str]:
         Original filename if found, None otherwise
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-
-        cursor.execute('''
+        result = fetch_one('''
             SELECT original_filename FROM document_mappings
             WHERE document_name = ?
         ''', (document_name,))
 
-        result = cursor.fetchone()
-        conn.close()
-
         if result:
             return result[0]
         return None
@@ -106,6 +370,99 @@ def get_mapping(document_name: str) -> Optional[str]:
         logger.error(f"Error getting mapping: {str(e)}", exc_info=True)
         return None
 
+def get_mapping_details(document_names: Iterable[str]) -> Dict[str, Dict[str, Optional[str]]]:
+    """
+    Get mappings for many documents at once
+
+    Args:
+        document_names: Full document names
+
+    Returns:
+        Dictionary of document_name -> {'original_filename', 'category', 'store_name', 'file_id'}
+        (documents without a mapping are omitted)
+    """
+    names = list(dict.fromkeys(document_names))
+    details = {}
+    if not names:
+        return details
+
+    try:
+        with db_connection() as conn:
+            for chunk in _chunks(names):
+                placeholders = ','.join('?' * len(chunk))
+                rows = conn.execute(f'''
+                    SELECT document_name, original_filename, category, store_name, file_id
+                    FROM document_mappings
+                    WHERE document_name IN ({placeholders})
+                ''', chunk).fetchall()
+                for doc_name, filename, category, store_name, file_id in rows:
+                    details[doc_name] = {
+                        'original_filename': filename,
+                        'category': category,
+                        'store_name': store_name,
+                        'file_id': file_id
+                    }
+        return details
+    except Exception as e:
+        logger.error(f"Error getting mapping details: {str(e)}", exc_info=True)
+        return details
+
+def get_store_mappings(store_name: str) -> Dict[str, Dict[str, Optional[str]]]:
+    """
+    Get mappings of all documents in a store with one query
+
+    Matches rows saved with the store name as well as rows whose document name
+    lives under the store (e.g., 'fileSearchStores/xxx/documents/yyy').
+
+    Args:
+        store_name: FileSearchStore name (format: fileSearchStores/{id})
+
+    Returns:
+        Dictionary of document_name -> {'original_filename', 'category', 'store_name', 'file_id'}
+    """
+    prefix = f"{store_name}/documents/"
+    try:
+        # Range on the primary key instead of LIKE so the prefix match uses the index
+        rows = fetch_all('''
+            SELECT document_name, original_filename, category, store_name, file_id
+            FROM document_mappings
+            WHERE store_name = ? OR (document_name >= ? AND document_name < ?)
+        ''', (store_name, prefix, prefix[:-1] + '0'))
+
+        return {
+            doc_name: {
+                'original_filename': filename,
+                'category': category,
+                'store_name': mapped_store,
+                'file_id': file_id
+            }
+            for doc_name, filename, category, mapped_store, file_id in rows
+        }
+    except Exception as e:
+        logger.error(f"Error getting store mappings: {str(e)}", exc_info=True)
+        return {}
+
+def get_documents_by_category(store_name: str, category: str) -> List[str]:
+    """
+    Get document names of a store that belong to a category
+
+    Args:
+        store_name: FileSearchStore name
+        category: Document category
+
+    Returns:
+        List of document names
+    """
+    try:
+        rows = fetch_all('''
+            SELECT document_name FROM document_mappings
+            WHERE store_name = ? AND category = ?
+        ''', (store_name, category))
+        return [row[0] for row in rows]
+    except Exception as e:
+        logger.error(f"Error getting documents by category: {str(e)}", exc_info=True)
+        return []
+
 def delete_mapping(document_name: str) -> bool:
     """
     Delete mapping for a document
@@ -117,22 +474,46 @@ def delete_mapping(document_name: str) -> bool:
         True if successful, False otherwise
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-
-        cursor.execute('''
+        execute('''
             DELETE FROM document_mappings
             WHERE document_name = ?
         ''', (document_name,))
 
-        conn.commit()
-        conn.close()
         logger.info(f"Deleted mapping: {document_name}")
         return True
     except Exception as e:
         logger.error(f"Error deleting mapping: {str(e)}", exc_info=True)
         return False
 
+def delete_mappings(document_names: Iterable[str]) -> int:
+    """
+    Delete mappings for many documents in one transaction
+
+    Args:
+        document_names: Full document names
+
+    Returns:
+        Number of deleted mappings (0 on error)
+    """
+    names = list(dict.fromkeys(document_names))
+    if not names:
+        return 0
+
+    try:
+        deleted = 0
+        with db_transaction() as conn:
+            for chunk in _chunks(names):
+                placeholders = ','.join('?' * len(chunk))
+                deleted += conn.execute(
+                    f'DELETE FROM document_mappings WHERE document_name IN ({placeholders})', chunk
+                ).rowcount
+
+        logger.info(f"Deleted {deleted} mappings")
+        return deleted
+    except Exception as e:
+        logger.error(f"Error deleting mappings: {str(e)}", exc_info=True)
+        return 0
+
 def get_all_mappings() -> Dict[str, str]:
     """
     Get all document mappings
@@ -141,13 +522,7 @@ def get_all_mappings() -> Dict[str, str]:
         Dictionary of document_name -> original_filename
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-
-        cursor.execute('SELECT document_name, original_filename FROM document_mappings')
-        results = cursor.fetchall()
-        conn.close()
-
+        results = fetch_all('SELECT document_name, original_filename FROM document_mappings')
         return {doc_name: filename for doc_name, filename in results}
     except Exception as e:
         logger.error(f"Error getting all mappings: {str(e)}", exc_info=True)
@@ -165,16 +540,12 @@ def set_config(key: str, value: str) -> bool:
         True if successful, False otherwise
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-
-        cursor.execute('''
+        execute('''
             INSERT OR REPLACE INTO config (key, value, updated_at)
             VALUES (?, ?, CURRENT_TIMESTAMP)
         ''', (key, value))
+        _config_cache.invalidate()
 
-        conn.commit()
-        conn.close()
         logger.info(f"Config set: {key} = {value}")
         return True
     except Exception as e:
@@ -192,20 +563,46 @@ def get_config(key: str) -> Optional[str]:
         Configuration value if found, None otherwise
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-
-        cursor.execute('SELECT value FROM config WHERE key = ?', (key,))
-        result = cursor.fetchone()
-        conn.close()
-
-        if result:
-            return result[0]
-        return None
+        _, values = _config_cache.snapshot()
+        return values.get(key)
     except Exception as e:
         logger.error(f"Error getting config: {str(e)}", exc_info=True)
         return None
 
+def get_configs(keys: Iterable[str]) -> Dict[str, str]:
+    """
+    Get many configuration values
+
+    Args:
+        keys: Configuration keys
+
+    Returns:
+        Dictionary of key -> value (missing keys are omitted)
+    """
+    try:
+        _, values = _config_cache.snapshot()
+        return {key: values[key] for key in keys if key in values}
+    except Exception as e:
+        logger.error(f"Error getting configs: {str(e)}", exc_info=True)
+        return {}
+
+def get_config_version() -> int:
+    """
+    Version stamp of the cached config values
+
+    Changes whenever the config was modified (in this or another process), so
+    callers can memoize values derived from config (e.g. parsed JSON).
+
+    Returns:
+        Current version (0 if the config could not be read)
+    """
+    try:
+        version, _ = _config_cache.snapshot()
+        return version
+    except Exception as e:
+        logger.error(f"Error getting config version: {str(e)}", exc_info=True)
+        return 0
+
 def get_document_category(document_name: str) -> Optional[str]:
     """
     Get category for a document
@@ -217,12 +614,7 @@ def get_document_category(document_name: str) -> Optional[str]:
         Category if found, None otherwise
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-
-        cursor.execute('SELECT category FROM document_mappings WHERE document_name = ?', (document_name,))
-        result = cursor.fetchone()
-        conn.close()
+        result = fetch_one('SELECT category FROM document_mappings WHERE document_name = ?', (document_name,))
 
         if result:
             return result[0]
@@ -231,5 +623,56 @@ def get_document_category(document_name: str) -> Optional[str]:
         logger.error(f"Error getting document category: {str(e)}", exc_info=True)
         return None
 
+def get_store_versions(store_names) -> Dict[str, int]:
+    """
+    Get content versions for FileSearchStores
+
+    A store's version is bumped whenever its documents change, so caches keyed
+    by version become stale automatically.
+
+    Args:
+        store_names: Iterable of store names
+
+    Returns:
+        Dictionary of store_name -> version (0 if the store was never bumped)
+    """
+    store_names = list(store_names)
+    versions = {name: 0 for name in store_names}
+    if not store_names:
+        return versions
+
+    values = get_configs(STORE_VERSION_PREFIX + name for name in store_names)
+    for key, value in values.items():
+        versions[key[len(STORE_VERSION_PREFIX):]] = int(value)
+    return versions
+
+def bump_store_version(store_name: str) -> Optional[int]:
+    """
+    Increment the content version of a FileSearchStore
+
+    Args:
+        store_name: Store name whose documents changed
+
+    Returns:
+        New version if successful, None otherwise
+    """
+    try:
+        key = STORE_VERSION_PREFIX + store_name
+        with db_transaction() as conn:
+            conn.execute('''
+                INSERT INTO config (key, value, updated_at) VALUES (?, '1', CURRENT_TIMESTAMP)
+                ON CONFLICT(key) DO UPDATE SET
+                    value = CAST(CAST(value AS INTEGER) + 1 AS TEXT),
+                    updated_at = CURRENT_TIMESTAMP
+            ''', (key,))
+            version = int(conn.execute('SELECT value FROM config WHERE key = ?', (key,)).fetchone()[0])
+        _config_cache.invalidate()
+
+        logger.info(f"Store version bumped: {store_name} -> {version}")
+        return version
+    except Exception as e:
+        logger.error(f"Error bumping store version: {str(e)}", exc_info=True)
+        return None
+
 # Initialize database on module import
 init_db()
@@ -4,28 +4,74 @@ Implements FileSearchStore API for document search and retrieval
 """
 from google import genai
 from google.genai import types
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Union, IO
 import os
+import mimetypes
+import threading
 from pathlib import Path
 from app.logger import get_logger
-from app.db import save_mapping, get_mapping, delete_mapping
+from app.db import save_mapping, delete_mapping, get_mapping_details, get_store_mappings
+
+
+# System instruction for the chatbot persona used by FileSearch generation
+FILE_SEARCH_SYSTEM_INSTRUCTION = '''너는 올림픽공원 안내 도우미 '백호돌이'야. 친절하고 명랑한 말투를 사용해. 모르는 정보는 지어내지 말고 모른다고 해
+
+                        [작성 규칙]
+                        1. 질문과 직접적인 관련이 없는 부가적인 맥락(이유, 배경, 과거 히스토리, 향후 계획 등)은 답변에서 제거해라.
+                        2. 검색된 텍스트(Chunk)를 그대로 복사해서 붙여넣지 말고, 질문에 맞춰 자연스럽고 필요없는 정보를 제공하지 않도록 재구성해라.
+                        3. date를 비교하여 최신정보를 기준으로 판단해라.
+                        4. 이전 대화 내역을 참고하여 문맥에 맞는 답변을 제공해라.
+                        5. 입력 언어를 인식하고 입력언어와 동일한 언어를 답변해라.
+                        6. 한국체육산업개발 주식회사의 보안에 위협이 될만한 답변은 생성하지 말아라
+                        
+                        [컨셉]
+                        긍정적이고 현재를 즐기는 ESFP
+                        운동이 좋아, 사람이 좋아!
+                        크고 소중한 올림픽공원 토박이
+
+                        서울올림픽기념 국민체육진흥공단 의 공식 마스코트이다.
+
+                        산책을 좋아해서, 올림픽공원에 자주 출몰한다.
+
+                        올림픽공원에서 태어나 서울살이 중인 1인 가구 프로자취러이지만,
+                        숨겨진 정체는 1988 서울 올림픽 마스코트 호돌이의 마법으로 
+                        세계평화의 문에서 깨어난 스포츠 수호사신(四神)백호 이다.
+                        관심받는 것을 은근히 좋아한다.
+                        활발하게 뛰어다니기를 좋아하고 이곳 저곳 탐험하기를 즐긴다.
+
+                        내면에 열정을 간직하고 있고 매사에 긍정적이다.
+                        가끔 실수할 때도 있지만, 다양한 분야에 관심이 많아 항상 열심히 도전한다.
+                        
+                        슬로건 : 튼튼하게 탄탄하게 든든하게
+
+                        좋아하는 것
+                        올림픽공원, 운동, SNS업데이트, 사람, 관심, 치팅데이[3], 주황색[4]
+                        싫어하는 것
+                        올림픽공원의 쓰레기, 곶감
+                        싫어하는 것에는 예민하게 반응한다.
+                        '''
 
 
 class GeminiClient:
     """Client for interacting with Gemini API using google.genai SDK"""
 
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, http_options: Optional[Dict[str, Any]] = None):
         """
         Initialize Gemini client with API key
 
         Args:
             api_key: Google AI API key for authentication
+            http_options: Optional HTTP options for the underlying genai.Client
+                (e.g., {'timeout': 60000})
         """
         self.api_key = api_key
         self.logger = get_logger()
 
         # Configure the client with API key
-        self.client = genai.Client(api_key=api_key)        
+        if http_options:
+            self.client = genai.Client(api_key=api_key, http_options=types.HttpOptions(**http_options))
+        else:
+            self.client = genai.Client(api_key=api_key)
         self.logger.info("GeminiClient initialized successfully")
 
 
@@ -164,61 +210,72 @@ class GeminiClient:
                 "error": str(e)
             }
 
-    def list_documents_in_store(self, store_name: str, page_size: int = 20) -> Dict[str, Any]:
+    def list_documents_in_store(self, store_name: str, page_size: int = 20, page_token: Optional[str] = None,
+                                all_pages: bool = True) -> Dict[str, Any]:
         """
-        List all documents in a FileSearchStore
+        List documents in a FileSearchStore
+
+        Original filenames and categories are joined in memory from one bulk
+        mapping lookup (per store, or per page when paginating).
 
         Args:
             store_name: Name of the FileSearchStore (format: fileSearchStores/{id})
-            page_size: Maximum documents per page (default: 20)
+            page_size: Maximum documents per API page (default: 20)
+            page_token: Token of the page to fetch (from a previous next_page_token)
+            all_pages: If True and no page_token is given, follow every page and
+                return the whole store; otherwise return a single page
 
         Returns:
-            Dict with success status and list of documents
+            Dict with success status, list of documents and next_page_token
+            (None when there are no more pages)
         """
         try:
-            self.logger.info(f"Listing documents in FileSearchStore: {store_name}")
+            single_page = page_token is not None or not all_pages
+            self.logger.info(f"Listing documents in FileSearchStore: {store_name}"
+                             + (f" (page_size={page_size}, page_token={page_token})" if single_page else ""))
 
-            # Use SDK to list documents (without page_size parameter)
-            documents = self.client.file_search_stores.documents.list(
-                parent=store_name
-            )
-
-            document_list = []
-            for idx, doc in enumerate(documents):
-                # Try to get original filename and category from mapping
-                from app.db import get_document_category
+            config = {'page_size': page_size}
+            if page_token:
+                config['page_token'] = page_token
 
-                self.logger.debug(f"Document {idx}: name={doc.name}")
-                self.logger.debug(f"Document {idx}: has display_name={hasattr(doc, 'display_name')}")
-                if hasattr(doc, 'display_name'):
-                    self.logger.debug(f"Document {idx}: display_name={doc.display_name}")
-
-                original_filename = get_mapping(doc.name)
-                self.logger.debug(f"Document {idx}: get_mapping returned={original_filename}")
+            pager = self.client.file_search_stores.documents.list(
+                parent=store_name,
+                config=config
+            )
 
-                category = get_document_category(doc.name)
-                self.logger.debug(f"Document {idx}: get_document_category returned={category}")
+            if single_page:
+                documents = list(pager.page)
+                next_page_token = pager.config.get('page_token') or None
+                mappings = get_mapping_details(doc.name for doc in documents)
+            else:
+                documents = list(pager)
+                next_page_token = None
+                mappings = get_store_mappings(store_name)
 
-                display_name = original_filename if original_filename else (doc.display_name if hasattr(doc, 'display_name') else None)
-                self.logger.debug(f"Document {idx}: final display_name={display_name}")
+            document_list = []
+            for doc in documents:
+                mapping = mappings.get(doc.name, {})
+                original_filename = mapping.get('original_filename')
+                display_name = original_filename if original_filename else getattr(doc, 'display_name', None)
 
                 doc_info = {
                     "document_name": doc.name,
                     "display_name": display_name,
-                    "category": category,
-                    "mime_type": doc.mime_type if hasattr(doc, 'mime_type') else None,
-                    "create_time": doc.create_time if hasattr(doc, 'create_time') else None,
-                    "update_time": doc.update_time if hasattr(doc, 'update_time') else None,
-                    "size_bytes": doc.size_bytes if hasattr(doc, 'size_bytes') else None,
+                    "category": mapping.get('category'),
+                    "mime_type": getattr(doc, 'mime_type', None),
+                    "create_time": getattr(doc, 'create_time', None),
+                    "update_time": getattr(doc, 'update_time', None),
+                    "size_bytes": getattr(doc, 'size_bytes', None),
                 }
                 document_list.append(doc_info)
 
-            self.logger.info(f"Found {len(document_list)} documents in store {store_name}")
+            self.logger.info(f"Found {len(document_list)} documents in store {store_name} ({len(mappings)} mappings)")
             return {
                 "success": True,
                 "documents": document_list,
                 "count": len(document_list),
-                "store_name": store_name
+                "store_name": store_name,
+                "next_page_token": next_page_token
             }
         except Exception as e:
             self.logger.error(f"Error listing documents in store {store_name}: {str(e)}", exc_info=True)
@@ -332,35 +389,42 @@ class GeminiClient:
 
     # ==================== File Management Methods ====================
 
-    def upload_file(self, file_path: str, display_name: Optional[str] = None) -> Dict[str, Any]:
+    def upload_file(self, file: Union[str, os.PathLike, IO[bytes]], display_name: Optional[str] = None,
+                    mime_type: Optional[str] = None) -> Dict[str, Any]:
         """
         Upload a file to Files API
 
         Args:
-            file_path: Path to the file to upload
+            file: Path to the file, or a seekable binary file-like object (e.g. io.BytesIO)
+                  which is streamed directly without writing a temp file
             display_name: Optional display name for the file (original filename)
+            mime_type: Optional MIME type; guessed from display_name for file-like objects
 
         Returns:
             Dict with success status and file information
         """
         try:
-            file_path_obj = Path(file_path)
-            if not file_path_obj.exists():
-                self.logger.error(f"File not found: {file_path}")
-                return {
-                    "success": False,
-                    "error": f"File not found: {file_path}"
-                }
+            if isinstance(file, (str, os.PathLike)):
+                if not Path(file).exists():
+                    self.logger.error(f"File not found: {file}")
+                    return {
+                        "success": False,
+                        "error": f"File not found: {file}"
+                    }
+                # Use provided display_name or fallback to file basename
+                final_display_name = display_name or os.path.basename(file)
+            else:
+                final_display_name = display_name or os.path.basename(getattr(file, 'name', '') or '') or 'upload'
+                # The SDK cannot guess the MIME type of an in-memory stream
+                mime_type = mime_type or mimetypes.guess_type(final_display_name)[0] or 'application/octet-stream'
 
-            # Use provided display_name or fallback to file basename
-            final_display_name = display_name or os.path.basename(file_path)
-            self.logger.info(f"Uploading file: {file_path} with display_name: {final_display_name}")
+            self.logger.info(f"Uploading file with display_name: {final_display_name}")
 
-            # Upload file using Files API - pass file path as string
-            uploaded_file = self.client.files.upload(
-                file=file_path,
-                config={'display_name': final_display_name}
-            )
+            config = {'display_name': final_display_name}
+            if mime_type:
+                config['mime_type'] = mime_type
+
+            uploaded_file = self.client.files.upload(file=file, config=config)
 
             self.logger.info(f"File uploaded successfully: {uploaded_file.name}")
             return {
@@ -374,7 +438,7 @@ class GeminiClient:
                 "uri": uploaded_file.uri if hasattr(uploaded_file, 'uri') else None
             }
         except Exception as e:
-            self.logger.error(f"Error uploading file {file_path}: {str(e)}", exc_info=True)
+            self.logger.error(f"Error uploading file {display_name or file}: {str(e)}", exc_info=True)
             return {
                 "success": False,
                 "error": str(e)
@@ -438,37 +502,32 @@ class GeminiClient:
                 "error": str(e)
             }
 
-    def upload_and_import_to_store(self, file_path: str, store_name: str, display_name: Optional[str] = None, category: Optional[str] = None) -> Dict[str, Any]:
+    def upload_and_import_to_store(self, file: Union[str, os.PathLike, IO[bytes]], store_name: str,
+                                   display_name: Optional[str] = None, category: Optional[str] = None,
+                                   mime_type: Optional[str] = None) -> Dict[str, Any]:
         """
         Upload a file and directly import it to a FileSearchStore
 
         Args:
-            file_path: Path to the file to upload
+            file: Path to the file, or a seekable binary file-like object
             store_name: Name of the target FileSearchStore (format: fileSearchStores/{id})
             display_name: Optional display name for the file
             category: Optional category/classification of the document
+            mime_type: Optional MIME type (see upload_file)
 
         Returns:
             Dict with success status and file information
         """
         try:
-            file_path_obj = Path(file_path)
-            if not file_path_obj.exists():
-                self.logger.error(f"File not found: {file_path}")
-                return {
-                    "success": False,
-                    "error": f"File not found: {file_path}"
-                }
-
-            final_display_name = display_name or os.path.basename(file_path)
-            self.logger.info(f"Uploading and importing file {file_path} to store {store_name} with category {category}")
+            self.logger.info(f"Uploading and importing file {display_name or file} to store {store_name} with category {category}")
 
             # Step 1: Upload file to Files API
-            upload_result = self.upload_file(file_path, final_display_name)
+            upload_result = self.upload_file(file, display_name, mime_type=mime_type)
             if not upload_result['success']:
                 return upload_result
 
             file_id = upload_result['file_id']
+            final_display_name = upload_result['display_name'] or display_name
 
             # Step 2: Import to FileSearchStore
             import_result = self.import_file_to_store(
@@ -485,13 +544,13 @@ class GeminiClient:
             return {
                 "success": True,
                 "store_name": store_name,
-                "file_path": file_path,
+                "display_name": final_display_name,
                 "file_id": file_id,
                 "category": category,
                 "message": "File uploaded and imported successfully"
             }
         except Exception as e:
-            self.logger.error(f"Error uploading and importing file {file_path} to store {store_name}: {str(e)}", exc_info=True)
+            self.logger.error(f"Error uploading and importing file {display_name or file} to store {store_name}: {str(e)}", exc_info=True)
             return {
                 "success": False,
                 "error": str(e)
@@ -600,6 +659,72 @@ class GeminiClient:
 
     # ==================== Search Methods ====================
 
+    def _build_search_contents(self, query: str, history: Optional[List[Dict[str, str]]] = None) -> List[types.Content]:
+        """
+        Build conversation contents (history + current query) for FileSearch generation
+
+        Args:
+            query: Search query
+            history: Optional conversation history (list of {"role": "user"/"model", "parts": [text]})
+
+        Returns:
+            List of Content objects
+        """
+        # Convert history to proper format if it exists
+        contents = []
+        if history:
+            for msg in history:
+                role = msg.get('role', 'user')
+                parts = msg.get('parts', [])
+                # Create proper Content object
+                if isinstance(parts, list) and len(parts) > 0:
+                    text_content = parts[0] if isinstance(parts[0], str) else str(parts[0])
+                    contents.append(types.Content(role=role, parts=[types.Part(text=text_content)]))
+
+        # Add current query
+        contents.append(types.Content(role='user', parts=[types.Part(text=query)]))
+        return contents
+
+    def _build_file_search_config(self, store_names: List[str]) -> types.GenerateContentConfig:
+        """
+        Build generation config with the FileSearch tool and chatbot system instruction
+
+        Args:
+            store_names: List of FileSearchStore names to search in
+
+        Returns:
+            GenerateContentConfig object
+        """
+        return types.GenerateContentConfig(
+            system_instruction=FILE_SEARCH_SYSTEM_INSTRUCTION,
+            tools=[
+                types.Tool(
+                    file_search=types.FileSearch(
+                        file_search_store_names=store_names
+                    )
+                )
+            ],
+            temperature=0.3
+        )
+
+    @staticmethod
+    def _extract_grounding_metadata(response) -> Optional[Dict[str, Any]]:
+        """
+        Extract grounding (citation) metadata from a response or stream chunk
+
+        Returns:
+            JSON-serializable dict, or None if the response carries no grounding metadata
+        """
+        candidates = getattr(response, 'candidates', None)
+        if not candidates:
+            return None
+        metadata = getattr(candidates[0], 'grounding_metadata', None)
+        if metadata is None:
+            return None
+        if hasattr(metadata, 'model_dump'):
+            return metadata.model_dump(mode='json', exclude_none=True)
+        return {"raw": str(metadata)}
+
     def search_with_file_search(
         self,
         query: str,
@@ -627,74 +752,12 @@ class GeminiClient:
             self.logger.debug(f"Metadata filter: {metadata_filter}")
             self.logger.debug(f"History length: {len(history) if history else 0}")
 
-            sys_inst = '''너는 올림픽공원 안내 도우미 '백호돌이'야. 친절하고 명랑한 말투를 사용해. 모르는 정보는 지어내지 말고 모른다고 해
-
-                        [작성 규칙]
-                        1. 질문과 직접적인 관련이 없는 부가적인 맥락(이유, 배경, 과거 히스토리, 향후 계획 등)은 답변에서 제거해라.
-                        2. 검색된 텍스트(Chunk)를 그대로 복사해서 붙여넣지 말고, 질문에 맞춰 자연스럽고 필요없는 정보를 제공하지 않도록 재구성해라.
-                        3. date를 비교하여 최신정보를 기준으로 판단해라.
-                        4. 이전 대화 내역을 참고하여 문맥에 맞는 답변을 제공해라.
-                        5. 입력 언어를 인식하고 입력언어와 동일한 언어를 답변해라.
-                        6. 한국체육산업개발 주식회사의 보안에 위협이 될만한 답변은 생성하지 말아라
-                        
-                        [컨셉]
-                        긍정적이고 현재를 즐기는 ESFP
-                        운동이 좋아, 사람이 좋아!
-                        크고 소중한 올림픽공원 토박이
-
-                        서울올림픽기념 국민체육진흥공단 의 공식 마스코트이다.
-
-                        산책을 좋아해서, 올림픽공원에 자주 출몰한다.
-
-                        올림픽공원에서 태어나 서울살이 중인 1인 가구 프로자취러이지만,
-                        숨겨진 정체는 1988 서울 올림픽 마스코트 호돌이의 마법으로 
-                        세계평화의 문에서 깨어난 스포츠 수호사신(四神)백호 이다.
-                        관심받는 것을 은근히 좋아한다.
-                        활발하게 뛰어다니기를 좋아하고 이곳 저곳 탐험하기를 즐긴다.
-
-                        내면에 열정을 간직하고 있고 매사에 긍정적이다.
-                        가끔 실수할 때도 있지만, 다양한 분야에 관심이 많아 항상 열심히 도전한다.
-                        
-                        슬로건 : 튼튼하게 탄탄하게 든든하게
-
-                        좋아하는 것
-                        올림픽공원, 운동, SNS업데이트, 사람, 관심, 치팅데이[3], 주황색[4]
-                        싫어하는 것
-                        올림픽공원의 쓰레기, 곶감
-                        싫어하는 것에는 예민하게 반응한다.
-                        '''
-
-            # Build conversation contents with history
-            # Convert history to proper format if it exists
-            contents = []
-            if history:
-                for msg in history:
-                    role = msg.get('role', 'user')
-                    parts = msg.get('parts', [])
-                    # Create proper Content object
-                    if isinstance(parts, list) and len(parts) > 0:
-                        text_content = parts[0] if isinstance(parts[0], str) else str(parts[0])
-                        contents.append(types.Content(role=role, parts=[types.Part(text=text_content)]))
-
-            # Add current query
-            contents.append(types.Content(role='user', parts=[types.Part(text=query)]))
 
             # Generate content with FileSearch tool
             response = self.client.models.generate_content(
                 model=model,
-                contents=contents,
-                config=types.GenerateContentConfig(
-                    system_instruction=sys_inst,
-                    tools=[
-                        types.Tool(
-                            file_search=types.FileSearch(
-                                file_search_store_names=store_names
-                            )
-                        )
-                    ],
-                    temperature=0.3
-
-                )
+                contents=self._build_search_contents(query, history),
+                config=self._build_file_search_config(store_names)
             )
 
             # Extract text from response
@@ -718,6 +781,73 @@ class GeminiClient:
                 "query": query
             }
 
+    def stream_search_with_file_search(
+        self,
+        query: str,
+        store_names: List[str],
+        model: str = "gemini-2.5-flash",
+        history: Optional[List[Dict[str, str]]] = None
+    ):
+        """
+        Stream a FileSearch answer token by token
+
+        Args:
+            query: Search query
+            store_names: List of FileSearchStore names to search in
+            model: Model to use for search (default: gemini-2.5-flash)
+            history: Optional conversation history (list of {"role": "user"/"model", "parts": [text]})
+
+        Yields:
+            Dicts of the form {"type": "token", "text": ...} while the answer is generated,
+            then a final {"type": "done", ...} with the full text and grounding metadata,
+            or {"type": "error", "error": ...} on failure
+        """
+        try:
+            self.logger.info(f"Streaming search with FileSearch in stores: {store_names}")
+            self.logger.debug(f"Query: {query}")
+            self.logger.debug(f"History length: {len(history) if history else 0}")
+
+            stream = self.client.models.generate_content_stream(
+                model=model,
+                contents=self._build_search_contents(query, history),
+                config=self._build_file_search_config(store_names)
+            )
+
+            text_parts = []
+            grounding_metadata = None
+            for chunk in stream:
+                chunk_text = getattr(chunk, 'text', None)
+                if chunk_text:
+                    text_parts.append(chunk_text)
+                    yield {"type": "token", "text": chunk_text}
+
+                # Grounding metadata arrives with the last chunk(s)
+                chunk_metadata = self._extract_grounding_metadata(chunk)
+                if chunk_metadata:
+                    grounding_metadata = chunk_metadata
+
+            result_text = "".join(text_parts)
+            self.logger.info(f"Streaming search completed successfully")
+            self.logger.debug(f"Result length: {len(result_text)} characters")
+
+            yield {
+                "type": "done",
+                "success": True,
+                "query": query,
+                "result": result_text,
+                "stores_searched": store_names,
+                "grounding_metadata": grounding_metadata,
+                "model": model
+            }
+        except Exception as e:
+            self.logger.error(f"Error in streaming FileSearch: {str(e)}", exc_info=True)
+            yield {
+                "type": "error",
+                "success": False,
+                "error": str(e),
+                "query": query
+            }
+
     def search_with_grounding(
         self,
         query: str,
@@ -789,3 +919,71 @@ class GeminiClient:
                 "error": str(e),
                 "query": query
             }
+
+
+class GeminiClientRegistry:
+    """
+    Process-wide registry of GeminiClient instances, one per API key
+
+    Each GeminiClient wraps a genai.Client whose HTTP connection pool is kept
+    alive between requests, so handlers borrowing from the registry skip the
+    connection setup and TLS handshake that a fresh client would pay.
+    """
+
+    def __init__(self, default_http_options: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the registry
+
+        Args:
+            default_http_options: HTTP options applied to keys without their own configuration
+        """
+        self.logger = get_logger()
+        self._default_http_options = default_http_options
+        self._key_http_options: Dict[str, Dict[str, Any]] = {}
+        self._clients: Dict[str, GeminiClient] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, api_key: str, http_options: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Set HTTP options for a specific API key
+
+        An existing client for the key is dropped so the next borrow picks up the new options.
+
+        Args:
+            api_key: Google AI API key
+            http_options: HTTP options for the genai.Client of this key
+        """
+        with self._lock:
+            if http_options is None:
+                self._key_http_options.pop(api_key, None)
+            else:
+                self._key_http_options[api_key] = dict(http_options)
+            self._clients.pop(api_key, None)
+
+    def get(self, api_key: str) -> GeminiClient:
+        """
+        Borrow the shared GeminiClient for an API key, creating it on first use
+
+        Args:
+            api_key: Google AI API key
+
+        Returns:
+            Shared GeminiClient instance
+        """
+        client = self._clients.get(api_key)
+        if client is not None:
+            return client
+
+        with self._lock:
+            client = self._clients.get(api_key)
+            if client is None:
+                http_options = self._key_http_options.get(api_key, self._default_http_options)
+                client = GeminiClient(api_key, http_options=http_options)
+                self._clients[api_key] = client
+                self.logger.info(f"GeminiClientRegistry: created client ({len(self._clients)} cached)")
+            return client
+
+    def clear(self) -> None:
+        """Drop all cached clients"""
+        with self._lock:
+            self._clients.clear()
@@ -0,0 +1,231 @@
+"""
+경로 지도 렌더링 모듈
+Pillow/numpy로 확대 영역만 잘라 경로와 마커를 그려 PNG로 인코딩
+"""
+import io
+import base64
+import threading
+from collections import OrderedDict
+from pathlib import Path
+import numpy as np
+from PIL import Image, ImageDraw, ImageColor
+from app.logger import get_logger
+
+logger = get_logger()
+
+# 기존 matplotlib 출력(figsize=(10, 6), dpi=150)의 축 영역과 같은 최대 출력 크기
+DEFAULT_OUTPUT_SIZE = (1162, 693)
+# 포인트 -> 픽셀 환산 (150 dpi 기준)
+POINTS_TO_PIXELS = 150 / 72
+
+
+def calculate_zoom_bounds(path, start_coords, end_coords, margin_percent=0.2, min_range=100):
+    """
+    경로의 범위를 계산해 확대할 영역 반환
+
+    Args:
+        path: 경로 좌표 리스트
+        start_coords: 출발지 좌표 (x, y)
+        end_coords: 도착지 좌표 (x, y)
+        margin_percent: 여백 비율 (기본 20%)
+        min_range: 최소 범위 (픽셀, 경로가 너무 짧을 경우)
+
+    Returns:
+        dict: {'min_x', 'max_x', 'min_y', 'max_y'} (지도 좌표계, 여백 포함)
+    """
+    # 경로의 모든 좌표 수집
+    all_x = [p[0] for p in path] + [start_coords[0], end_coords[0]]
+    all_y = [p[1] for p in path] + [start_coords[1], end_coords[1]]
+
+    # 최소/최대 좌표 계산
+    min_x, max_x = min(all_x), max(all_x)
+    min_y, max_y = min(all_y), max(all_y)
+
+    # 범위 크기 계산
+    range_x = max_x - min_x
+    range_y = max_y - min_y
+
+    # 최소 범위 보장
+    if range_x < min_range:
+        center_x = (min_x + max_x) / 2
+        min_x = center_x - min_range / 2
+        max_x = center_x + min_range / 2
+        range_x = min_range
+
+    if range_y < min_range:
+        center_y = (min_y + max_y) / 2
+        min_y = center_y - min_range / 2
+        max_y = center_y + min_range / 2
+        range_y = min_range
+
+    # 여백 추가
+    margin_x = range_x * margin_percent
+    margin_y = range_y * margin_percent
+
+    return {
+        'min_x': float(min_x - margin_x),
+        'max_x': float(max_x + margin_x),
+        'min_y': float(min_y - margin_y),
+        'max_y': float(max_y + margin_y)
+    }
+
+
+class RouteMapRenderer:
+    """
+    경로 지도 렌더러
+
+    디코딩한 지도 이미지를 메모리에 한 번만 올려두고, 요청마다 확대 영역만
+    잘라서(리사이즈 포함) 복사본 위에 경로와 마커를 그립니다.
+    공유 상태는 읽기 전용 지도 이미지와 잠금으로 보호되는 창 캐시뿐이라
+    스레드 Flask 서버에서 동시에 호출해도 안전합니다.
+    """
+
+    def __init__(self, map_image_path, coord_size=(953, 676), output_size=DEFAULT_OUTPUT_SIZE, window_cache_size=64):
+        """
+        Args:
+            map_image_path: 지도 이미지 경로
+            coord_size: 지도 좌표계 크기 (가로, 세로)
+            output_size: 출력 이미지 최대 크기 (가로, 세로)
+            window_cache_size: 잘라낸 지도 창 캐시 개수
+        """
+        self.map_image_path = Path(map_image_path)
+        self.coord_w, self.coord_h = coord_size
+        self.output_w, self.output_h = output_size
+        self.window_cache_size = window_cache_size
+
+        self._base = None
+        self._base_lock = threading.Lock()
+        self._windows = OrderedDict()
+        self._windows_lock = threading.Lock()
+
+    def load_base_map(self):
+        """지도 이미지를 한 번만 디코딩해 흰 배경 RGB로 보관"""
+        if self._base is not None:
+            return self._base
+
+        with self._base_lock:
+            if self._base is None:
+                img = Image.open(str(self.map_image_path))
+                img.load()
+                if img.mode != 'RGB':
+                    background = Image.new('RGBA', img.size, (255, 255, 255, 255))
+                    img = Image.alpha_composite(background, img.convert('RGBA')).convert('RGB')
+                self._base = img
+                logger.info(f"Base map loaded: {self.map_image_path} {img.size}")
+        return self._base
+
+    def _layout(self, bounds):
+        """확대 영역에 맞는 출력 크기와 (지도 좌표 -> 출력 픽셀) 배율 계산"""
+        range_x = bounds['max_x'] - bounds['min_x']
+        range_y = bounds['max_y'] - bounds['min_y']
+        scale = min(self.output_w / range_x, self.output_h / range_y)
+        size = (max(1, int(round(range_x * scale))), max(1, int(round(range_y * scale))))
+        return size, scale
+
+    def _render_window(self, bounds, size, scale):
+        """확대 영역의 지도 창을 출력 크기로 잘라서 반환 (캐시 사용, 호출자는 복사본을 수정)"""
+        key = (round(bounds['min_x'], 1), round(bounds['min_y'], 1),
+               round(bounds['max_x'], 1), round(bounds['max_y'], 1), size)
+
+        with self._windows_lock:
+            cached = self._windows.get(key)
+            if cached is not None:
+                self._windows.move_to_end(key)
+                return cached
+
+        base = self.load_base_map()
+        sx = base.width / self.coord_w
+        sy = base.height / self.coord_h
+
+        window = Image.new('RGB', size, (255, 255, 255))
+
+        # 지도 밖 영역은 흰색으로 두고, 겹치는 부분만 잘라서 배치
+        src_x0 = max(0.0, bounds['min_x'] * sx)
+        src_y0 = max(0.0, bounds['min_y'] * sy)
+        src_x1 = min(float(base.width), bounds['max_x'] * sx)
+        src_y1 = min(float(base.height), bounds['max_y'] * sy)
+
+        if src_x1 > src_x0 and src_y1 > src_y0:
+            dst_x0 = int(round((src_x0 / sx - bounds['min_x']) * scale))
+            dst_y0 = int(round((src_y0 / sy - bounds['min_y']) * scale))
+            dst_w = max(1, int(round((src_x1 - src_x0) / sx * scale)))
+            dst_h = max(1, int(round((src_y1 - src_y0) / sy * scale)))
+            part = base.resize((dst_w, dst_h), Image.Resampling.BILINEAR, box=(src_x0, src_y0, src_x1, src_y1))
+            window.paste(part, (dst_x0, dst_y0))
+
+        with self._windows_lock:
+            self._windows[key] = window
+            self._windows.move_to_end(key)
+            while len(self._windows) > self.window_cache_size:
+                self._windows.popitem(last=False)
+
+        return window
+
+    @staticmethod
+    def _paste_center(canvas, sprite, center):
+        """스프라이트를 중심 좌표에 맞춰 합성 (가장자리에서 잘리는 경우 포함)"""
+        x = int(round(center[0] - sprite.width / 2))
+        y = int(round(center[1] - sprite.height / 2))
+        canvas.paste(sprite, (x, y), sprite)
+
+    @staticmethod
+    def _draw_circle_marker(draw, center, color, alpha=0.9):
+        """마스코트가 없을 때 쓰는 원형 마커 (기존 scatter s=250, 흰 테두리 3pt)"""
+        radius = (250 ** 0.5) / 2 * POINTS_TO_PIXELS
+        edge = 3 * POINTS_TO_PIXELS
+        cx, cy = center
+        fill = ImageColor.getrgb(color)[:3] + (int(255 * alpha),)
+        draw.ellipse((cx - radius - edge / 2, cy - radius - edge / 2, cx + radius + edge / 2, cy + radius + edge / 2),
+                     fill=(255, 255, 255, int(255 * alpha)))
+        draw.ellipse((cx - radius + edge / 2, cy - radius + edge / 2, cx + radius - edge / 2, cy + radius - edge / 2),
+                     fill=fill)
+
+    def render(self, path, bounds, line_width=2, line_alpha=0.5, markers=()):
+        """
+        경로 지도 렌더링
+
+        Args:
+            path: 경로 좌표 리스트 (지도 좌표계)
+            bounds: calculate_zoom_bounds 결과
+            line_width: 경로 선 두께 (포인트)
+            line_alpha: 경로 선 투명도
+            markers: [(좌표, 색상, 스프라이트 또는 None), ...]
+                스프라이트는 RGBA PIL 이미지, None이면 원형 마커로 표시
+
+        Returns:
+            bytes: PNG 이미지 데이터
+        """
+        size, scale = self._layout(bounds)
+        canvas = self._render_window(bounds, size, scale).convert('RGBA')
+
+        def to_px(p):
+            return ((p[0] - bounds['min_x']) * scale, (p[1] - bounds['min_y']) * scale)
+
+        overlay = Image.new('RGBA', size, (0, 0, 0, 0))
+        draw = ImageDraw.Draw(overlay)
+
+        # 경로 그리기
+        points = [to_px(p) for p in np.asarray(path, dtype=float)]
+        if len(points) > 1:
+            draw.line(points, fill=(255, 0, 0, int(255 * line_alpha)),
+                      width=max(1, int(round(line_width * POINTS_TO_PIXELS))), joint='curve')
+
+        # 원형 마커 (스프라이트 없는 경우)
+        for coords, color, sprite in markers:
+            if sprite is None:
+                self._draw_circle_marker(draw, to_px(coords), color)
+
+        canvas.alpha_composite(overlay)
+
+        # 마스코트 스프라이트
+        for coords, color, sprite in markers:
+            if sprite is not None:
+                self._paste_center(canvas, sprite, to_px(coords))
+
+        buf = io.BytesIO()
+        canvas.convert('RGB').save(buf, format='PNG', optimize=False)
+        return buf.getvalue()
+
+    def render_base64(self, *args, **kwargs):
+        """render 결과를 base64 문자열로 반환"""
+        return base64.b64encode(self.render(*args, **kwargs)).decode('utf-8')
@@ -0,0 +1,198 @@
+"""
+시설물 경로 인덱스 모듈
+시설물 간 최단 경로/거리를 미리 계산해 배열로 보관 (요청 시 그래프 탐색 없음)
+"""
+import hashlib
+import math
+from pathlib import Path
+import networkx as nx
+import numpy as np
+from app.logger import get_logger
+
+logger = get_logger()
+
+# 캐시 파일 포맷 버전 (구조가 바뀌면 올려서 재생성 유도)
+INDEX_FORMAT_VERSION = 1
+
+
+def compute_signature(*paths, extra=()):
+    """
+    입력 파일 내용(+보정값 등 추가 값)으로 인덱스 서명 생성
+
+    Args:
+        paths: 인덱스에 영향을 주는 파일 경로들
+        extra: 함께 해시할 추가 값 (좌표 보정값 등)
+
+    Returns:
+        str: sha1 hex digest
+    """
+    h = hashlib.sha1(str(INDEX_FORMAT_VERSION).encode())
+    for path in paths:
+        with open(path, 'rb') as f:
+            h.update(f.read())
+    h.update(repr(tuple(extra)).encode())
+    return h.hexdigest()
+
+
+class FacilityRouteIndex:
+    """
+    시설물 기준 최단 경로 트리 테이블
+
+    시설물이 스냅되는 도로 노드마다 단일 출발 다익스트라를 한 번씩 수행하고,
+    결과를 (출발 노드 수 x 전체 노드 수) 크기의 거리/선행 노드 배열로 저장합니다.
+    그래프는 무방향이므로 출발지나 도착지 중 하나가 시설물 노드이면
+    선행 노드를 따라가는 것만으로 O(경로 길이)에 경로를 복원할 수 있습니다.
+    """
+
+    def __init__(self, node_coords, source_nodes, dist, pred, signature):
+        """
+        Args:
+            node_coords: (N, 2) 도로 노드 좌표 배열 (KDTree 노드 순서와 동일)
+            source_nodes: (S,) 시설물 노드 인덱스 배열
+            dist: (S, N) 출발 노드별 최단 거리 (도달 불가 시 inf)
+            pred: (S, N) 출발 노드별 최단 경로 트리의 선행 노드 (루트/도달 불가 시 -1)
+            signature: 입력 파일 서명
+        """
+        self.node_coords = node_coords
+        self.source_nodes = source_nodes
+        self.dist = dist
+        self.pred = pred
+        self.signature = signature
+        self._row_of_node = {int(n): i for i, n in enumerate(source_nodes)}
+
+    @classmethod
+    def build(cls, G, node_list, tree, facilities, signature):
+        """
+        그래프와 시설물 목록으로 인덱스 생성
+
+        Args:
+            G: 도로망 그래프 (노드 = 좌표 튜플)
+            node_list: KDTree에 사용한 노드 목록
+            tree: 노드 KDTree
+            facilities: 시설물 목록 (x, y 포함)
+            signature: 입력 파일 서명
+
+        Returns:
+            FacilityRouteIndex
+        """
+        node_index = {node: i for i, node in enumerate(node_list)}
+        n_nodes = len(node_list)
+
+        # 각 시설물을 한 번만 도로 노드에 스냅
+        facility_coords = np.array([(f['x'], f['y']) for f in facilities], dtype=float)
+        _, snapped = tree.query(facility_coords)
+        source_nodes = np.unique(np.asarray(snapped, dtype=np.int32))
+
+        dist = np.full((len(source_nodes), n_nodes), np.inf, dtype=np.float64)
+        pred = np.full((len(source_nodes), n_nodes), -1, dtype=np.int32)
+
+        for row, src in enumerate(source_nodes):
+            source = node_list[src]
+            preds, dists = nx.dijkstra_predecessor_and_distance(G, source, weight='weight')
+            for node, d in dists.items():
+                idx = node_index[node]
+                dist[row, idx] = d
+                # 도로 데이터의 자기 루프(길이 0)로 인해 출발 노드가 자신을 선행 노드로 갖는 경우 제외
+                if node != source and preds[node]:
+                    pred[row, idx] = node_index[preds[node][0]]
+
+        logger.info(f"Route index built: {len(source_nodes)} facility nodes x {n_nodes} road nodes")
+        return cls(np.array(node_list, dtype=np.float64), source_nodes, dist, pred, signature)
+
+    @classmethod
+    def load(cls, path, signature, node_list):
+        """
+        캐시 파일에서 인덱스 로드 (서명이나 노드 구성이 다르면 None)
+
+        Args:
+            path: .npz 캐시 파일 경로
+            signature: 현재 입력 파일 서명
+            node_list: 현재 그래프의 노드 목록
+
+        Returns:
+            FacilityRouteIndex 또는 None
+        """
+        path = Path(path)
+        if not path.exists():
+            return None
+
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if str(data['signature']) != signature:
+                    logger.info("Route index cache is stale (input files changed)")
+                    return None
+                node_coords = data['node_coords']
+                if node_coords.shape != (len(node_list), 2) or not np.array_equal(node_coords, np.array(node_list, dtype=np.float64)):
+                    logger.info("Route index cache does not match current graph nodes")
+                    return None
+                index = cls(node_coords, data['source_nodes'], data['dist'], data['pred'], signature)
+            logger.info(f"Route index loaded from cache: {path}")
+            return index
+        except Exception as e:
+            logger.warning(f"Failed to load route index cache: {e}")
+            return None
+
+    def save(self, path):
+        """인덱스를 .npz 캐시 파일로 저장"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.stem + '.tmp.npz')
+        np.savez_compressed(
+            tmp_path,
+            signature=np.array(self.signature),
+            node_coords=self.node_coords,
+            source_nodes=self.source_nodes,
+            dist=self.dist,
+            pred=self.pred
+        )
+        tmp_path.replace(path)
+        logger.info(f"Route index saved: {path}")
+
+    def covers(self, node_idx):
+        """해당 노드가 인덱스의 출발 노드(시설물 노드)인지 여부"""
+        return int(node_idx) in self._row_of_node
+
+    def _walk(self, row, node_idx):
+        """node_idx에서 출발 노드(루트)까지 선행 노드를 따라간 노드 인덱스 목록"""
+        pred = self.pred[row]
+        walk = [int(node_idx)]
+        current = int(node_idx)
+        while pred[current] != -1:
+            current = int(pred[current])
+            walk.append(current)
+        return walk
+
+    def route(self, start_idx, end_idx):
+        """
+        인덱스로 경로 조회
+
+        Args:
+            start_idx: 출발 도로 노드 인덱스
+            end_idx: 도착 도로 노드 인덱스
+
+        Returns:
+            (path, length): path는 좌표 튜플 목록, 도달 불가 시 (None, inf)
+            두 노드 모두 시설물 노드가 아니면 None
+        """
+        start_idx, end_idx = int(start_idx), int(end_idx)
+
+        if start_idx in self._row_of_node:
+            row = self._row_of_node[start_idx]
+            length = self.dist[row, end_idx]
+            if math.isinf(length):
+                return None, length
+            # 도착지 -> 출발지(루트) 순으로 따라간 뒤 뒤집기
+            walk = self._walk(row, end_idx)[::-1]
+        elif end_idx in self._row_of_node:
+            row = self._row_of_node[end_idx]
+            length = self.dist[row, start_idx]
+            if math.isinf(length):
+                return None, length
+            # 출발지 -> 도착지(루트) 순서 그대로
+            walk = self._walk(row, start_idx)
+        else:
+            return None
+
+        coords = self.node_coords
+        path = [(coords[i, 0], coords[i, 1]) for i in walk]
+        return path, float(length)
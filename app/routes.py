@@ -1,20 +1,21 @@
-from flask import Blueprint, render_template, request, jsonify, current_app
+from flask import Blueprint, render_template, request, jsonify, current_app, Response, stream_with_context
 from app.logger import get_logger
 from werkzeug.utils import secure_filename
-import os
-import tempfile
+import io
 import csv
 import json
-import sqlite3
 from app.gemini_client import GeminiClient
 from app.wayfinding import WayfindingService
-from app.db import set_config, get_config
+from app.db import set_config, get_config, get_config_version, get_documents_by_category
 
 bp = Blueprint('main', __name__)
 
 # 길찾기 서비스 초기화
 wayfinding_service = None
 
+# 길찾기 응답 형식 (image: 서버 렌더링 PNG, vector: 좌표 배열 + 확대 영역)
+ROUTE_FORMATS = ('image', 'vector')
+
 def get_wayfinding_service():
     """길찾기 서비스 싱글톤 인스턴스 반환"""
     global wayfinding_service
@@ -22,31 +23,77 @@ def get_wayfinding_service():
         wayfinding_service = WayfindingService()
     return wayfinding_service
 
+def get_route_format(data):
+    """길찾기 응답 형식 ('image' 또는 'vector', JSON 본문 또는 쿼리 파라미터 format)"""
+    value = data.get('format')
+    if value is None or value == '':
+        value = request.args.get('format') or 'image'
+    # 문자열이 아니면 (예: {"format": 1}) 잘못된 형식으로 처리 → 호출부에서 400
+    if not isinstance(value, str):
+        return None
+    output_format = value.strip().lower()
+    return output_format if output_format in ROUTE_FORMATS else None
+
+def get_gemini_client():
+    """앱 공용 레지스트리에서 GeminiClient 인스턴스 반환 (연결 재사용)"""
+    registry = current_app.extensions.get('gemini_clients')
+    if registry is None:
+        return GeminiClient(current_app.config['GEMINI_API_KEY'])
+    return registry.get(current_app.config['GEMINI_API_KEY'])
+
+def get_answer_cache():
+    """앱 공용 답변 캐시 반환 (없으면 None)"""
+    return current_app.extensions.get('answer_cache')
+
+def invalidate_answer_cache(store_name):
+    """스토어 문서 변경 시 해당 스토어에 의존하는 캐시 답변 무효화"""
+    cache = get_answer_cache()
+    if cache is not None and store_name:
+        cache.invalidate_store(store_name)
+
 # 허용되는 파일 확장자
 ALLOWED_EXTENSIONS = {'pdf', 'txt', 'doc', 'docx', 'xlsx', 'xls', 'ppt', 'pptx', 'csv', 'json', 'xml', 'html'}
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-def convert_csv_to_json(file_path, filename):
+def get_upload_stream(file):
     """
-    CSV 파일을 JSON으로 변환
+    업로드된 파일(FileStorage)을 SDK에 바로 넘길 수 있는 바이너리 스트림으로 반환
 
     Args:
-        file_path: CSV 파일 경로
+        file: Flask 업로드 파일 (werkzeug FileStorage)
+
+    Returns:
+        처음 위치로 되감은 seek 가능한 바이너리 스트림 (임시 파일에 다시 쓰지 않음)
+    """
+    stream = file.stream
+    if not isinstance(stream, io.IOBase) or not stream.seekable():
+        stream = io.BytesIO(file.read())
+    stream.seek(0)
+    return stream
+
+def convert_csv_to_json(stream, filename):
+    """
+    CSV 파일을 JSON으로 변환 (메모리에서 처리)
+
+    Args:
+        stream: CSV 파일 바이너리 스트림
         filename: 원본 파일 이름
 
     Returns:
-        tuple: (변환된 JSON 파일 경로, 새 파일 이름)
+        tuple: (변환된 JSON 바이너리 스트림, 새 파일 이름)
     """
     logger = get_logger()
 
     # CSV 파일만 처리
     if not filename.lower().endswith('.csv'):
-        return file_path, filename
+        return stream, filename
 
     try:
         logger.info(f"Converting CSV to JSON: {filename}")
+        raw = stream.read()
+        stream.seek(0)
 
         # CSV 읽기 (여러 인코딩 시도)
         encodings = ['utf-8', 'cp949', 'euc-kr', 'latin-1']
@@ -54,9 +101,8 @@ def convert_csv_to_json(file_path, filename):
 
         for encoding in encodings:
             try:
-                with open(file_path, 'r', encoding=encoding) as csvfile:
-                    reader = csv.DictReader(csvfile)
-                    data = list(reader)
+                reader = csv.DictReader(io.StringIO(raw.decode(encoding), newline=''))
+                data = list(reader)
                 logger.info(f"Successfully read CSV with {encoding} encoding")
                 break
             except (UnicodeDecodeError, Exception) as e:
@@ -65,20 +111,19 @@ def convert_csv_to_json(file_path, filename):
 
         if data is None:
             logger.error(f"Failed to read CSV file with any encoding")
-            return file_path, filename
+            return stream, filename
 
-        # JSON으로 변환하여 임시 파일에 저장
+        # JSON으로 변환하여 메모리 스트림으로 반환
         json_filename = filename.rsplit('.', 1)[0] + '.json'
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.json', encoding='utf-8') as tmp_file:
-            json.dump(data, tmp_file, ensure_ascii=False, indent=2)
-            new_path = tmp_file.name
+        json_stream = io.BytesIO(json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8'))
 
         logger.info(f"Converted CSV to JSON: {json_filename} ({len(data)} rows)")
-        return new_path, json_filename
+        return json_stream, json_filename
 
     except Exception as e:
         logger.error(f"Error converting CSV to JSON: {str(e)}", exc_info=True)
-        return file_path, filename
+        stream.seek(0)
+        return stream, filename
 
 # ==================== Index Route ====================
 
@@ -122,7 +167,7 @@ def create_store():
 
         logger.debug(f'Store creation attempt - Name: {store_name} - IP: {client_ip}')
 
-        gemini = GeminiClient(current_app.config['GEMINI_API_KEY'])
+        gemini = get_gemini_client()
         result = gemini.create_file_search_store(store_name)
 
         if result['success']:
@@ -145,7 +190,7 @@ def list_stores():
     try:
         logger.info(f'Store list retrieval request - IP: {client_ip}')
 
-        gemini = GeminiClient(current_app.config['GEMINI_API_KEY'])
+        gemini = get_gemini_client()
         result = gemini.list_file_search_stores()
 
         if result['success']:
@@ -170,7 +215,7 @@ def get_store(store_id):
     try:
         logger.info(f'Store retrieval request - Store ID: {store_id} - IP: {client_ip}')
 
-        gemini = GeminiClient(current_app.config['GEMINI_API_KEY'])
+        gemini = get_gemini_client()
         result = gemini.get_file_search_store(store_id)
 
         if result['success']:
@@ -194,13 +239,22 @@ def get_store_documents(store_id):
     try:
         logger.info(f'Store document list retrieval request - Store ID: {store_id} - IP: {client_ip}')
 
-        gemini = GeminiClient(current_app.config['GEMINI_API_KEY'])
-        result = gemini.list_documents_in_store(store_id)
+        # page_size/page_token이 있으면 한 페이지만, 없으면 전체 목록 반환
+        page_token = request.args.get('page_token')
+        page_size = request.args.get('page_size', type=int)
+        paginated = page_token is not None or page_size is not None
+
+        gemini = get_gemini_client()
+        result = gemini.list_documents_in_store(
+            store_id,
+            page_size=page_size or 20,
+            page_token=page_token or None,
+            all_pages=not paginated
+        )
 
         if result['success']:
             doc_count = result.get('count', 0)
             logger.info(f'Store document list retrieval successful - Store ID: {store_id} - Count: {doc_count} - IP: {client_ip}')
-            logger.debug(f'Retrieved documents: {result.get("documents")} - IP: {client_ip}')
             return jsonify(result), 200
         else:
             logger.error(f'Store document list retrieval failed - Store ID: {store_id} - Error: {result.get("error")} - IP: {client_ip}')
@@ -219,10 +273,11 @@ def delete_store(store_id):
     try:
         logger.info(f'Store deletion request - Store ID: {store_id} - IP: {client_ip}')
 
-        gemini = GeminiClient(current_app.config['GEMINI_API_KEY'])
+        gemini = get_gemini_client()
         result = gemini.delete_file_search_store(store_id)
 
         if result['success']:
+            invalidate_answer_cache(store_id)
             logger.info(f'Store deletion successful - Store ID: {store_id} - IP: {client_ip}')
             return jsonify(result), 200
         else:
@@ -259,39 +314,22 @@ def upload_file():
 
         logger.debug(f'File upload started - Filename: {file.filename} - IP: {client_ip}')
 
-        # 임시 파일에 저장
         original_filename = file.filename  # 원본 파일명 저장
-        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(file.filename)[1]) as tmp:
-            file.save(tmp.name)
-            tmp_path = tmp.name
 
-        converted_path = None
-        try:
-            # CSV 파일을 JSON으로 변환
-            converted_path, converted_filename = convert_csv_to_json(tmp_path, original_filename)
-            final_path = converted_path
-            final_filename = converted_filename
-
-            # Gemini Files API를 통해 파일 업로드 (변환된 파일명을 display_name으로 전달)
-            gemini = GeminiClient(current_app.config['GEMINI_API_KEY'])
-            result = gemini.upload_file(final_path, display_name=final_filename)
-
-            if result['success']:
-                logger.info(f'File upload successful - Original: {original_filename} - Uploaded as: {final_filename} - File ID: {result.get("file_id")} - IP: {client_ip}')
-                logger.debug(f'Upload result: {result} - IP: {client_ip}')
-                return jsonify(result), 201
-            else:
-                logger.error(f'File upload failed - Filename: {final_filename} - Error: {result.get("error")} - IP: {client_ip}')
-                return jsonify(result), 400
-        finally:
-            # 임시 파일 삭제
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
-                logger.debug(f'Temporary file deletion completed - Path: {tmp_path} - IP: {client_ip}')
-            # 변환된 파일도 삭제 (원본과 다른 경우)
-            if converted_path and converted_path != tmp_path and os.path.exists(converted_path):
-                os.remove(converted_path)
-                logger.debug(f'Converted file deletion completed - Path: {converted_path} - IP: {client_ip}')
+        # CSV 파일을 JSON으로 변환 (임시 파일 없이 업로드 스트림을 그대로 사용)
+        final_stream, final_filename = convert_csv_to_json(get_upload_stream(file), original_filename)
+
+        # Gemini Files API를 통해 파일 업로드 (변환된 파일명을 display_name으로 전달)
+        gemini = get_gemini_client()
+        result = gemini.upload_file(final_stream, display_name=final_filename)
+
+        if result['success']:
+            logger.info(f'File upload successful - Original: {original_filename} - Uploaded as: {final_filename} - File ID: {result.get("file_id")} - IP: {client_ip}')
+            logger.debug(f'Upload result: {result} - IP: {client_ip}')
+            return jsonify(result), 201
+        else:
+            logger.error(f'File upload failed - Filename: {final_filename} - Error: {result.get("error")} - IP: {client_ip}')
+            return jsonify(result), 400
 
     except Exception as e:
         logger.error(f'File upload exception occurred - IP: {client_ip} - Error: {str(e)}', exc_info=True)
@@ -316,10 +354,11 @@ def import_file(file_id):
 
         logger.debug(f'File import attempt - File ID: {file_id} - Store ID: {store_id} - Metadata: {metadata} - IP: {client_ip}')
 
-        gemini = GeminiClient(current_app.config['GEMINI_API_KEY'])
+        gemini = get_gemini_client()
         result = gemini.import_file_to_store(file_id, store_id, metadata)
 
         if result['success']:
+            invalidate_answer_cache(store_id)
             logger.info(f'File import successful - File ID: {file_id} - Store ID: {store_id} - IP: {client_ip}')
             return jsonify(result), 200
         else:
@@ -339,7 +378,7 @@ def list_files():
     try:
         logger.info(f'File list retrieval request - IP: {client_ip}')
 
-        gemini = GeminiClient(current_app.config['GEMINI_API_KEY'])
+        gemini = get_gemini_client()
         result = gemini.list_files()
 
         if result['success']:
@@ -364,7 +403,7 @@ def get_file_info(file_id):
     try:
         logger.info(f'File information retrieval request - File ID: {file_id} - IP: {client_ip}')
 
-        gemini = GeminiClient(current_app.config['GEMINI_API_KEY'])
+        gemini = get_gemini_client()
         result = gemini.get_file(file_id)
 
         if result['success']:
@@ -388,7 +427,7 @@ def delete_file(file_id):
     try:
         logger.info(f'File deletion request - File ID: {file_id} - IP: {client_ip}')
 
-        gemini = GeminiClient(current_app.config['GEMINI_API_KEY'])
+        gemini = get_gemini_client()
         result = gemini.delete_file(file_id)
 
         if result['success']:
@@ -411,7 +450,7 @@ def delete_all_files():
     try:
         logger.info(f'Delete all files request - IP: {client_ip}')
 
-        gemini = GeminiClient(current_app.config['GEMINI_API_KEY'])
+        gemini = get_gemini_client()
 
         # 모든 파일 목록 조회
         files_result = gemini.list_files()
@@ -473,10 +512,11 @@ def delete_document(document_name):
     try:
         logger.info(f'Document deletion request - Document: {document_name} - IP: {client_ip}')
 
-        gemini = GeminiClient(current_app.config['GEMINI_API_KEY'])
+        gemini = get_gemini_client()
         result = gemini.delete_document_from_store(document_name)
 
         if result['success']:
+            invalidate_answer_cache(document_name.split('/documents/')[0])
             logger.info(f'Document deletion successful - Document: {document_name} - IP: {client_ip}')
             return jsonify(result), 200
         else:
@@ -496,10 +536,11 @@ def delete_all_documents(store_name):
     try:
         logger.info(f'Delete all documents request - Store: {store_name} - IP: {client_ip}')
 
-        gemini = GeminiClient(current_app.config['GEMINI_API_KEY'])
+        gemini = get_gemini_client()
         result = gemini.delete_all_documents_from_store(store_name)
 
         if result['success']:
+            invalidate_answer_cache(store_name)
             logger.info(f'Delete all documents successful - Store: {store_name} - Deleted: {result["deleted_count"]}/{result["total_count"]} - IP: {client_ip}')
             return jsonify(result), 200
         else:
@@ -527,15 +568,7 @@ def delete_documents_by_category(store_name):
         logger.info(f'Delete documents by category request - Store: {store_name} - Category: {category} - IP: {client_ip}')
 
         # 해당 카테고리의 문서들 조회
-        from app.db import get_all_mappings
-        conn = sqlite3.connect('data/document_mappings.db')
-        cursor = conn.cursor()
-        cursor.execute('''
-            SELECT document_name FROM document_mappings
-            WHERE store_name = ? AND category = ?
-        ''', (store_name, category))
-        documents = cursor.fetchall()
-        conn.close()
+        documents = get_documents_by_category(store_name, category)
 
         if not documents:
             logger.info(f'No documents found for category - Store: {store_name} - Category: {category} - IP: {client_ip}')
@@ -547,12 +580,12 @@ def delete_documents_by_category(store_name):
             }), 200
 
         # 문서 삭제
-        gemini = GeminiClient(current_app.config['GEMINI_API_KEY'])
+        gemini = get_gemini_client()
         deleted_count = 0
         failed_count = 0
         errors = []
 
-        for (doc_name,) in documents:
+        for doc_name in documents:
             try:
                 result = gemini.delete_document_from_store(doc_name)
                 if result['success']:
@@ -564,6 +597,9 @@ def delete_documents_by_category(store_name):
                 failed_count += 1
                 errors.append(f"Error deleting {doc_name}: {str(e)}")
 
+        if deleted_count:
+            invalidate_answer_cache(store_name)
+
         logger.info(f'Delete by category completed - Store: {store_name} - Category: {category} - Deleted: {deleted_count}/{len(documents)} - IP: {client_ip}')
 
         return jsonify({
@@ -581,6 +617,35 @@ def delete_documents_by_category(store_name):
 
 # ==================== Search ====================
 
+# 파싱된 활성 스토어 목록 캐시 (설정 버전이 바뀔 때만 다시 파싱)
+_active_store_ids_cache = {'version': None, 'store_ids': []}
+
+def get_active_store_ids():
+    """설정된 활성 스토어 목록 반환 (단일 active_store_name 하위 호환)"""
+    version = get_config_version()
+    cached = _active_store_ids_cache
+    if cached['version'] == version:
+        return list(cached['store_ids'])
+
+    store_ids = []
+    active_stores_json = get_config('active_stores')
+    if active_stores_json:
+        try:
+            store_ids = json.loads(active_stores_json)
+        except json.JSONDecodeError:
+            store_ids = []
+    else:
+        # Fallback to single active store for backward compatibility
+        active_store = get_config('active_store_name')
+        store_ids = [active_store] if active_store else []
+
+    _active_store_ids_cache.update(version=version, store_ids=store_ids)
+    return list(store_ids)
+
+def format_sse(event, data):
+    """Server-Sent Events 메시지 포맷"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
 @bp.route('/api/search', methods=['POST'])
 def search():
     """FileSearch로 검색 (활성 스토어 사용)"""
@@ -600,16 +665,7 @@ def search():
             return jsonify({'success': False, 'error': 'Query is required'}), 400
 
         # Get active stores from config (supports multiple stores)
-        active_stores_json = get_config('active_stores')
-        if active_stores_json:
-            try:
-                store_ids = json.loads(active_stores_json)
-            except json.JSONDecodeError:
-                store_ids = []
-        else:
-            # Fallback to single active store for backward compatibility
-            active_store = get_config('active_store_name')
-            store_ids = [active_store] if active_store else []
+        store_ids = get_active_store_ids()
 
         if not store_ids:
             logger.warning(f'No active stores configured - IP: {client_ip}')
@@ -617,9 +673,22 @@ def search():
 
         logger.debug(f'Search started - Query: {query} - Active Stores: {store_ids} - History: {len(history)} messages - IP: {client_ip}')
 
-        gemini = GeminiClient(current_app.config['GEMINI_API_KEY'])
+        # 대화 맥락이 없는 질문만 캐시 사용 (이전 대화에 따라 답변이 달라지므로)
+        cache = get_answer_cache() if not history and not metadata_filter else None
+        cache_scope = None
+        if cache is not None:
+            cached, cache_scope = cache.get(query, store_ids)
+            if cached is not None:
+                logger.info(f'Search served from cache - Query: {query} - Stores: {store_ids} - IP: {client_ip}')
+                return jsonify(dict(cached, cached=True)), 200
+
+        gemini = get_gemini_client()
         result = gemini.search_with_file_search(query, store_ids, metadata_filter, history=history)
 
+        # 조회 시점의 스토어 버전으로 저장 (생성 중에 스토어가 갱신되면 이전 버전 답변이 새 버전으로 저장되지 않도록)
+        if result['success'] and cache is not None:
+            cache.put(query, store_ids, result, scope=cache_scope)
+
         if result['success']:
             logger.info(f'Search successful - Query: {query} - Stores: {store_ids} - IP: {client_ip}')
             logger.debug(f'Search result length: {len(result.get("result", ""))} characters - IP: {client_ip}')
@@ -632,6 +701,91 @@ def search():
         logger.error(f'Search exception occurred - IP: {client_ip} - Error: {str(e)}', exc_info=True)
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@bp.route('/api/search/stream', methods=['POST'])
+def search_stream():
+    """FileSearch 스트리밍 검색 (SSE로 토큰 전송, 마지막에 grounding 메타데이터 전송)"""
+    logger = get_logger()
+    client_ip = request.remote_addr
+
+    try:
+        logger.info(f'Streaming search request - IP: {client_ip}')
+
+        data = request.get_json()
+        query = data.get('query', '').strip()
+        history = data.get('history', [])
+
+        if not query:
+            logger.warning(f'Search query is missing - IP: {client_ip}')
+            return jsonify({'success': False, 'error': 'Query is required'}), 400
+
+        store_ids = get_active_store_ids()
+
+        if not store_ids:
+            logger.warning(f'No active stores configured - IP: {client_ip}')
+            return jsonify({'success': False, 'error': 'No active FileStores configured. Please contact administrator.'}), 400
+
+        logger.debug(f'Streaming search started - Query: {query} - Active Stores: {store_ids} - History: {len(history)} messages - IP: {client_ip}')
+
+        cache = get_answer_cache() if not history else None
+        cached, cache_scope = cache.get(query, store_ids) if cache is not None else (None, None)
+        if cached is not None:
+            logger.info(f'Streaming search served from cache - Query: {query} - Stores: {store_ids} - IP: {client_ip}')
+
+            def generate_cached():
+                yield format_sse('token', {'text': cached.get('result', '')})
+                yield format_sse('done', dict(cached, cached=True))
+
+            return Response(
+                generate_cached(),
+                mimetype='text/event-stream',
+                headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+            )
+
+        gemini = get_gemini_client()
+
+        def generate():
+            for event in gemini.stream_search_with_file_search(query, store_ids, history=history):
+                event_type = event.pop('type')
+                if event_type == 'token':
+                    yield format_sse('token', event)
+                elif event_type == 'done':
+                    logger.info(f'Streaming search successful - Query: {query} - Stores: {store_ids} - IP: {client_ip}')
+                    if cache is not None:
+                        cache.put(query, store_ids, event, scope=cache_scope)
+                    yield format_sse('done', event)
+                else:
+                    logger.error(f'Streaming search failed - Query: {query} - Error: {event.get("error")} - IP: {client_ip}')
+                    yield format_sse('error', event)
+
+        return Response(
+            stream_with_context(generate()),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+
+    except Exception as e:
+        logger.error(f'Streaming search exception occurred - IP: {client_ip} - Error: {str(e)}', exc_info=True)
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@bp.route('/api/search/cache/stats', methods=['GET'])
+def search_cache_stats():
+    """답변 캐시 적중/미스 통계 조회"""
+    logger = get_logger()
+    client_ip = request.remote_addr
+
+    try:
+        cache = get_answer_cache()
+        if cache is None:
+            return jsonify({'success': False, 'error': 'Answer cache is disabled'}), 404
+
+        stats = cache.get_stats()
+        logger.info(f'Answer cache stats retrieved - Hits: {stats["hits"]} - Near hits: {stats["near_hits"]} - Misses: {stats["misses"]} - IP: {client_ip}')
+        return jsonify({'success': True, 'stats': stats}), 200
+
+    except Exception as e:
+        logger.error(f'Answer cache stats exception - IP: {client_ip} - Error: {str(e)}', exc_info=True)
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 # ==================== File Preview Route ====================
 
 @bp.route('/api/files/<path:file_id>/preview', methods=['GET'])
@@ -646,7 +800,7 @@ def preview_file(file_id):
     
     logger.info(f'File preview request - File ID: {file_id}, IP: {client_ip}')
     try:
-        gemini = GeminiClient(current_app.config['GEMINI_API_KEY'])
+        gemini = get_gemini_client()
         file_info = gemini.get_file(file_id)
         
         if not file_info.get('success'):
@@ -700,48 +854,32 @@ def upload_to_store():
             logger.warning(f'Unsupported file type - Filename: {file.filename} - IP: {client_ip}')
             return jsonify({'success': False, 'error': 'File type not allowed'}), 400
 
-        # 임시 파일에 저장
-        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(file.filename)[1]) as tmp_file:
-            file.save(tmp_file.name)
-            tmp_file_path = tmp_file.name
+        # CSV 파일을 JSON으로 변환 (직접 업로드 시에도 변환 적용, 임시 파일 없이 메모리에서 처리)
+        final_stream, final_filename = convert_csv_to_json(get_upload_stream(file), file.filename)
 
-        converted_path = None
-        try:
-            # CSV 파일을 JSON으로 변환 (직접 업로드 시에도 변환 적용)
-            converted_path, converted_filename = convert_csv_to_json(tmp_file_path, file.filename)
-            final_file_path = converted_path
-            final_filename = converted_filename
-
-            logger.debug(f'FileStore upload attempt - File: {final_filename} - Store: {store_name} - Category: {category} - IP: {client_ip}')
-
-            gemini = GeminiClient(current_app.config['GEMINI_API_KEY'])
-            result = gemini.upload_and_import_to_store(
-                file_path=final_file_path,
-                store_name=store_name,
-                display_name=final_filename,
-                category=category
-            )
+        logger.debug(f'FileStore upload attempt - File: {final_filename} - Store: {store_name} - Category: {category} - IP: {client_ip}')
+
+        gemini = get_gemini_client()
+        result = gemini.upload_and_import_to_store(
+            file=final_stream,
+            store_name=store_name,
+            display_name=final_filename,
+            category=category
+        )
 
-            if result['success']:
-                logger.info(f'FileStore upload successful - Original: {file.filename} - Final: {final_filename} - Store: {store_name} - Category: {category} - IP: {client_ip}')
-                return jsonify(result), 201
-            else:
-                error_msg = result.get("error", "Unknown error")
-                logger.error(f'FileStore upload failed - Original: {file.filename} - Final: {final_filename} - Error: {error_msg} - IP: {client_ip}')
-                return jsonify({
-                    'success': False,
-                    'error': error_msg,
-                    'original_file': file.filename,
-                    'converted_file': final_filename
-                }), 400
-
-        finally:
-            # 임시 파일 삭제
-            if os.path.exists(tmp_file_path):
-                os.remove(tmp_file_path)
-            # 변환된 파일도 삭제 (원본과 다른 경우)
-            if converted_path and converted_path != tmp_file_path and os.path.exists(converted_path):
-                os.remove(converted_path)
+        if result['success']:
+            invalidate_answer_cache(store_name)
+            logger.info(f'FileStore upload successful - Original: {file.filename} - Final: {final_filename} - Store: {store_name} - Category: {category} - IP: {client_ip}')
+            return jsonify(result), 201
+        else:
+            error_msg = result.get("error", "Unknown error")
+            logger.error(f'FileStore upload failed - Original: {file.filename} - Final: {final_filename} - Error: {error_msg} - IP: {client_ip}')
+            return jsonify({
+                'success': False,
+                'error': error_msg,
+                'original_file': file.filename,
+                'converted_file': final_filename
+            }), 400
 
     except Exception as e:
         logger.error(f'FileStore upload exception occurred - IP: {client_ip} - Error: {str(e)}', exc_info=True)
@@ -770,7 +908,7 @@ def import_file_to_store():
 
         logger.debug(f'File import attempt - File: {file_id} - Store: {store_name} - Filename: {original_filename} - Category: {category} - IP: {client_ip}')
 
-        gemini = GeminiClient(current_app.config['GEMINI_API_KEY'])
+        gemini = get_gemini_client()
         result = gemini.import_file_to_store(
             file_id=file_id,
             store_name=store_name,
@@ -779,6 +917,7 @@ def import_file_to_store():
         )
 
         if result['success']:
+            invalidate_answer_cache(store_name)
             logger.info(f'File import successful - File: {file_id} - Store: {store_name} - Category: {category} - IP: {client_ip}')
             return jsonify(result), 201
         else:
@@ -829,7 +968,7 @@ def set_active_store():
             return jsonify({'success': False, 'error': 'Store name is required'}), 400
 
         # Store name 유효성 검증 (실제 존재하는지)
-        gemini = GeminiClient(current_app.config['GEMINI_API_KEY'])
+        gemini = get_gemini_client()
         store_info = gemini.get_file_search_store(store_name)
 
         if not store_info.get('success'):
@@ -861,18 +1000,8 @@ def get_active_stores():
     try:
         logger.info(f'Get active stores request - IP: {client_ip}')
 
-        # JSON으로 저장된 다중 active stores 조회
-        active_stores_json = get_config('active_stores')
-        if active_stores_json:
-            try:
-                active_stores = json.loads(active_stores_json)
-            except json.JSONDecodeError:
-                # JSON 파싱 실패 시 빈 리스트
-                active_stores = []
-        else:
-            # 새 설정이 없으면 기존 단일 active_store_name을 사용
-            active_store = get_config('active_store_name')
-            active_stores = [active_store] if active_store else []
+        # JSON으로 저장된 다중 active stores 조회 (없으면 기존 단일 active_store_name 사용)
+        active_stores = get_active_store_ids()
 
         logger.info(f'Active stores retrieved: {active_stores} - IP: {client_ip}')
         return jsonify({
@@ -905,7 +1034,7 @@ def set_active_stores():
             return jsonify({'success': False, 'error': 'At least one store must be selected'}), 400
 
         # Store names 유효성 검증
-        gemini = GeminiClient(current_app.config['GEMINI_API_KEY'])
+        gemini = get_gemini_client()
         invalid_stores = []
         for store_name in store_names:
             store_info = gemini.get_file_search_store(store_name)
@@ -979,10 +1108,15 @@ def find_path():
             logger.warning(f'Start and end are the same - IP: {client_ip}')
             return jsonify({'success': False, 'error': 'Start and end locations must be different'}), 400
 
+        output_format = get_route_format(data)
+        if output_format is None:
+            logger.warning(f'Invalid route format - IP: {client_ip}')
+            return jsonify({'success': False, 'error': f"format must be one of {', '.join(ROUTE_FORMATS)}"}), 400
+
         logger.debug(f'Finding path - Start: {start_name} - End: {end_name} - IP: {client_ip}')
 
         service = get_wayfinding_service()
-        result = service.find_path(start_name, end_name)
+        result = service.find_path(start_name, end_name, output_format)
 
         if result['success']:
             logger.info(f'Path found successfully - Start: {start_name} - End: {end_name} - Distance: {result.get("distance")} - IP: {client_ip}')
@@ -1014,10 +1148,15 @@ def find_path_coords():
             logger.warning(f'Missing coordinates - IP: {client_ip}')
             return jsonify({'success': False, 'error': 'All coordinates (start_x, start_y, end_x, end_y) are required'}), 400
 
+        output_format = get_route_format(data)
+        if output_format is None:
+            logger.warning(f'Invalid route format - IP: {client_ip}')
+            return jsonify({'success': False, 'error': f"format must be one of {', '.join(ROUTE_FORMATS)}"}), 400
+
         logger.debug(f'Finding path - Start: ({start_x}, {start_y}) - End: ({end_x}, {end_y}) - IP: {client_ip}')
 
         service = get_wayfinding_service()
-        result = service.find_path_from_coords(start_x, start_y, end_x, end_y)
+        result = service.find_path_from_coords(start_x, start_y, end_x, end_y, output_format)
 
         if result['success']:
             logger.info(f'Path found successfully - Distance: {result.get("distance")} - IP: {client_ip}')
@@ -1049,11 +1188,16 @@ def find_nearest_facility():
             logger.warning(f'Missing coordinates - IP: {client_ip}')
             return jsonify({'success': False, 'error': 'Coordinates (x, y) are required'}), 400
 
+        output_format = get_route_format(data)
+        if output_format is None:
+            logger.warning(f'Invalid route format - IP: {client_ip}')
+            return jsonify({'success': False, 'error': f"format must be one of {', '.join(ROUTE_FORMATS)}"}), 400
+
         search_term = name_pattern if name_pattern else category
         logger.debug(f'Finding nearest {search_term} - Location: ({x}, {y}) - IP: {client_ip}')
 
         service = get_wayfinding_service()
-        result = service.find_nearest_facility_by_category(x, y, category, name_pattern)
+        result = service.find_nearest_facility_by_category(x, y, category, name_pattern, output_format)
 
         if result['success']:
             logger.info(f'Nearest facility found - Category: {category} - IP: {client_ip}')
@@ -5,43 +5,17 @@
 import json
 import networkx as nx
 import math
-import matplotlib
-matplotlib.use('Agg')  # GUI 없이 사용하기 위한 설정
-import matplotlib.pyplot as plt
-import matplotlib.image as mpimg
+import threading
 from scipy.spatial import KDTree
 import numpy as np
-from matplotlib import font_manager, rc
-from matplotlib.offsetbox import OffsetImage, AnnotationBbox
-from matplotlib.patches import Circle
-import platform
-import os
 from pathlib import Path
-import io
-import base64
 from app.logger import get_logger
+from app.route_index import FacilityRouteIndex, compute_signature
+from app.map_renderer import RouteMapRenderer, calculate_zoom_bounds
 from PIL import Image, ImageDraw
 
 logger = get_logger()
 
-# 한글 폰트 설정
-def set_korean_font():
-    """한글 폰트 설정 (깨짐 방지)"""
-    system_name = platform.system()
-    if system_name == 'Windows':
-        path = "c:/Windows/Fonts/malgun.ttf"
-        if os.path.exists(path):
-            try:
-                font_name = font_manager.FontProperties(fname=path).get_name()
-                rc('font', family=font_name)
-            except:
-                pass
-    elif system_name == 'Darwin':  # Mac
-        rc('font', family='AppleGothic')
-    plt.rcParams['axes.unicode_minus'] = False
-
-set_korean_font()
-
 class WayfindingService:
     """길찾기 서비스 클래스"""
 
@@ -56,6 +30,7 @@ class WayfindingService:
         self.roads_geojson_path = self.map_dir / 'roads.geojson'
         self.facilities_json_path = self.map_dir / 'olympic_facilities.json'
         self.mascot_image_path = Path('static/images/mascot_profile.png')
+        self.route_index_path = Path('data') / 'route_index.npz'
 
         # 좌표 보정값
         self.CALIB_X_OFFSET = 33.0
@@ -66,29 +41,69 @@ class WayfindingService:
         # 거리 환산 (800 픽셀 = 2km)
         self.PIXEL_TO_KM = 2.0 / 800.0  # 1 픽셀 = 0.0025 km
 
+        # 지도 좌표계 크기 및 마커 크기 (기존 OffsetImage zoom=0.5, 150 dpi 기준)
+        self.MAP_COORD_SIZE = (953, 676)
+        self.MARKER_PIXELS = 65
+
+        # 지도 렌더러 (지도 이미지는 첫 렌더링 시 한 번만 디코딩)
+        self.renderer = RouteMapRenderer(self.map_image_path, coord_size=self.MAP_COORD_SIZE)
+
         # 캐시된 데이터
         self._graph = None
         self._facilities = None
         self._tree = None
         self._node_list = None
+        self._route_index = None
+
+        # 마커 스프라이트 캐시 ((테두리 색상, 크기) -> RGBA 이미지, 원본 파일 mtime이 바뀌면 무효화)
+        self._marker_lock = threading.Lock()
+        self._marker_sprites = {}
+        self._mascot_source = None
+        self._mascot_mtime = None
 
         logger.info(f"WayfindingService initialized with map_dir: {map_dir}")
 
+    def _check_mascot_source(self):
+        """
+        마스코트 원본 파일 변경 여부 확인 (파일 정보만 조회, 디코딩 없음)
+        mtime이 바뀌었으면 원본/스프라이트 캐시를 비움
+
+        Returns:
+            int: 원본 파일 mtime (ns), 파일이 없으면 None
+        """
+        try:
+            mtime = self.mascot_image_path.stat().st_mtime_ns
+        except OSError:
+            mtime = None
+
+        with self._marker_lock:
+            if mtime != self._mascot_mtime:
+                if self._mascot_mtime is not None:
+                    logger.info(f"Mascot image changed, marker sprite cache cleared: {self.mascot_image_path}")
+                self._mascot_mtime = mtime
+                self._mascot_source = None
+                self._marker_sprites.clear()
+        return mtime
+
+    def _get_mascot_source(self):
+        """정사각형으로 크롭한 마스코트 원본 (한 번만 디코딩해서 보관)"""
+        with self._marker_lock:
+            if self._mascot_source is None:
+                mascot = Image.open(str(self.mascot_image_path)).convert('RGBA')
+
+                # 정사각형으로 크롭 (중앙 기준)
+                width, height = mascot.size
+                min_dim = min(width, height)
+                left = (width - min_dim) // 2
+                top = (height - min_dim) // 2
+                self._mascot_source = mascot.crop((left, top, left + min_dim, top + min_dim))
+            return self._mascot_source
+
     def create_circular_mascot(self, border_color, size=100):
         """원형 액자에 마스코트 이미지를 넣어서 반환"""
         try:
-            # 마스코트 이미지 로드
-            mascot = Image.open(str(self.mascot_image_path)).convert('RGBA')
-
-            # 정사각형으로 크롭 (중앙 기준)
-            width, height = mascot.size
-            min_dim = min(width, height)
-            left = (width - min_dim) // 2
-            top = (height - min_dim) // 2
-            mascot = mascot.crop((left, top, left + min_dim, top + min_dim))
-
-            # 리사이즈
-            mascot = mascot.resize((size, size), Image.Resampling.LANCZOS)
+            # 마스코트 이미지 로드 (크롭된 원본 재사용) 및 리사이즈
+            mascot = self._get_mascot_source().resize((size, size), Image.Resampling.LANCZOS)
 
             # 원형 마스크 생성
             mask = Image.new('L', (size, size), 0)
@@ -183,54 +198,192 @@ class WayfindingService:
         self._graph = G
 
         logger.info(f"Graph loaded: {len(nodes)} nodes, {len(G.edges)} edges")
+
+        # 5) 시설물 간 경로 인덱스 로드 (입력 파일이 바뀐 경우에만 재생성)
+        self._route_index = self.load_route_index(G, self._facilities, self._tree, nodes)
+
         return self._graph, self._facilities, self._tree, self._node_list
 
-    def calculate_path_bounds_and_zoom(self, ax, path, start_coords, end_coords, margin_percent=0.2):
+    def load_route_index(self, G, facilities, tree, node_list):
+        """
+        시설물 경로 인덱스를 캐시에서 로드하거나 새로 생성
+
+        roads.geojson / olympic_facilities.json / 좌표 보정값의 서명이 같으면
+        캐시 파일을 그대로 사용하고, 다르면 재생성 후 저장합니다.
         """
-        경로의 범위를 계산하고 해당 영역으로 확대
+        try:
+            signature = compute_signature(
+                self.roads_geojson_path, self.facilities_json_path,
+                extra=(self.CALIB_X_OFFSET, self.CALIB_Y_OFFSET, self.CALIB_X_SCALE, self.CALIB_Y_SCALE)
+            )
+            index = FacilityRouteIndex.load(self.route_index_path, signature, node_list)
+            if index is None:
+                index = FacilityRouteIndex.build(G, node_list, tree, facilities, signature)
+                try:
+                    index.save(self.route_index_path)
+                except Exception as e:
+                    logger.warning(f"Failed to save route index cache: {e}")
+            return index
+        except Exception as e:
+            logger.error(f"Failed to prepare route index: {e}", exc_info=True)
+            return None
+
+    def shortest_path(self, G, node_list, s_idx, e_idx):
+        """
+        두 도로 노드 사이 최단 경로 조회
+
+        출발지/도착지 중 하나가 시설물 노드이면 경로 인덱스로 O(경로 길이)에 응답하고,
+        아니면 다익스트라를 한 번만 수행합니다.
+
+        Returns:
+            tuple: (경로 좌표 리스트, 경로 길이)
+
+        Raises:
+            nx.NetworkXNoPath: 경로가 없을 때
+        """
+        if self._route_index is not None:
+            indexed = self._route_index.route(s_idx, e_idx)
+            if indexed is not None:
+                path, path_length = indexed
+                if path is None:
+                    raise nx.NetworkXNoPath()
+                return path, path_length
+
+        path_length, path = nx.single_source_dijkstra(G, node_list[s_idx], node_list[e_idx], weight='weight')
+        return path, path_length
+
+    def calculate_path_bounds_and_zoom(self, path, start_coords, end_coords, margin_percent=0.2):
+        """
+        경로의 범위를 계산해 확대 영역 반환
 
         Args:
-            ax: matplotlib axis 객체
             path: 경로 좌표 리스트
             start_coords: 출발지 좌표 (x, y)
             end_coords: 도착지 좌표 (x, y)
             margin_percent: 여백 비율 (기본 20%)
+
+        Returns:
+            dict: {'min_x', 'max_x', 'min_y', 'max_y'} (지도 좌표계)
+        """
+        bounds = calculate_zoom_bounds(path, start_coords, end_coords, margin_percent)
+        logger.info(f"Zoom bounds calculated: x=({bounds['min_x']:.1f}, {bounds['max_x']:.1f}), y=({bounds['min_y']:.1f}, {bounds['max_y']:.1f})")
+        return bounds
+
+    def get_marker_sprite(self, border_color, size=None):
+        """
+        출발/도착 마커용 원형 마스코트 스프라이트 (없으면 None -> 원형 마커)
+
+        (색상, 크기)별로 처음 요청될 때 한 번만 만들어 재사용하므로
+        렌더링 경로에서는 이미지 디코딩이 일어나지 않습니다.
+        반환된 이미지는 여러 요청이 공유하므로 수정하면 안 됩니다.
+        """
+        size = size or self.MARKER_PIXELS
+        if self._check_mascot_source() is None:
+            return None
+
+        key = (border_color, size)
+        with self._marker_lock:
+            if key in self._marker_sprites:
+                return self._marker_sprites[key]
+
+        mascot = self.create_circular_mascot(border_color, size=50)
+        sprite = None
+        if mascot is not None:
+            sprite = Image.fromarray(mascot).resize((size, size), Image.Resampling.LANCZOS)
+
+        with self._marker_lock:
+            self._marker_sprites[key] = sprite
+        return sprite
+
+    def render_route_image(self, path, start_coords, end_coords, line_width=2, line_alpha=0.5):
         """
-        # 경로의 모든 좌표 수집
-        all_x = [p[0] for p in path] + [start_coords[0], end_coords[0]]
-        all_y = [p[1] for p in path] + [start_coords[1], end_coords[1]]
-
-        # 최소/최대 좌표 계산
-        min_x, max_x = min(all_x), max(all_x)
-        min_y, max_y = min(all_y), max(all_y)
-
-        # 범위 크기 계산
-        range_x = max_x - min_x
-        range_y = max_y - min_y
-
-        # 최소 범위 보장 (경로가 너무 짧을 경우)
-        min_range = 100  # 픽셀
-        if range_x < min_range:
-            center_x = (min_x + max_x) / 2
-            min_x = center_x - min_range / 2
-            max_x = center_x + min_range / 2
-            range_x = min_range
-
-        if range_y < min_range:
-            center_y = (min_y + max_y) / 2
-            min_y = center_y - min_range / 2
-            max_y = center_y + min_range / 2
-            range_y = min_range
-
-        # 여백 추가
-        margin_x = range_x * margin_percent
-        margin_y = range_y * margin_percent
-
-        # 확대 범위 설정
-        ax.set_xlim(min_x - margin_x, max_x + margin_x)
-        ax.set_ylim(max_y + margin_y, min_y - margin_y)  # Y축은 반전
-
-        logger.info(f"Zoom bounds calculated: x=({min_x-margin_x:.1f}, {max_x+margin_x:.1f}), y=({min_y-margin_y:.1f}, {max_y+margin_y:.1f})")
+        경로 이미지 생성
+
+        Args:
+            path: 경로 좌표 리스트
+            start_coords: 출발지 좌표 (x, y) - 확대 범위 계산용
+            end_coords: 도착지 좌표 (x, y) - 확대 범위 계산용
+            line_width: 경로 선 두께 (포인트)
+            line_alpha: 경로 선 투명도
+
+        Returns:
+            str: base64 인코딩된 PNG 이미지
+        """
+        bounds = self.calculate_path_bounds_and_zoom(path, start_coords, end_coords)
+
+        # 출발지/도착지 표시 (경로의 시작점과 끝점에 원형 액자 마스코트)
+        markers = [
+            (path[0], '#3399ff', self.get_marker_sprite('#3399ff')),
+            (path[-1], '#33ff99', self.get_marker_sprite('#33ff99'))
+        ]
+
+        return self.renderer.render_base64(path, bounds, line_width=line_width, line_alpha=line_alpha, markers=markers)
+
+    def build_route_vector(self, path, start_coords, end_coords, line_width=2, line_alpha=0.5):
+        """
+        벡터 경로 데이터 생성 (클라이언트가 지도 위에 직접 그리는 용도)
+
+        Args:
+            path: 경로 좌표 리스트
+            start_coords: 출발지 좌표 (x, y) - 확대 범위 계산용
+            end_coords: 도착지 좌표 (x, y) - 확대 범위 계산용
+            line_width: 경로 선 두께 (포인트)
+            line_alpha: 경로 선 투명도
+
+        Returns:
+            dict: {
+                'path': [x0, y0, x1, y1, ...] (지도 좌표계, 소수점 1자리),
+                'bounds': 확대 영역 {'min_x', 'max_x', 'min_y', 'max_y'},
+                'map_size': [가로, 세로] (지도 좌표계 크기),
+                'line_width': float,
+                'line_alpha': float
+            }
+        """
+        bounds = self.calculate_path_bounds_and_zoom(path, start_coords, end_coords)
+
+        flat_path = np.round(np.asarray(path, dtype=float), 1).ravel().tolist()
+
+        return {
+            'path': flat_path,
+            'bounds': {key: round(value, 1) for key, value in bounds.items()},
+            'map_size': list(self.MAP_COORD_SIZE),
+            'line_width': line_width,
+            'line_alpha': line_alpha
+        }
+
+    def build_route_output(self, output_format, path, start_coords, end_coords, line_width=2, line_alpha=0.5):
+        """
+        요청 형식에 맞는 경로 결과 생성
+
+        Args:
+            output_format: 'image' (base64 PNG) 또는 'vector' (좌표 배열)
+            path, start_coords, end_coords, line_width, line_alpha: render_route_image와 동일
+
+        Returns:
+            dict: 응답에 합칠 결과 ({'format', 'image'} 또는 {'format', 'route'})
+                지도 이미지가 없거나 읽을 수 없으면 {'success': False, 'message'}
+        """
+        if output_format == 'vector':
+            # 클라이언트가 지도 이미지를 이미 갖고 있으므로 서버 렌더링 생략
+            route = self.build_route_vector(path, start_coords, end_coords, line_width=line_width, line_alpha=line_alpha)
+            return {'format': 'vector', 'route': route}
+
+        if not self.map_image_path.exists():
+            return {
+                'success': False,
+                'message': f'지도 이미지 파일이 없습니다: {self.map_image_path}'
+            }
+
+        try:
+            image_base64 = self.render_route_image(path, start_coords, end_coords, line_width=line_width, line_alpha=line_alpha)
+        except OSError as e:
+            logger.error(f"Failed to load map image: {e}")
+            return {
+                'success': False,
+                'message': '지도 이미지를 읽을 수 없습니다.'
+            }
+
+        return {'format': 'image', 'image': image_base64}
 
     def get_facility_names(self):
         """시설물 이름 목록 반환"""
@@ -239,19 +392,22 @@ class WayfindingService:
             return [f["name"] for f in facilities]
         return []
 
-    def find_path(self, start_name, end_name):
+    def find_path(self, start_name, end_name, output_format='image'):
         """
         최단 경로를 찾고 이미지를 생성
 
         Args:
             start_name: 출발지 이름
             end_name: 도착지 이름
+            output_format: 'image' (base64 PNG) 또는 'vector' (좌표 배열 + 확대 영역)
 
         Returns:
             dict: {
                 'success': bool,
                 'message': str,
-                'image': str (base64 encoded image),
+                'format': str,
+                'image': str (base64 encoded image, 'image' 형식),
+                'route': dict (build_route_vector 결과, 'vector' 형식),
                 'distance': float
             }
         """
@@ -283,89 +439,20 @@ class WayfindingService:
             # 2. 가장 가까운 도로 노드 매칭 (Snapping)
             _, s_idx = tree.query(start_coords)
             _, e_idx = tree.query(end_coords)
-            start_node = node_list[s_idx]
-            end_node = node_list[e_idx]
 
-            # 3. 다익스트라(Dijkstra) 경로 탐색
+            # 3. 최단 경로 조회 (시설물 경로 인덱스 사용)
             try:
-                path = nx.shortest_path(G, source=start_node, target=end_node, weight='weight')
-                path_length = nx.shortest_path_length(G, source=start_node, target=end_node, weight='weight')
+                path, path_length = self.shortest_path(G, node_list, s_idx, e_idx)
             except nx.NetworkXNoPath:
                 return {
                     'success': False,
                     'message': '길이 끊겨 있어 갈 수 없습니다.'
                 }
 
-            # 4. 지도 이미지 로드 및 시각화
-            if not self.map_image_path.exists():
-                return {
-                    'success': False,
-                    'message': f'지도 이미지 파일이 없습니다: {self.map_image_path}'
-                }
-
-            try:
-                img = mpimg.imread(str(self.map_image_path))
-            except Exception as e:
-                logger.error(f"Failed to load map image: {e}")
-                return {
-                    'success': False,
-                    'message': '지도 이미지를 읽을 수 없습니다.'
-                }
-
-            # 이미지 크기 설정
-            fixed_w = 953
-            fixed_h = 676
-
-            fig, ax = plt.subplots(figsize=(10, 6))
-            ax.imshow(img, extent=[0, fixed_w, fixed_h, 0])
-
-            # 경로 그리기
-            path_x = [p[0] for p in path]
-            path_y = [p[1] for p in path]
-
-            ax.plot(path_x, path_y, color='red', linewidth=2, label='추천 경로', alpha=0.5)
-
-            # 출발지/도착지 표시 (경로의 시작점과 끝점에 원형 액자 마스코트)
-            path_start = path[0]  # 경로 시작점
-            path_end = path[-1]   # 경로 끝점
-
-            if self.mascot_image_path.exists():
-                # 출발지 원형 마스코트 (파란색 테두리)
-                start_mascot = self.create_circular_mascot('#3399ff', size=50)
-                if start_mascot is not None:
-                    imagebox_start = OffsetImage(start_mascot, zoom=0.5)
-                    ab_start = AnnotationBbox(imagebox_start, path_start, frameon=False,
-                                              box_alignment=(0.5, 0.5))
-                    ax.add_artist(ab_start)
-                else:
-                    ax.scatter(*path_start, color='#3399ff', s=250, zorder=5, edgecolors='white', linewidth=3, alpha=0.9)
-
-                # 도착지 원형 마스코트 (초록색 테두리)
-                end_mascot = self.create_circular_mascot('#33ff99', size=50)
-                if end_mascot is not None:
-                    imagebox_end = OffsetImage(end_mascot, zoom=0.5)
-                    ab_end = AnnotationBbox(imagebox_end, path_end, frameon=False,
-                                           box_alignment=(0.5, 0.5))
-                    ax.add_artist(ab_end)
-                else:
-                    ax.scatter(*path_end, color='#33ff99', s=250, zorder=5, edgecolors='white', linewidth=3, alpha=0.9)
-            else:
-                # 마스코트 파일이 없으면 원으로 표시
-                ax.scatter(*path_start, color='#3399ff', s=250, zorder=5, edgecolors='white', linewidth=3, alpha=0.9)
-                ax.scatter(*path_end, color='#33ff99', s=250, zorder=5, edgecolors='white', linewidth=3, alpha=0.9)
-
-            # 경로 범위로 자동 확대
-            self.calculate_path_bounds_and_zoom(ax, path, start_coords, end_coords)
-
-            # 꾸미기
-            ax.axis('off')
-
-            # 이미지를 base64로 인코딩
-            buf = io.BytesIO()
-            plt.savefig(buf, format='png', bbox_inches='tight', dpi=150)
-            buf.seek(0)
-            image_base64 = base64.b64encode(buf.read()).decode('utf-8')
-            plt.close(fig)
+            # 4. 지도 이미지 렌더링 또는 벡터 경로 생성
+            route_output = self.build_route_output(output_format, path, start_coords, end_coords, line_width=2, line_alpha=0.5)
+            if route_output.get('success') is False:
+                return route_output
 
             # 거리를 km로 환산
             distance_km = path_length * self.PIXEL_TO_KM
@@ -375,7 +462,7 @@ class WayfindingService:
             return {
                 'success': True,
                 'message': '최단 경로를 찾았습니다!',
-                'image': image_base64,
+                **route_output,
                 'distance': float(distance_km),
                 'distance_pixels': float(path_length)
             }
@@ -417,13 +504,14 @@ class WayfindingService:
 
         return nearest
 
-    def find_path_from_coords(self, start_x, start_y, end_x, end_y):
+    def find_path_from_coords(self, start_x, start_y, end_x, end_y, output_format='image'):
         """
         좌표를 이용한 경로 찾기 (지도 클릭 기반)
 
         Args:
             start_x, start_y: 출발지 좌표
             end_x, end_y: 도착지 좌표
+            output_format: 'image' (base64 PNG) 또는 'vector' (좌표 배열 + 확대 영역)
 
         Returns:
             dict: 경로 찾기 결과
@@ -446,89 +534,20 @@ class WayfindingService:
 
             _, s_idx = tree.query(start_coords)
             _, e_idx = tree.query(end_coords)
-            start_node = node_list[s_idx]
-            end_node = node_list[e_idx]
 
-            # 2. 다익스트라 경로 탐색
+            # 2. 최단 경로 조회 (한쪽이 시설물 노드면 인덱스, 아니면 다익스트라 1회)
             try:
-                path = nx.shortest_path(G, source=start_node, target=end_node, weight='weight')
-                path_length = nx.shortest_path_length(G, source=start_node, target=end_node, weight='weight')
+                path, path_length = self.shortest_path(G, node_list, s_idx, e_idx)
             except nx.NetworkXNoPath:
                 return {
                     'success': False,
                     'message': '길이 끊겨 있어 갈 수 없습니다.'
                 }
 
-            # 3. 지도 이미지 로드 및 시각화
-            if not self.map_image_path.exists():
-                return {
-                    'success': False,
-                    'message': f'지도 이미지 파일이 없습니다: {self.map_image_path}'
-                }
-
-            try:
-                img = mpimg.imread(str(self.map_image_path))
-            except Exception as e:
-                logger.error(f"Failed to load map image: {e}")
-                return {
-                    'success': False,
-                    'message': '지도 이미지를 읽을 수 없습니다.'
-                }
-
-            # 이미지 크기 설정
-            fixed_w = 953
-            fixed_h = 676
-
-            fig, ax = plt.subplots(figsize=(10, 6))
-            ax.imshow(img, extent=[0, fixed_w, fixed_h, 0])
-
-            # 경로 그리기
-            path_x = [p[0] for p in path]
-            path_y = [p[1] for p in path]
-
-            ax.plot(path_x, path_y, color='red', linewidth=3, label='추천 경로', alpha=0.7)
-
-            # 출발지/도착지 표시 (경로의 시작점과 끝점에 원형 액자 마스코트)
-            path_start = path[0]  # 경로 시작점
-            path_end = path[-1]   # 경로 끝점
-
-            if self.mascot_image_path.exists():
-                # 출발지 원형 마스코트 (파란색 테두리)
-                start_mascot = self.create_circular_mascot('#3399ff', size=50)
-                if start_mascot is not None:
-                    imagebox_start = OffsetImage(start_mascot, zoom=0.5)
-                    ab_start = AnnotationBbox(imagebox_start, path_start, frameon=False,
-                                              box_alignment=(0.5, 0.5))
-                    ax.add_artist(ab_start)
-                else:
-                    ax.scatter(*path_start, color='#3399ff', s=250, zorder=5, edgecolors='white', linewidth=3, alpha=0.9)
-
-                # 도착지 원형 마스코트 (초록색 테두리)
-                end_mascot = self.create_circular_mascot('#33ff99', size=50)
-                if end_mascot is not None:
-                    imagebox_end = OffsetImage(end_mascot, zoom=0.5)
-                    ab_end = AnnotationBbox(imagebox_end, path_end, frameon=False,
-                                           box_alignment=(0.5, 0.5))
-                    ax.add_artist(ab_end)
-                else:
-                    ax.scatter(*path_end, color='#33ff99', s=250, zorder=5, edgecolors='white', linewidth=3, alpha=0.9)
-            else:
-                # 마스코트 파일이 없으면 원으로 표시
-                ax.scatter(*path_start, color='#3399ff', s=250, zorder=5, edgecolors='white', linewidth=3, alpha=0.9)
-                ax.scatter(*path_end, color='#33ff99', s=250, zorder=5, edgecolors='white', linewidth=3, alpha=0.9)
-
-            # 경로 범위로 자동 확대
-            self.calculate_path_bounds_and_zoom(ax, path, (start_x, start_y), (end_x, end_y))
-
-            # 꾸미기
-            ax.axis('off')
-
-            # 이미지를 base64로 인코딩
-            buf = io.BytesIO()
-            plt.savefig(buf, format='png', bbox_inches='tight', dpi=150)
-            buf.seek(0)
-            image_base64 = base64.b64encode(buf.read()).decode('utf-8')
-            plt.close(fig)
+            # 3. 지도 이미지 렌더링 또는 벡터 경로 생성
+            route_output = self.build_route_output(output_format, path, start_coords, end_coords, line_width=3, line_alpha=0.7)
+            if route_output.get('success') is False:
+                return route_output
 
             # 거리를 km로 환산
             distance_km = path_length * self.PIXEL_TO_KM
@@ -538,7 +557,7 @@ class WayfindingService:
             return {
                 'success': True,
                 'message': '최단 경로를 찾았습니다!',
-                'image': image_base64,
+                **route_output,
                 'distance': float(distance_km),
                 'distance_pixels': float(path_length),
                 'start_coords': {'x': start_x, 'y': start_y},
@@ -552,7 +571,7 @@ class WayfindingService:
                 'message': f'경로 찾기 중 오류가 발생했습니다: {str(e)}'
             }
 
-    def find_nearest_facility_by_category(self, x, y, category='toilet', name_pattern=None):
+    def find_nearest_facility_by_category(self, x, y, category='toilet', name_pattern=None, output_format='image'):
         """
         특정 카테고리 또는 이름 패턴의 가장 가까운 시설물 찾기 및 경로 표시
 
@@ -560,6 +579,7 @@ class WayfindingService:
             x, y: 현재 위치 좌표
             category: 시설물 카테고리 (예: 'toilet')
             name_pattern: 시설물 이름 검색 패턴 (예: '매점', '음수대')
+            output_format: 'image' (base64 PNG) 또는 'vector' (좌표 배열 + 확대 영역)
 
         Returns:
             dict: 경로 찾기 결과
@@ -612,7 +632,8 @@ class WayfindingService:
             # 3. 경로 찾기 (좌표 기반)
             return self.find_path_from_coords(
                 x, y,
-                nearest_facility['x'], nearest_facility['y']
+                nearest_facility['x'], nearest_facility['y'],
+                output_format=output_format
             )
 
         except Exception as e:
@@ -12,52 +12,73 @@ if not GOOGLE_API_KEY:
 # 자동 갱신 저장소 이름
 AUTO_UPDATE_STORE_NAME = 'fileSearchStores/ne82eesbv4ye-cuqu49q14izt'
 
+# FileSearchStore 업로드 엔진 설정 (api/web/calendar 업데이터 공용)
+UPLOAD_ENGINE = {
+    "rate_per_sec": 2.0,        # 초당 평균 요청 수 (토큰 버킷)
+    "burst": 5,                 # 순간 최대 요청 수
+    "initial_concurrency": 5,   # 시작 동시 요청 수 (쓰로틀링 시 절반, 연속 성공 시 +1)
+    "max_concurrency": 10,
+    "max_retries": 5,           # 429/5xx/네트워크 오류 재시도 횟수
+    "timeout": 600,             # 업로드 후 인덱싱 완료까지 기다리는 최대 시간 (초)
+}
+
 # API 데이터 소스 설정
+# page_size: numOfRows/pageNo로 나눠 받을 페이지 크기 (생략하면 한 번에 요청)
+# id_key: 레코드 식별 필드 (평탄화 키의 마지막 이름, 없으면 api_updater.ID_KEYS → 링크 → 제목+날짜), 파트 배정 고정에 사용
 APIS = [
     {
         "name": "book",
         "url": "https://api.kcisa.kr/openapi/service/rest/meta2018/getKSCD0820181",
-        "key_env": "BOOK_KEY"
+        "key_env": "BOOK_KEY",
+        "page_size": 100
     },
     {
         "name": "rose",
         "url": "https://api.kcisa.kr/openapi/service/rest/meta/KSCrose",
-        "key_env": "ROSE_KEY"
+        "key_env": "ROSE_KEY",
+        "page_size": 100
     },
     {
         "name": "photogallery",
         "url": "https://api.kcisa.kr/openapi/service/rest/meta/KSCphot",
-        "key_env": "PHOTO_KEY"
+        "key_env": "PHOTO_KEY",
+        "page_size": 500
     },
     {
         "name": "perform",
         "url": "https://api.kcisa.kr/openapi/service/rest/meta/KSCperf",
-        "key_env": "PERFORM_KEY"
+        "key_env": "PERFORM_KEY",
+        "page_size": 100
     },
     {
         "name": "olparknews",
         "url": "https://api.kcisa.kr/openapi/service/rest/meta/KSCopno",
-        "key_env": "OLPARKNEWS_KEY"
+        "key_env": "OLPARKNEWS_KEY",
+        "page_size": 100
     },
     {
         "name": "video",
         "url": "https://api.kcisa.kr/openapi/service/rest/meta/KSChong",
-        "key_env": "VIDEO_KEY"
+        "key_env": "VIDEO_KEY",
+        "page_size": 500
     },
     {
         "name": "notice",
         "url": "https://api.kcisa.kr/openapi/service/rest/meta/KSCnoti",
-        "key_env": "NOTICE_KEY"
+        "key_env": "NOTICE_KEY",
+        "page_size": 100
     },
     {
         "name": "press",
         "url": "https://api.kcisa.kr/openapi/service/rest/meta/KSCkrep",
-        "key_env": "PRESS_KEY"
+        "key_env": "PRESS_KEY",
+        "page_size": 100
     },
     {
         "name": "course",
         "url": "https://api.kcisa.kr/openapi/service/rest/meta15/getKSCD0920",
-        "key_env": "COURSE_KEY"
+        "key_env": "COURSE_KEY",
+        "page_size": 100
     }
 ]
 
@@ -65,6 +86,7 @@ APIS = [
 CSV_FOLDER_PATH = None  # CSV 업데이트를 사용하지 않으려면 None으로 설정
 
 # 캘린더 설정
+# month_url을 지정하면 ({year}, {month} 치환) 브라우저 없이 HTTP로 월별 페이지를 받아 같은 selector로 추출
 CALENDARS = [
     {
         "site_name": "Concert",
@@ -337,6 +359,51 @@ WEB_URLS = [
     }
 ]
 
+# API 파이프라인 단계별 작업자 수 (api_updater)
+API_PIPELINE = {
+    "fetch_workers": 4,    # 동시에 호출하는 API 수
+    "process_workers": 1,  # 파싱/청킹 (CPU 작업)
+    "sync_workers": 1,     # 스토어 동기화 (업로드 자체의 동시성은 UPLOAD_ENGINE)
+    "per_host": 4,         # API 서버당 동시 요청 수 (소스 동시 수집 + 페이지 병렬 요청 합계)
+}
+
+# API 레코드 직렬화 프로필 (api_updater.format_record)
+# APIS 항목에 "profile"로 프로필 이름이나 dict를 지정 (dict는 "base" 프로필 위에 덮어씀, 없으면 API_RECORD_PROFILE)
+#   예) "profile": {"fields": ["creator", "subjectKeyword", "spatialCoverage"]}
+# 키 비교는 평탄화 키의 마지막 이름 기준 (대소문자 무시)
+RECORD_PROFILES = {
+    # 이전 형식: 평탄화한 모든 키를 전체 경로 그대로 Details에 나열
+    "full": {
+        "fields": None,
+        "exclude": [],
+        "short_keys": False,
+        "skip_empty": False,
+        "dedupe": False,
+    },
+    "compact": {
+        "fields": None,      # Details에 남길 키 목록 (None이면 전부)
+        "exclude": ["rnum", "rownum", "resultCode", "resultMsg", "numOfRows", "pageNo", "totalCount"],
+        "short_keys": True,  # 인덱스/응답 래퍼를 뺀, 서로 구분되는 가장 짧은 키 (목록 값은 한 줄로 합침)
+        "skip_empty": True,  # 설명이 없을 때 "(내용 없음)" 줄 생략
+        "dedupe": True,      # 같은 키(목록) 안에서 반복되는 값은 한 번만 씀 (헤더 값은 항상 생략)
+    },
+}
+API_RECORD_PROFILE = "compact"
+
+# 웹 크롤러 설정 (web_updater)
+WEB_CRAWLER = {
+    "per_host": 4,      # 호스트당 동시 요청 수
+    "delay": 0.2,       # 같은 호스트 요청 시작 간격 (초)
+    "timeout": 10,      # 요청 타임아웃 (초)
+    "max_workers": 10,  # 목록/본문 처리 스레드 수
+}
+
+# 캘린더 크롤러 설정 (calendar_updater)
+CALENDAR_CRAWLER = {
+    "browsers": 1,       # 브라우저 풀 크기 (= 동시에 수집하는 사이트 수)
+    "wait_timeout": 10,  # 월 표시/행 로딩 조건 대기 최대 시간 (초)
+}
+
 # 스케줄러 설정
 SCHEDULER_DAY = "monday"  # 매주 월요일
 SCHEDULER_TIME = "03:00"  # 새벽 3시
@@ -1,16 +1,28 @@
 import re
+import html
+import json
 import time
 import requests
 import xmltodict
 import os
-import tempfile
 from bs4 import BeautifulSoup
 from google import genai
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache, partial
+from concurrent.futures import ThreadPoolExecutor
 
 # API 키는 config_data에서 가져옴
 import config_data
+from app.db import bump_store_version
+from data_updater.upload_engine import UploadEngine
+from data_updater.http_cache import HttpCache
+from data_updater.pipeline import StagedPipeline
+from data_updater.web_crawler import HostLimiter
+from data_updater.xml_stream import XmlItemStream
+from data_updater.sync_manifest import (
+    plan_store_sync, record_uploads, remove_entries,
+    content_hash, load_record_index, save_record_index,
+)
 
 client = genai.Client(api_key=config_data.GOOGLE_API_KEY)
 
@@ -32,7 +44,31 @@ def looks_like_html(s: str) -> bool:
     return any(tag in s_lower for tag in ["<p", "<br", "<div", "<span", "<table", "&lt;", "&gt;", "&amp;"])
 
 
+# 속성까지 포함한 단순 태그 (<p>, <br/>, <span class="x"> 등)
+_SIMPLE_TAG = re.compile(
+    r"</?[a-zA-Z][a-zA-Z0-9]*"
+    r"""(?:\s+[^\s"'<>/=]+(?:\s*=\s*(?:"[^"]*"|'[^']*'|[^\s"'<>=`]+))?)*\s*/?>"""
+)
+_COMPLEX_HTML = re.compile(r"<!|<\?|<(?:script|style|textarea|title|xmp|plaintext)\b", re.I)
+# 흔한 엔티티 외의 '&'가 있으면 BeautifulSoup으로 (알 수 없는 엔티티 처리 방식이 다름)
+_OTHER_AMP = re.compile(r"&(?!(?:amp|lt|gt|quot|apos|nbsp|#\d+|#[xX][0-9a-fA-F]+);)")
+
+
 def html_to_text(raw: str) -> str:
+    """
+    단순 태그만 있으면 정규식으로 태그 제거 후 엔티티 해제 (BeautifulSoup 결과와 같음)
+    주석/스크립트/짝이 안 맞는 '<' 등이 있으면 BeautifulSoup으로 처리
+    """
+    if not raw:
+        return ""
+    if not _COMPLEX_HTML.search(raw) and not _OTHER_AMP.search(raw):
+        stripped = _SIMPLE_TAG.sub(" ", raw)
+        if "<" not in stripped:
+            return clean_text(html.unescape(stripped))
+    return html_to_text_soup(raw)
+
+
+def html_to_text_soup(raw: str) -> str:
     if not raw:
         return ""
     soup = BeautifulSoup(raw, "html.parser")
@@ -44,46 +80,230 @@ def html_to_text(raw: str) -> str:
 # =========================================
 # 2. API 호출 (재시도 로직 포함)
 # =========================================
-def fetch_api(url: str, key: str | None, retries=3):
+# 지난 동기화 이후 응답이 바뀌지 않았을 때 fetch_api가 반환하는 값
+NOT_MODIFIED = object()
+
+# API 응답 조건부 요청 캐시 (URL 기준, 서비스 키는 키에 포함하지 않음)
+http_cache = HttpCache()
+
+
+# 요청은 keep-alive 세션 하나로, 호스트별 동시 요청 수는 공용 제한기로 묶음 (소스 동시 수집 + 페이지 병렬)
+session = requests.Session()
+api_limiter = HostLimiter(config_data.API_PIPELINE["per_host"], delay=0)
+
+
+def _key_params(url: str, key: str | None) -> dict:
     params = {}
     if key and "serviceKey=" not in url:
         params["serviceKey"] = key
+    return params
 
-    for attempt in range(retries):
-        try:
-            res = requests.get(url, params=params, timeout=20)
 
-            if res.status_code >= 500 or res.status_code == 429:
-                print(f"     [⚠️] 서버 지연({res.status_code})... 재시도 {attempt+1}/{retries}")
-                time.sleep(2)
-                continue
+def _read_stream(res, cache_key: str, handler) -> dict:
+    """XML 응답을 받는 대로 item 단위로 파싱 (handler로 바로 레코드 생성), 본문은 캐시용으로 모아 둠"""
+    stream = XmlItemStream(handler, content_type=res.headers.get("Content-Type", ""))
+    raw: list[bytes] = []
+    text: list[str] = []
+    for chunk in res.iter_content(chunk_size=64 * 1024):
+        raw.append(chunk)
+        text.append(stream.feed_bytes(chunk))
+    text.append(stream.flush_bytes())
 
-            if 400 <= res.status_code < 500:
-                print(f"     [❌] 요청 오류: {res.status_code} (키/URL 확인)")
-                return None
+    cached = http_cache.resolve(cache_key, res, text="".join(text), content=b"".join(raw))
+    if stream.close():
+        cached["records"], cached["meta"] = stream.records, stream.meta
+    return cached
 
-            res.raise_for_status()
 
-            ct = res.headers.get("Content-Type", "").lower()
-            if "json" in ct:
-                return res.json()
-            if "xml" in ct or res.text.strip().startswith("<"):
-                try:
-                    return xmltodict.parse(res.text)
-                except:
-                    pass
-
-            soup = BeautifulSoup(res.text, "html.parser")
-            return soup.get_text(separator="\n", strip=True)
+def _request(url: str, params: dict, cache_key: str, retries=3, handler=None) -> dict | None:
+    """
+    handler: 지정하면 XML 응답은 스트리밍 파싱 (item dict → handler 결과가 "records"에 쌓임)
+    Returns: {"text", "content_type", "changed"[, "records", "meta"]} (http_cache.resolve 결과) / 실패 시 None
+    """
+    for attempt in range(retries):
+        # 재시도 대기는 호스트 슬롯을 반납한 뒤에 (대기 중에도 다른 페이지/소스 요청이 진행되도록)
+        try:
+            with api_limiter.slot(url):
+                res = session.get(url, params=params, headers=http_cache.conditional_headers(cache_key),
+                                  timeout=20, stream=handler is not None)
+
+                if res.status_code >= 500 or res.status_code == 429:
+                    print(f"     [⚠️] 서버 지연({res.status_code})... 재시도 {attempt+1}/{retries}")
+                    res.close()
+                else:
+                    if 400 <= res.status_code < 500:
+                        print(f"     [❌] 요청 오류: {res.status_code} (키/URL 확인)")
+                        res.close()
+                        return None
+
+                    if res.status_code != 304:
+                        res.raise_for_status()
+                        if handler and "xml" in res.headers.get("Content-Type", "").lower():
+                            return _read_stream(res, cache_key, handler)
+
+                    # 304 또는 본문 해시 일치 → changed=False (검증자는 캐시가 있을 때만 보내므로 304면 항상 캐시 있음)
+                    return http_cache.resolve(cache_key, res)
 
         except requests.exceptions.RequestException as e:
             print(f"     [⚠️] 연결 실패: {e}... 재시도 {attempt+1}/{retries}")
+
+        if attempt + 1 < retries:
             time.sleep(2)
 
     print(f"     [❌] {retries}회 실패.")
     return None
 
 
+def parse_payload(text: str, content_type: str):
+    ct = content_type.lower()
+    if "json" in ct:
+        return json.loads(text)
+    if "xml" in ct or text.strip().startswith("<"):
+        try:
+            return xmltodict.parse(text)
+        except:
+            pass
+
+    soup = BeautifulSoup(text, "html.parser")
+    return soup.get_text(separator="\n", strip=True)
+
+
+def read_records(cached: dict, paged: bool = False, profile: dict | None = None) -> tuple[list, dict]:
+    """
+    _request 결과 → (레코드 목록, meta)
+    스트리밍으로 이미 만든 레코드가 있으면 그대로, 아니면 (캐시 본문/JSON 등) 여기서 파싱
+    """
+    if cached.get("records") is not None:
+        return cached["records"], cached["meta"]
+
+    text, ct = cached["text"], cached["content_type"]
+    if "xml" in ct.lower() or text.lstrip().startswith("<"):
+        stream = XmlItemStream(partial(normalize_record, profile=profile))
+        stream.feed(text)
+        if stream.close():
+            return stream.records, stream.meta
+
+    data = parse_payload(text, ct)
+    if paged:
+        items = page_items(data)
+    else:
+        items = extract_items(data) or [data]
+        if isinstance(items, dict): items = [items]
+    meta = {"totalCount": find_key(data, "totalCount")}
+    return [normalize_record(rec, profile) for rec in items], meta
+
+
+def fetch_api(url: str, key: str | None, profile: dict | None = None, retries=3):
+    """
+    profile: 레코드 직렬화 프로필 (resolve_profile 결과)
+    Returns: 레코드 목록 (normalize_record 결과) / 지난 동기화 이후 변경 없으면 NOT_MODIFIED (파싱 생략) / 실패 시 None
+    """
+    cached = _request(url, _key_params(url, key), url, retries, handler=partial(normalize_record, profile=profile))
+    if cached is None:
+        return None
+    if not cached["changed"]:
+        return NOT_MODIFIED
+    records, _ = read_records(cached, profile=profile)
+    return records
+
+
+# ---------- 페이지 단위 수집 (numOfRows / pageNo) ----------
+PAGE_PARAM = "pageNo"
+ROWS_PARAM = "numOfRows"
+MAX_PAGES = 1000  # totalCount가 없을 때 안전 상한
+
+
+def find_key(data, key: str):
+    """중첩 dict/list에서 key의 첫 값 (없으면 None)"""
+    if isinstance(data, dict):
+        if key in data:
+            return data[key]
+        values = data.values()
+    elif isinstance(data, list):
+        values = data
+    else:
+        return None
+    for v in values:
+        found = find_key(v, key)
+        if found is not None:
+            return found
+    return None
+
+
+def page_items(data) -> list:
+    """응답 한 페이지의 아이템 목록 (items.item이 1건이면 dict로 오므로 리스트로 맞춤)"""
+    items = find_key(data, "items")
+    if items is None:
+        return extract_items(data) or []
+    if isinstance(items, dict):
+        items = items.get("item", [])
+    if isinstance(items, dict):
+        return [items]
+    return items if isinstance(items, list) else []
+
+
+def fetch_api_paged(url: str, key: str | None, page_size: int, profile: dict | None = None,
+                    retries=3) -> tuple[object, list[str]]:
+    """
+    numOfRows/pageNo로 페이지를 나눠 수집
+    - 1페이지의 totalCount로 마지막 페이지를 정하고 나머지 페이지는 병렬 요청 (호스트 제한 안에서)
+    - totalCount가 없으면 page_size보다 적게 오는 페이지까지 순서대로
+    - 페이지마다 받는 대로 레코드를 만들고 응답 본문은 버림 (큰 응답 전체를 한 번에 파싱하지 않음)
+    - 한 페이지라도 실패하면 전체 실패 (일부만 반영하면 빠진 레코드가 삭제로 처리되므로)
+
+    Returns: (레코드 목록 / 모든 페이지가 변경 없으면 NOT_MODIFIED / 실패 시 None, 캐시 키 목록)
+    """
+    base_params = _key_params(url, key)
+    handler = partial(normalize_record, profile=profile)
+    cache_keys: list[str] = []
+
+    def load_page(page_no: int):
+        cache_key = f"{url}#{PAGE_PARAM}={page_no}&{ROWS_PARAM}={page_size}"
+        cache_keys.append(cache_key)
+        cached = _request(url, {**base_params, PAGE_PARAM: page_no, ROWS_PARAM: page_size}, cache_key, retries,
+                          handler=handler)
+        if cached is None:
+            return None
+        records, meta = read_records(cached, paged=True, profile=profile)
+        return records, meta.get("totalCount"), cached["changed"]
+
+    first = load_page(1)
+    if first is None:
+        return None, cache_keys
+    records, total, changed = first
+
+    try:
+        total = int(total)
+    except (TypeError, ValueError):
+        total = None
+
+    pages = 1
+    if total is not None:
+        last_page = min(MAX_PAGES, max(1, -(-total // page_size)))
+        with ThreadPoolExecutor(max_workers=api_limiter.per_host) as pool:
+            for result in pool.map(load_page, range(2, last_page + 1)):
+                if result is None:
+                    return None, cache_keys
+                records.extend(result[0])
+                changed = changed or result[2]
+                pages += 1
+    else:
+        page_len = len(records)
+        while page_len >= page_size and pages < MAX_PAGES:
+            result = load_page(pages + 1)
+            if result is None:
+                return None, cache_keys
+            page_len = len(result[0])
+            records.extend(result[0])
+            changed = changed or result[2]
+            pages += 1
+
+    print(f"     → {pages}페이지 · {len(records)}건" + (f" / totalCount {total}" if total is not None else ""))
+    if not changed:
+        return NOT_MODIFIED, cache_keys
+    return records, cache_keys
+
+
 # =========================================
 # 3. 데이터 추출 관련 함수들
 # =========================================
@@ -164,213 +384,443 @@ def parse_date_str(s: str):
     return datetime.min
 
 
-def sort_items_by_date(items):
-    def key_fn(rec):
-        flat = flatten_dict(rec)
-        d = pick_date(flat)
-        return parse_date_str(d or "")
-    return sorted(items, key=key_fn, reverse=True)
+def sort_records_by_date(records: list[dict]) -> list[dict]:
+    return sorted(records, key=lambda record: record["sort_date"], reverse=True)
 
 
-def format_record(rec) -> str:
-    flat = flatten_dict(rec)
-    title = pick_title(flat)
-    date = pick_date(flat)
-    link = pick_link(flat)
-    desc = pick_description(flat)
+# ---------- 레코드 직렬화 프로필 (config_data.RECORD_PROFILES) ----------
+# 응답 래퍼 (extract_items가 item 목록을 못 찾아 응답 전체가 레코드가 된 경우 키 앞에 붙음)
+WRAPPER_KEYS = ("response", "body", "items", "item")
+
+
+def resolve_profile(spec=None) -> dict:
+    """
+    spec: 프로필 이름 / dict ("base" 프로필 위에 덮어씀) / None (config_data.API_RECORD_PROFILE)
+    Returns: format_record에 넘길 프로필 (키 목록은 소문자 집합으로 바꿔 둠)
+    """
+    profiles = config_data.RECORD_PROFILES
+    if spec is None:
+        spec = config_data.API_RECORD_PROFILE
+    if isinstance(spec, str):
+        name, overrides = spec, {}
+    else:
+        name, overrides = spec.get("base", config_data.API_RECORD_PROFILE), spec
+    if name not in profiles:
+        raise ValueError(f"알 수 없는 직렬화 프로필: {name}")
+
+    profile = {**profiles[name], **overrides}
+    profile["name"] = name if not overrides else f"{name}+custom"
+    fields = profile.get("fields")
+    profile["fields"] = {f.lower() for f in fields} if fields is not None else None
+    profile["exclude"] = {f.lower() for f in profile.get("exclude") or []}
+    return profile
+
+
+@lru_cache(maxsize=512)
+def short_keys(keys: tuple[str, ...]) -> tuple[str, ...]:
+    """
+    평탄화 키 → 짧은 키 (숫자 인덱스/#text와 앞쪽 응답 래퍼 조각을 빼고, 다른 키와 구분되는 가장 짧은 뒷부분)
+    예) response_body_items_item_0_title → title, creator_0_name / publisher_name → creator_name / publisher_name
+    같은 레코드 구조가 반복되므로 키 목록 단위로 캐시
+    """
+    paths = []
+    for k in keys:
+        parts = [p for p in k.split("_") if p and not p.isdigit() and p != "#text"] or [k]
+        while len(parts) > 1 and parts[0] in WRAPPER_KEYS:
+            parts.pop(0)
+        paths.append(tuple(parts))
+
+    distinct = set(paths)
+    result = []
+    for parts in paths:
+        for n in range(1, len(parts) + 1):
+            tail = parts[-n:]
+            if sum(1 for other in distinct if other[-n:] == tail) == 1:
+                break
+        result.append("_".join(tail))
+    return tuple(result)
+
+
+def detail_lines(record: dict, profile: dict) -> list[str]:
+    """Details 항목 (헤더와 같은 값/빈 값 제외, 프로필의 필드 선택·키 축약·목록 내 중복 제거 적용)"""
+    flat = record["flat"]
+    header = {record["title"], record["date"], record["description"], record["link"]}
+    keys = short_keys(tuple(flat)) if profile["short_keys"] else tuple(flat)
+    fields, exclude = profile["fields"], profile["exclude"]
+
+    grouped: dict[str, list[str]] = {}
+    for key, v in zip(keys, flat.values()):
+        if v in header or not v: continue
+        name = key.split("_")[-1].lower()
+        if name in exclude or (fields is not None and name not in fields): continue
+        values = grouped.setdefault(key, [])
+        # 중복 제거는 같은 키(목록) 안에서만 - 다른 키의 같은 값(creator/contributor 등)은 의미가 달라 유지
+        if profile["dedupe"] and v in values: continue
+        values.append(v)
+
+    if profile["short_keys"]:
+        return [f"- {k}: {', '.join(vs)}" for k, vs in grouped.items()]
+    return [f"- {k}: {v}" for k, vs in grouped.items() for v in vs]
+
+
+def format_record(record: dict, profile: dict | None = None) -> str:
+    """profile: resolve_profile 결과 (None이면 이전 형식 "full")"""
+    if profile is None:
+        profile = FULL_PROFILE
+    title, date, desc, link = record["title"], record["date"], record["description"], record["link"]
 
     lines = ["### Record"]
     if title: lines.append(f"**Title:** {title}")
     if date: lines.append(f"**Date:** {date}")
     if desc: lines.append(f"**Description:** {desc}")
-    else: lines.append(f"**Description:** (내용 없음)")
+    elif not profile["skip_empty"]: lines.append(f"**Description:** (내용 없음)")
     if link: lines.append(f"**Link:** {link}")
 
-    lines.append("\n**Details:**")
-    for k, v in flat.items():
-        if v in [title, date, desc, link] or not v: continue
-        lines.append(f"- {k}: {v}")
+    details = detail_lines(record, profile)
+    if details or not profile["skip_empty"]:
+        lines.append("\n**Details:**")
+        lines.extend(details)
     return "\n".join(lines) + "\n\n---\n\n"
 
 
-# =========================================
-# 4. 메모리에서 청킹 (파일 저장 없음)
-# =========================================
-def create_chunks_in_memory(items, basename: str, batch_size: int = 100) -> list[tuple[str, str]]:
-    """
-    Returns: [(filename, content), ...]
-    """
-    chunks = []
-    total_items = len(items)
-    if total_items == 0:
-        return []
+FULL_PROFILE = resolve_profile("full")
 
-    for i in range(0, total_items, batch_size):
-        chunk_items = items[i : i + batch_size]
-        chunk_text = "".join(format_record(it) for it in chunk_items)
-        part_num = (i // batch_size) + 1
 
-        filename = f"{basename}_part{part_num}.md"
-        chunks.append((filename, chunk_text))
+def normalize_record(rec, profile: dict | None = None) -> dict:
+    """
+    레코드를 한 번만 평탄화(HTML 정제 포함)하고 정렬/포맷/식별에 필요한 값을 미리 골라 둠
+    스트리밍 수집 중 item이 도착하는 대로 호출됨 (원본 item은 보관하지 않음)
+    profile: resolve_profile 결과 (None이면 "full")
 
-    return chunks
+    Returns: {"flat", "title", "date", "sort_date", "link", "description", "text",
+              "size", "full_size"} (size/full_size: 프로필 적용 후/이전 형식의 UTF-8 바이트 수)
+    """
+    flat = flatten_dict(rec)
+    date = pick_date(flat)
+    record = {
+        "flat": flat,
+        "title": pick_title(flat),
+        "date": date,
+        "sort_date": parse_date_str(date or ""),
+        "link": pick_link(flat),
+        "description": pick_description(flat),
+    }
+    record["text"] = format_record(record, profile)
+    record["size"] = len(record["text"].encode("utf-8"))
+    if profile is None or profile["name"] == "full":
+        record["full_size"] = record["size"]
+    else:
+        record["full_size"] = len(format_record(record).encode("utf-8"))
+    return record
 
 
 # =========================================
-# 5. 임시 파일 업로드 (메모리 -> 임시 파일 -> 업로드 -> 삭제)
+# 4. 메모리에서 청킹 (파일 저장 없음)
 # =========================================
-def upload_single_chunk(filename: str, content: str, store_name: str, max_wait: int = 120) -> tuple[str, bool, str]:
-    """
-    메모리에서 임시 파일로 저장 후 업로드, 업로드 후 임시 파일 삭제
-    """
-    temp_file = None
-    try:
-        # 임시 파일 생성
-        with tempfile.NamedTemporaryFile(mode='w', encoding='utf-8', suffix='.md', delete=False) as f:
-            f.write(content)
-            temp_file = f.name
-
-        # 업로드
-        op = client.file_search_stores.upload_to_file_search_store(
-            file=temp_file,
-            file_search_store_name=store_name,
-            config={
-                "display_name": filename,
-                "mime_type": "text/markdown"
-            }
-        )
-
-        wait_sec = 0
-        while not op.done:
-            time.sleep(1)
-            op = client.operations.get(op)
-            wait_sec += 1
-            if wait_sec > max_wait:
-                return (filename, False, f"타임아웃 ({max_wait}초)")
-
-        return (filename, True, "")
+# 소스에 id_key가 없을 때 레코드 식별자로 쓸 필드 (평탄화 키의 마지막 이름과 정확히 일치, 앞쪽이 우선)
+# 분류 코드/순번처럼 여러 레코드가 같은 값을 갖는 필드는 넣지 않음
+ID_KEYS = ("id", "uid", "uuid", "localid", "contentid", "itemid", "docid", "articleid", "seq", "sn")
 
-    except Exception as e:
-        return (filename, False, str(e))
 
-    finally:
-        # 임시 파일 삭제
-        if temp_file and os.path.exists(temp_file):
-            try:
-                os.unlink(temp_file)
-            except:
-                pass
+def record_identity(record: dict, id_key: str | None = None) -> str | None:
+    """
+    id_key: 소스별 식별 필드 (config_data.APIS의 "id_key", 평탄화 키의 마지막 이름)
+    식별 필드 → 링크 → 제목+날짜 순
+    """
+    last_names = {k: k.lower().split("_")[-1] for k in record["flat"]}
+    for name in ((id_key.lower(),) if id_key else ()) + ID_KEYS:
+        for k, last in last_names.items():
+            if last == name:
+                return f"{k}={record['flat'][k]}"
+
+    link = record["link"]
+    if link:
+        return f"link={link}"
+
+    title, date = record["title"], record["date"]
+    if title:
+        return f"title={title}|date={date or ''}"
+    return None
 
 
-def parallel_upload_chunks(chunks: list[tuple[str, str]], store_name: str, max_workers: int = 5):
+def create_stable_chunks(records: list[dict], basename: str, store_name: str,
+                         batch_size: int = 100, id_key: str | None = None) -> list[tuple[str, str]]:
     """
-    chunks: [(filename, content), ...]
+    레코드 → 파트 배정을 실행 간에 고정하는 청킹
+    - 이미 배정된 레코드는 같은 파트에 유지 (내용이 같으면 파트 파일도 바이트 단위로 동일)
+    - 새 레코드는 가장 최근(번호가 가장 큰) 헤드 파트에 채우고, 가득 차면 다음 번호 파트를 연다
+    - 사라진 레코드는 해당 파트에서만 빠진다
+    records: normalize_record 결과 목록 (날짜 내림차순)
+    id_key: 소스별 식별 필드 (record_identity)
+    Returns: [(filename, content), ...]
     """
-    print(f"   → 새 파일 {len(chunks)}개 병렬 업로드 중...")
+    if not records:
+        return []
 
-    success_count = 0
-    failed_files = []
+    index = load_record_index(store_name, basename)
+
+    keyed = []  # (record_id, text), records 순서(날짜 내림차순) 유지
+    counts: dict[str, int] = {}
+    for record in records:
+        text = record["text"]
+        rid = record_identity(record, id_key) or f"hash={content_hash(text)}"
+        counts[rid] = counts.get(rid, 0) + 1
+        keyed.append((rid, text))
+
+    # 같은 식별자가 여러 번 나오면 내용 해시로 구분 (순번을 쓰면 새 레코드가 끼어들 때 뒤쪽 식별자가 모두 밀림)
+    identified = []
+    seen: dict[str, int] = {}
+    for rid, text in keyed:
+        if counts[rid] > 1:
+            rid = f"{rid}#{content_hash(text)[:16]}"
+            # 내용까지 같은 레코드만 순번으로 구분
+            seen[rid] = seen.get(rid, 0) + 1
+            if seen[rid] > 1:
+                rid = f"{rid}#{seen[rid]}"
+        identified.append((rid, text))
+
+    assigned: dict[str, tuple[int, str]] = {}
+    part_sizes: dict[int, int] = {}
+    new_records = []
+    changed = 0
+
+    for rid, text in identified:
+        h = content_hash(text)
+        if rid in index:
+            part = index[rid][0]
+            if index[rid][1] != h:
+                changed += 1
+            assigned[rid] = (part, h)
+            part_sizes[part] = part_sizes.get(part, 0) + 1
+        else:
+            new_records.append((rid, h))
+
+    # 새 레코드는 오래된 것부터 헤드 파트에 채움 (최신 레코드가 가장 최근 파트에 오도록)
+    head = max((part for part, _ in index.values()), default=1)
+    for rid, h in reversed(new_records):
+        if part_sizes.get(head, 0) >= batch_size:
+            head += 1
+        assigned[rid] = (head, h)
+        part_sizes[head] = part_sizes.get(head, 0) + 1
+
+    removed = len(set(index) - set(assigned))
+    print(f"   → 레코드 신규 {len(new_records)} / 변경 {changed} / 삭제 {removed}")
+
+    save_record_index(store_name, basename, assigned)
+
+    texts_by_part: dict[int, list[str]] = {}
+    for rid, text in identified:
+        texts_by_part.setdefault(assigned[rid][0], []).append(text)
+
+    return [
+        (f"{basename}_part{part}.md", "".join(texts))
+        for part, texts in sorted(texts_by_part.items())
+    ]
 
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_chunk = {
-            executor.submit(upload_single_chunk, fname, content, store_name): fname
-            for fname, content in chunks
-        }
 
-        for future in as_completed(future_to_chunk):
-            d_name, success, error_msg = future.result()
+# =========================================
+# 5. 업로드 (공용 업로드 엔진: 속도 제한/적응형 동시성/재시도)
+# =========================================
+engine = UploadEngine(client, **config_data.UPLOAD_ENGINE)
 
-            if success:
-                print(f"     ✅ {d_name}")
-                success_count += 1
-            else:
-                print(f"     ❌ {d_name} - {error_msg}")
-                failed_files.append((d_name, error_msg))
 
-    print(f"   → 업로드 완료: 성공 {success_count}/{len(chunks)}")
-    if failed_files:
-        print(f"   ⚠️ 실패: {len(failed_files)}개")
+def parallel_upload_chunks(chunks: list[tuple[str, str]], store_name: str) -> dict[str, str | None]:
+    """
+    chunks: [(filename, content), ...]
+    Returns: 업로드 성공한 {filename: document_name}
+    """
+    print(f"   → 새 파일 {len(chunks)}개 병렬 업로드 중...")
+    results = engine.upload_chunks(chunks, store_name)
+    return {fn: r["document_name"] for fn, r in results.items() if r["success"]}
 
 
 # =========================================
 # 6. FileSearchStore 업데이트
 # =========================================
-def update_store_files(store_name: str, chunks: list[tuple[str, str]], base_name_pattern: str):
+def update_store_files(store_name: str, chunks: list[tuple[str, str]], base_name_pattern: str) -> bool:
+    """Returns: 모든 변경 파트 업로드에 성공했으면 True"""
     print(f"   [Store Update] '{base_name_pattern}' 동기화 시작")
+    prefix = base_name_pattern + "_part"
 
-    # 1) 기존 문서 검색 및 삭제
+    # 1) 기존 문서 조회 후 매니페스트(콘텐츠 해시)와 비교
     pager = client.file_search_stores.documents.list(parent=store_name)
-
-    docs_to_delete = []
+    existing_docs = []
     for doc in pager:
-        d_name = getattr(doc, "display_name", "")
-        if d_name.startswith(base_name_pattern + "_part"):
-            docs_to_delete.append(doc.name)
-
-    if docs_to_delete:
-        print(f"   → 기존 파일 {len(docs_to_delete)}개 삭제 중...")
-        for d_id in docs_to_delete:
-            try:
-                client.file_search_stores.documents.delete(name=d_id, config={"force": True})
-            except Exception:
-                pass
-        time.sleep(2)
-
-    # 2) 새 파일들 병렬 업로드
-    parallel_upload_chunks(chunks, store_name, max_workers=5)
+        d_name = getattr(doc, "display_name", "") or ""
+        if d_name.startswith(prefix):
+            existing_docs.append((d_name, doc.name))
+
+    plan = plan_store_sync(store_name, chunks, prefix, existing_docs)
+    print(f"   → 변경 {len(plan['upload'])}개 / 유지 {len(plan['unchanged'])}개 / 삭제 {len(plan['delete'])}개")
+
+    if not plan["upload"] and not plan["delete"]:
+        print("   [✔] 변경 없음 (업로드 생략)\n")
+        return True
+
+    # 2) 사라진 파트/중복 문서 삭제
+    if plan["delete"]:
+        print(f"   → 불필요한 파일 {len(plan['delete'])}개 삭제 중...")
+        engine.delete_documents(plan["delete"])
+    remove_entries(store_name, plan["removed"])
+
+    # 3) 바뀐/새 파트만 병렬 업로드, 성공한 파트는 이전 버전 삭제 후 매니페스트 기록
+    uploaded: dict[str, str | None] = {}
+    if plan["upload"]:
+        uploaded = parallel_upload_chunks([(fn, content) for fn, content, _ in plan["upload"]], store_name)
+
+        replaced = [d for fn in uploaded for d in plan["replace"].get(fn, [])]
+        if replaced:
+            print(f"   → 이전 버전 {len(replaced)}개 삭제 중...")
+            engine.delete_documents(replaced)
+
+        record_uploads(store_name, [(fn, h, uploaded[fn]) for fn, _, h in plan["upload"] if fn in uploaded])
+
+    # 챗봇 답변 캐시 무효화 (스토어 버전 갱신)
+    bump_store_version(store_name)
 
     print("   [✔] 동기화 완료\n")
+    return len(uploaded) == len(plan["upload"])
 
 
 # =========================================
 # 7. 파이프라인 실행
 # =========================================
-def run_api_pipeline():
-    store_name = config_data.AUTO_UPDATE_STORE_NAME
-    apis = config_data.APIS
+# 수집(동시) → 파싱/청킹(도착하는 대로) → 스토어 동기화(공용 업로드 엔진) 단계로 나눠 실행
+# API 응답을 기다리는 동안 다른 API의 파싱/업로드가 진행된다. 작업자 수는 config_data.API_PIPELINE.
+def format_size_change(before: int, after: int) -> str:
+    change = f" ({(after - before) / before:+.0%})" if before else ""
+    return f"{before / 1024:,.0f}KB → {after / 1024:,.0f}KB{change}"
+
+
+def size_report(size_stats: dict[str, tuple[str, int, int, int]]) -> str:
+    """소스별 직렬화 크기 (이전 형식 → 프로필 적용, 레코드당 평균), 파싱한 소스만"""
+    if not size_stats:
+        return "변경된 소스 없음"
+    lines = []
+    for name, (profile, count, before, after) in size_stats.items():
+        lines.append(f"  - {name} [{profile}] {count}건: {format_size_change(before, after)} · "
+                     f"레코드당 {before // max(count, 1):,}B → {after // max(count, 1):,}B")
+    before = sum(s[2] for s in size_stats.values())
+    after = sum(s[3] for s in size_stats.values())
+    return f"전체 {format_size_change(before, after)}\n" + "\n".join(lines)
+
+
+def fetch_stage(job: dict) -> dict | None:
+    api = job["api"]
+    name = api["name"]
+    key_env = api.get("key_env")
+    key = os.getenv(key_env) if key_env else None
+    job["profile"] = profile = resolve_profile(api.get("profile"))
+
+    # page_size가 있으면 페이지 단위 수집 (페이지별 캐시 키)
+    if api.get("page_size"):
+        records, job["cache_keys"] = fetch_api_paged(api["url"], key, api["page_size"], profile)
+    else:
+        records, job["cache_keys"] = fetch_api(api["url"], key, profile), [api["url"]]
 
-    print(f"[✔] Target Store: {store_name}\n")
+    if records is None:
+        http_cache.discard(job["cache_keys"])
+        job["failed"].append((name, "API 응답 실패"))
+        print(f"   [{name}] 실패 (API Error)")
+        return None
+    if records is NOT_MODIFIED:
+        job["success"].append(name)
+        print(f"   [{name}] 변경 없음 (HTTP 캐시: 304/본문 해시 일치, 파싱·업로드 생략)")
+        return None
 
-    success_apis = []
-    failed_apis = []
+    job["records"] = records
+    return job
 
-    for api in apis:
-        name = api["name"]
-        url = api["url"]
-        key_env = api.get("key_env")
-        key = os.getenv(key_env) if key_env else None
 
-        print(f"=== API 처리: {name} ===")
+def process_stage(job: dict) -> dict | None:
+    name = job["api"]["name"]
+    records = job.pop("records")
 
-        data = fetch_api(url, key)
-        if data is None:
-            failed_apis.append((name, "API 응답 실패"))
-            print("   → 실패 (API Error)\n")
-            continue
+    records_sorted = sort_records_by_date(records)
+    print(f"   [{name}] {len(records_sorted)}개 아이템 추출됨")
 
-        items = extract_items(data) or [data]
-        if isinstance(items, dict): items = [items]
+    # 직렬화 크기 (이전 형식 대비)
+    before = sum(r["full_size"] for r in records_sorted)
+    after = sum(r["size"] for r in records_sorted)
+    job["sizes"][name] = (job["profile"]["name"], len(records_sorted), before, after)
+    print(f"   [{name}] 직렬화({job['profile']['name']}): {format_size_change(before, after)}")
 
-        items_sorted = sort_items_by_date(items)
-        print(f"   → {len(items_sorted)}개 아이템 추출됨")
+    try:
+        # 메모리에서 청킹 (파일 저장 안 함, 레코드 → 파트 배정은 실행 간 고정)
+        job["chunks"] = create_stable_chunks(records_sorted, basename=name, store_name=job["store_name"], batch_size=100,
+                                             id_key=job["api"].get("id_key"))
+    except Exception as e:
+        job["failed"].append((name, str(e)))
+        print(f"   [{name}] 처리 중 에러: {e}")
+        http_cache.discard(job["cache_keys"])
+        return None
 
-        try:
-            # 메모리에서 청킹 (파일 저장 안 함)
-            chunks = create_chunks_in_memory(items_sorted, basename=name, batch_size=100)
-
-            if chunks:
-                update_store_files(store_name, chunks, base_name_pattern=name)
-                success_apis.append(name)
-            else:
-                print("   → 저장할 데이터 없음\n")
-        except Exception as e:
-            failed_apis.append((name, str(e)))
-            print(f"   → 처리 중 에러: {e}\n")
+    if not job["chunks"]:
+        print(f"   [{name}] 저장할 데이터 없음")
+        http_cache.discard(job["cache_keys"])
+        return None
+    return job
+
+
+def sync_stage(job: dict) -> None:
+    name = job["api"]["name"]
+
+    print(f"\n=== API 동기화: {name} ===")
+    try:
+        synced = update_store_files(job["store_name"], job["chunks"], base_name_pattern=name)
+        if synced:
+            job["success"].append(name)
+        else:
+            job["failed"].append((name, "일부 파트 업로드 실패"))
+            print(f"   → 일부 파트 업로드 실패 (다음 실행에서 다시 처리)\n")
+    except Exception as e:
+        synced = False
+        job["failed"].append((name, str(e)))
+        print(f"   → 처리 중 에러: {e}\n")
+
+    # 동기화가 끝까지 성공한 경우에만 캐시 갱신 (실패분은 다음 실행에서 다시 처리)
+    if synced:
+        http_cache.commit(job["cache_keys"])
+    else:
+        http_cache.discard(job["cache_keys"])
+
+
+def run_api_pipeline():
+    store_name = config_data.AUTO_UPDATE_STORE_NAME
+    apis = config_data.APIS
+    workers = config_data.API_PIPELINE
+
+    print(f"[✔] Target Store: {store_name}\n")
+
+    success_apis = []
+    failed_apis = []
+    size_stats: dict[str, tuple[str, int, int, int]] = {}
+    engine.reset_metrics()
+
+    pipeline = StagedPipeline([
+        ("수집", fetch_stage, workers["fetch_workers"]),
+        ("파싱/청킹", process_stage, workers["process_workers"]),
+        ("동기화", sync_stage, workers["sync_workers"]),
+    ])
+    jobs = [
+        {"api": api, "store_name": store_name, "success": success_apis, "failed": failed_apis, "sizes": size_stats}
+        for api in apis
+    ]
+    pipeline.run(jobs)
+
+    # 단계 함수에서 처리하지 못한 예외
+    for stage, job, e in pipeline.errors:
+        failed_apis.append((job["api"]["name"], str(e)))
+        http_cache.discard(job.get("cache_keys", [job["api"]["url"]]))
+        print(f"   [{job['api']['name']}] {stage} 단계 에러: {e}")
 
     print("\n====================")
     print("🎉 API 업데이트 완료")
     print("   성공:", success_apis)
     print("   실패:", [f[0] for f in failed_apis])
+    print("   업로드:", engine.report())
+    print("   단계별 시간:", pipeline.report())
+    print("   직렬화 크기:", size_report(size_stats))
     print("====================")
 
 
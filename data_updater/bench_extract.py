@@ -0,0 +1,122 @@
+import os
+import sys
+import json
+import time
+import argparse
+
+# config_data에서 설정 가져오기
+import config_data
+from data_updater.web_crawler import WebCrawler
+from data_updater.html_extract import extract_text_bs4, extract_text_lxml
+
+
+# =========================================
+# 본문 추출 벤치마크 (BeautifulSoup 경로 vs lxml 경로)
+# =========================================
+# 저장해 둔 상세 페이지로 두 경로의 처리량(pages/s)을 재고 출력이 같은지 확인한다.
+#
+#   python -m data_updater.bench_extract samples/ --save       # WEB_URLS 페이지를 samples/에 저장
+#   python -m data_updater.bench_extract samples/              # 벤치마크
+#
+# samples/samples.json: {파일명: WEB_URLS name} (설정의 content_selector/remove_selectors 적용)
+SAMPLES_INDEX = "samples.json"
+
+
+def save_samples(out_dir: str, per_board: int = 10):
+    """WEB_URLS의 단일 페이지와 목록형 게시판 첫 페이지의 상세 글을 저장"""
+    os.makedirs(out_dir, exist_ok=True)
+    crawler = WebCrawler(**config_data.WEB_CRAWLER)
+    index = {}
+
+    for item in config_data.WEB_URLS:
+        urls = [item["url"]]
+        if item["type"] == "list":
+            urls = (crawler.find_links(item["url"], item["link_pattern"]) or [])[:per_board]
+
+        for i, url in enumerate(urls):
+            page = crawler.fetch_page(url)
+            if not page:
+                continue
+            filename = f"{item['name']}_{i + 1}.html"
+            with open(os.path.join(out_dir, filename), "w", encoding="utf-8") as f:
+                f.write(page["text"])
+            index[filename] = item["name"]
+            print(f"  💾 {filename} ← {url}")
+
+    with open(os.path.join(out_dir, SAMPLES_INDEX), "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, indent=2)
+    print(f"[✔] {len(index)}개 페이지 저장: {out_dir}")
+
+
+def load_samples(sample_dir: str) -> list[tuple[str, str, dict | None]]:
+    """Returns: [(filename, html, config_item), ...]"""
+    index = {}
+    index_path = os.path.join(sample_dir, SAMPLES_INDEX)
+    if os.path.exists(index_path):
+        with open(index_path, encoding="utf-8") as f:
+            index = json.load(f)
+    configs = {item["name"]: item for item in config_data.WEB_URLS}
+
+    samples = []
+    for filename in sorted(os.listdir(sample_dir)):
+        if not filename.endswith((".html", ".htm")):
+            continue
+        with open(os.path.join(sample_dir, filename), encoding="utf-8") as f:
+            samples.append((filename, f.read(), configs.get(index.get(filename))))
+    return samples
+
+
+def bench(samples: list[tuple[str, str, dict | None]], extract, repeat: int) -> float:
+    """Returns: pages/s (repeat번 중 가장 빠른 회차 기준)"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _, html, config_item in samples:
+            extract(html, config_item)
+        best = min(best, time.perf_counter() - started)
+    return len(samples) / max(best, 1e-9)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="본문 추출 벤치마크 (BeautifulSoup vs lxml)")
+    parser.add_argument("sample_dir", help="저장된 HTML 페이지 폴더")
+    parser.add_argument("--save", action="store_true", help="WEB_URLS 페이지를 내려받아 sample_dir에 저장")
+    parser.add_argument("--per-board", type=int, default=10, help="--save 시 게시판별 저장할 글 수")
+    parser.add_argument("--repeat", type=int, default=5, help="측정 반복 횟수")
+    args = parser.parse_args()
+
+    if args.save:
+        save_samples(args.sample_dir, args.per_board)
+        return
+
+    samples = load_samples(args.sample_dir)
+    if not samples:
+        print(f"[❌] 샘플 없음: {args.sample_dir}")
+        sys.exit(1)
+
+    # 출력 비교 (lxml 경로가 지원하지 않는 selector면 BeautifulSoup 경로로 처리됨)
+    fallback = 0
+    mismatched = []
+    for filename, html, config_item in samples:
+        fast = extract_text_lxml(html, config_item)
+        if fast is None:
+            fallback += 1
+        elif fast != extract_text_bs4(html, config_item):
+            mismatched.append(filename)
+
+    size_kb = sum(len(html.encode("utf-8")) for _, html, _ in samples) / 1024
+    print(f"=== 📊 본문 추출 벤치마크: {len(samples)}개 페이지 ({size_kb:.0f}KB), {args.repeat}회 반복 ===")
+
+    before = bench(samples, extract_text_bs4, args.repeat)
+    after = bench(samples, lambda html, item: extract_text_lxml(html, item) or extract_text_bs4(html, item), args.repeat)
+    print(f"  BeautifulSoup (html.parser): {before:8.1f} pages/s")
+    print(f"  lxml (본문 영역만 순회):      {after:8.1f} pages/s  (x{after / before:.1f})")
+
+    print(f"  출력 일치: {len(samples) - fallback - len(mismatched)}/{len(samples) - fallback}"
+          + (f" · BeautifulSoup 대체 {fallback}" if fallback else ""))
+    for filename in mismatched:
+        print(f"    ⚠️ 불일치: {filename}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+import os
+import sys
+import time
+import argparse
+
+import requests
+
+# config_data에서 설정 가져오기
+import config_data
+from data_updater import api_updater as au
+from data_updater.xml_stream import XmlItemStream
+
+
+# =========================================
+# API 레코드 정규화 벤치마크 (이전 방식 vs normalize_record)
+# =========================================
+# 저장해 둔 API 응답으로 레코드 처리량(records/s)을 재고, 레코드 순서/텍스트가 이전 방식과 같은지 확인한다.
+# 이전 방식(아래 legacy_*)은 정규화 전 코드를 그대로 옮겨 둔 것: 정렬 키/포맷/식별자마다 flatten_dict를 다시 하고,
+# HTML 값은 항상 BeautifulSoup으로 정제 (api_updater 함수를 쓰지 않으므로 포맷 회귀도 "결과 일치"에서 잡힘)
+# 식별자 규칙은 의도적으로 바뀌었으므로(ID_KEYS 정확 일치) 일치 여부 대신 이전 규칙과 같은 건수만 출력한다
+# (다른 건수만큼 다음 실행에서 파트 배정이 한 번 새로 잡힘)
+#
+#   python -m data_updater.bench_records payload.xml --save photogallery   # APIS의 응답 1페이지 저장
+#   python -m data_updater.bench_records payload.xml
+#   python -m data_updater.bench_records payload.xml --profile compact   # 직렬화 프로필 적용 전후 크기
+
+
+def save_payload(path: str, name: str, rows: int):
+    api = next((a for a in config_data.APIS if a["name"] == name), None)
+    if not api:
+        print(f"[❌] APIS에 없는 이름: {name}")
+        sys.exit(1)
+
+    key = os.getenv(api["key_env"]) if api.get("key_env") else None
+    params = {au.PAGE_PARAM: 1, au.ROWS_PARAM: api.get("page_size", rows), **au._key_params(api["url"], key)}
+    res = requests.get(api["url"], params=params, timeout=60)
+    res.raise_for_status()
+
+    with open(path, "wb") as f:
+        f.write(res.content)
+    print(f"[✔] {name} 응답 저장: {path} ({len(res.content) / 1024:.0f}KB)")
+
+
+def load_items(path: str) -> list:
+    with open(path, "rb") as f:
+        raw = f.read()
+
+    if raw.lstrip().startswith(b"<"):
+        stream = XmlItemStream(lambda item: item)
+        stream.feed_bytes(raw)
+        stream.flush_bytes()
+        if stream.close():
+            return stream.records
+
+    data = au.parse_payload(raw.decode("utf-8"), "application/json")
+    items = au.extract_items(data) or [data]
+    return [items] if isinstance(items, dict) else items
+
+
+# ---------- 이전 방식 ----------
+def legacy_flatten(obj, prefix="", out=None):
+    if out is None: out = {}
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            legacy_flatten(v, prefix + k + "_", out)
+    elif isinstance(obj, list):
+        for i, v in enumerate(obj):
+            legacy_flatten(v, prefix + str(i) + "_", out)
+    else:
+        if obj not in [None, ""]:
+            val = str(obj)
+            if au.looks_like_html(val): val = au.html_to_text_soup(val)
+            out[prefix[:-1]] = au.clean_text(val)
+    return out
+
+
+# 이전 식별 규칙 (마지막 키 조각이 힌트와 일치하거나 "id"로 끝나는 첫 필드)
+LEGACY_ID_KEY_HINTS = ("id", "seq", "sn", "key", "code", "uid", "no")
+LEGACY_ROW_NUMBER_KEYS = ("rnum", "rownum", "num", "rn")
+
+
+def legacy_format_record(rec) -> str:
+    flat = legacy_flatten(rec)
+    title = au.pick_title(flat)
+    date = au.pick_date(flat)
+    link = au.pick_link(flat)
+    desc = au.pick_description(flat)
+
+    lines = ["### Record"]
+    if title: lines.append(f"**Title:** {title}")
+    if date: lines.append(f"**Date:** {date}")
+    if desc: lines.append(f"**Description:** {desc}")
+    else: lines.append(f"**Description:** (내용 없음)")
+    if link: lines.append(f"**Link:** {link}")
+
+    lines.append("\n**Details:**")
+    for k, v in flat.items():
+        if v in [title, date, desc, link] or not v: continue
+        lines.append(f"- {k}: {v}")
+    return "\n".join(lines) + "\n\n---\n\n"
+
+
+def legacy_record_identity(flat: dict) -> str | None:
+    for k, v in flat.items():
+        last = k.lower().split("_")[-1]
+        if last in LEGACY_ROW_NUMBER_KEYS:
+            continue
+        if last in LEGACY_ID_KEY_HINTS or last.endswith("id"):
+            return f"{k}={v}"
+
+    link = au.pick_link(flat)
+    if link:
+        return f"link={link}"
+
+    title, date = au.pick_title(flat), au.pick_date(flat)
+    if title:
+        return f"title={title}|date={date or ''}"
+    return None
+
+
+def legacy_records(items: list) -> tuple[list[str], list[str | None]]:
+    """Returns: (레코드 텍스트, 식별자) - 날짜 내림차순"""
+    items = sorted(items, key=lambda rec: au.parse_date_str(au.pick_date(legacy_flatten(rec)) or ""), reverse=True)
+    return [legacy_format_record(rec) for rec in items], [legacy_record_identity(legacy_flatten(rec)) for rec in items]
+
+
+def current_records(items: list) -> tuple[list[str], list[str | None]]:
+    records = au.sort_records_by_date([au.normalize_record(rec) for rec in items])
+    return [r["text"] for r in records], [au.record_identity(r) for r in records]
+
+
+def bench(items: list, fn, repeat: int) -> tuple[float, list]:
+    """Returns: (records/s, 마지막 결과) (repeat번 중 가장 빠른 회차 기준)"""
+    best = float("inf")
+    result = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(items)
+        best = min(best, time.perf_counter() - started)
+    return len(items) / max(best, 1e-9), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API 레코드 정규화 벤치마크")
+    parser.add_argument("payload", help="저장된 API 응답 파일 (XML/JSON)")
+    parser.add_argument("--save", metavar="NAME", help="APIS의 NAME 응답을 payload 경로에 저장")
+    parser.add_argument("--rows", type=int, default=1000, help="--save 시 numOfRows (page_size가 없을 때)")
+    parser.add_argument("--repeat", type=int, default=3, help="측정 반복 횟수")
+    parser.add_argument("--profile", help="크기를 비교할 직렬화 프로필 (RECORD_PROFILES 이름, 기본 API_RECORD_PROFILE)")
+    args = parser.parse_args()
+
+    if args.save:
+        save_payload(args.payload, args.save, args.rows)
+        return
+
+    items = load_items(args.payload)
+    print(f"=== 📊 레코드 정규화 벤치마크: {len(items)}건, {args.repeat}회 반복 ===")
+
+    before, legacy = bench(items, legacy_records, args.repeat)
+    after, current = bench(items, current_records, args.repeat)
+    print(f"  이전 방식 (flatten 3회 + BeautifulSoup): {before:8.1f} records/s")
+    print(f"  normalize_record (1회 + 단순 태그 fast path): {after:8.1f} records/s  (x{after / before:.1f})")
+    print(f"  결과 일치 (순서/텍스트): {'✅' if legacy[0] == current[0] else '❌'}")
+    if legacy[0] == current[0]:
+        same = sum(1 for old, new in zip(legacy[1], current[1]) if old == new)
+        print(f"  식별자: 이전 규칙과 같은 레코드 {same}/{len(items)}건 (나머지는 다음 실행에서 파트 배정이 한 번 새로 잡힘)")
+
+    profile = au.resolve_profile(args.profile)
+    records = [au.normalize_record(rec, profile) for rec in items]
+    before = sum(r["full_size"] for r in records)
+    after = sum(r["size"] for r in records)
+    print(f"  직렬화 크기 ({profile['name']}): {au.format_size_change(before, after)}")
+
+
+if __name__ == "__main__":
+    main()
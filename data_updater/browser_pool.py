@@ -0,0 +1,84 @@
+import queue
+import threading
+from contextlib import contextmanager
+
+
+# =========================================
+# Headless Chrome 세션 풀
+# =========================================
+# 사이트마다 Chrome을 새로 띄우지 않고, 띄운 브라우저를 실행이 끝날 때까지 재사용한다.
+# - session(): 쉬고 있는 브라우저를 빌려줌 (없으면 size개까지 새로 생성, 그 이상이면 반납될 때까지 대기)
+# - 사용 중 예외가 나면 브라우저 상태를 알 수 없으므로 반납하지 않고 종료
+# - close(): 풀의 브라우저 전부 종료 (파이프라인 끝에서 호출)
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/110.0.0.0 Safari/537.36"
+)
+
+
+class BrowserPool:
+    def __init__(self, size: int = 1, page_load_timeout: float = 30):
+        """
+        size: 동시에 띄울 수 있는 최대 브라우저 수
+        page_load_timeout: driver.get 최대 대기 시간 (초)
+        """
+        self.size = max(1, size)
+        self.page_load_timeout = page_load_timeout
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._slots = threading.Semaphore(self.size)
+        self._lock = threading.Lock()
+        self._drivers: list = []
+
+    def _create(self):
+        # selenium은 브라우저를 처음 띄울 때 import (HTTP 수집만 하는 환경에서는 설치 불필요)
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+
+        chrome_options = Options()
+        chrome_options.add_argument("--headless")
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument("--window-size=1920,1080")
+        chrome_options.add_argument(f"user-agent={USER_AGENT}")
+        # DOMContentLoaded까지만 기다림 (이미지 등은 조건 대기로 충분)
+        chrome_options.page_load_strategy = "eager"
+
+        driver = webdriver.Chrome(options=chrome_options)
+        driver.set_page_load_timeout(self.page_load_timeout)
+        with self._lock:
+            self._drivers.append(driver)
+        return driver
+
+    def _quit(self, driver):
+        with self._lock:
+            if driver in self._drivers:
+                self._drivers.remove(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    @contextmanager
+    def session(self):
+        self._slots.acquire()
+        try:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                driver = self._create()
+
+            try:
+                yield driver
+            except BaseException:
+                self._quit(driver)
+                raise
+            self._idle.put(driver)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        with self._lock:
+            drivers = list(self._drivers)
+        for driver in drivers:
+            self._quit(driver)
+        self._idle = queue.LifoQueue()
@@ -1,110 +1,239 @@
 import re
 import time
-import os
-import tempfile
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
+from datetime import date
+from urllib.parse import urljoin
+from concurrent.futures import ThreadPoolExecutor
+
+from bs4 import BeautifulSoup
 from google import genai
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # config_data에서 설정 가져오기
 import config_data
+from app.db import bump_store_version
+from data_updater.upload_engine import UploadEngine
+from data_updater.browser_pool import BrowserPool
+from data_updater.web_crawler import WebCrawler
 
-client = genai.Client(api_key=config_data.GOOGLE_API_KEY)
+# 브라우저는 실행 동안 재사용 (run_calendar_pipeline 끝에서 종료)
+browser_pool = BrowserPool(size=config_data.CALENDAR_CRAWLER["browsers"])
+# month_url이 있는 사이트는 브라우저 없이 HTTP로 수집
+http = WebCrawler(**config_data.WEB_CRAWLER)
 
 
 # =====================================================
-# 1. Selenium 크롤러 (Headless 모드)
+# 1. 캘린더 크롤러
 # =====================================================
-def crawl_calendar_site(site_config, months_override=None):
-    url = site_config["target_url"]
+# 한 달치 행을 execute_script 한 번으로 추출 (행마다 find_element 왕복하지 않음)
+# busy: 문서 로딩 중이거나 jQuery ajax 요청이 남아 있으면 true (조건 대기에 사용)
+ROWS_SCRIPT = """
+const sel = arguments[0];
+const text = el => el ? (el.innerText || el.textContent || "").trim() : "";
+const rows = [];
+for (const row of document.querySelectorAll(sel.row_container)) {
+    const title = row.querySelector(sel.title);
+    const date = row.querySelector(sel.date);
+    if (!title || !date) continue;
+    const place = sel.place ? row.querySelector(sel.place) : null;
+    rows.push({
+        title: text(title),
+        period: text(date),
+        place: place ? text(place) : "장소 미정",
+        link: title.getAttribute("href") === null ? null : title.href,
+    });
+}
+return {
+    ym: text(document.getElementById(sel.ym_display_id)),
+    busy: document.readyState === "loading" || !!(window.jQuery && window.jQuery.active),
+    rows: rows,
+};
+"""
+
+
+def _to_events(rows: list[dict], site_name: str, year_month: str) -> list[dict]:
+    return [
+        {
+            "site": site_name,
+            "year_month": year_month,
+            "title": row["title"],
+            "period": row["period"],
+            "place": row["place"],
+            "link": row["link"],
+        }
+        for row in rows
+    ]
+
+
+def extract_rows(html: str, selectors: dict, base_url: str) -> tuple[str, list[dict]]:
+    """정적 HTML에서 (월 표시, 행 목록) 추출 (ROWS_SCRIPT와 같은 규칙)"""
+    soup = BeautifulSoup(html, "html.parser")
+
+    def text(el):
+        return el.get_text(" ", strip=True) if el else ""
+
+    rows = []
+    for row in soup.select(selectors["row_container"]):
+        title_el = row.select_one(selectors["title"])
+        date_el = row.select_one(selectors["date"])
+        if not title_el or not date_el:
+            continue
+        place_el = row.select_one(selectors["place"]) if selectors.get("place") else None
+        href = title_el.get("href")
+        rows.append({
+            "title": text(title_el),
+            "period": text(date_el),
+            "place": text(place_el) if place_el else "장소 미정",
+            "link": urljoin(base_url, href) if href is not None else None,
+        })
+
+    ym_el = soup.find(id=selectors["ym_display_id"])
+    return text(ym_el), rows
+
+
+def crawl_calendar_http(site_config, months: int) -> list[dict]:
+    """
+    month_url 템플릿({year}, {month})으로 월별 페이지를 직접 요청 (Selenium 없이)
+    월 표시 요소가 없으면 "YYYY.MM"을 월 이름으로 사용
+    """
     selectors = site_config["selectors"]
     site_name = site_config.get("site_name", "Unknown_Site")
 
-    months_to_collect = months_override if months_override else site_config.get("months_to_collect", 3)
+    today = date.today()
+    targets = []
+    for i in range(months):
+        year, month = divmod(today.month - 1 + i, 12)
+        year, month = today.year + year, month + 1
+        targets.append((f"{year}.{month:02d}", site_config["month_url"].format(year=year, month=month)))
+
+    def fetch(target):
+        return target, http.fetch_page(target[1])
 
-    print(f"\n🚀 [{site_name}] 크롤링 시작 ({months_to_collect}개월)")
+    all_events = []
+    with ThreadPoolExecutor(max_workers=http.limiter.per_host) as pool:
+        for (default_ym, url), page in pool.map(fetch, targets):
+            if not page:
+                continue
+            current_ym, rows = extract_rows(page["text"], selectors, url)
+            current_ym = current_ym or default_ym
+            print(f"   Now Scanning: {current_ym} ... {len(rows)}건")
+            all_events.extend(_to_events(rows, site_name, current_ym))
+
+    return all_events
 
-    # Headless 모드 옵션
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--window-size=1920,1080")
-    chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/110.0.0.0 Safari/537.36")
 
-    driver = webdriver.Chrome(options=chrome_options)
+def crawl_calendar_browser(site_config, months: int) -> tuple[list[dict], bool]:
+    """
+    브라우저 풀의 세션으로 월 이동하며 수집 (고정 sleep 없이 조건 대기만 사용)
+    Returns: (이벤트 목록, 오류 없이 끝났는지) - 중간에 실패하면 모은 행이 온전하지 않을 수 있으므로 False
+    """
+    selectors = site_config["selectors"]
+    site_name = site_config.get("site_name", "Unknown_Site")
+    wait_timeout = config_data.CALENDAR_CRAWLER["wait_timeout"]
 
     all_events = []
 
+    # selenium은 브라우저 수집에서만 필요 (month_url 사이트는 selenium 없이 동작)
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.common.exceptions import TimeoutException, NoSuchElementException
+
+    def month_loaded(prev_ym, prev_rows, old_row):
+        """
+        다음 달 클릭 후 조건: 월 표시가 바뀌고 로딩(ajax)이 끝났으며 행도 새로 그려졌을 때, 연속 두 번 같은 행이 읽히면 반환
+        - 행이 클릭 전과 다르면 새로 그려진 것으로 봄
+        - 행이 같으면 클릭 전 첫 행 요소가 DOM에서 떨어져 나갔을 때만 인정 (실제로 같은 내용으로 다시 그린 경우)
+        - 클릭 전/후 모두 빈 달이면 비교할 행이 없으므로 월 표시 변경만으로 인정
+        """
+        last = {}
+
+        def refreshed(driver, rows) -> bool:
+            if prev_rows is None or rows != prev_rows:
+                return True
+            if not rows:
+                return True
+            return old_row is not None and EC.staleness_of(old_row)(driver)
+
+        def condition(driver):
+            snapshot = driver.execute_script(ROWS_SCRIPT, selectors)
+            if snapshot["busy"] or not snapshot["ym"] or snapshot["ym"] == prev_ym \
+                    or not refreshed(driver, snapshot["rows"]):
+                last.clear()
+                return False
+            if last.get("snapshot") != snapshot:
+                last["snapshot"] = snapshot
+                return False
+            return snapshot
+        return condition
+
     try:
-        driver.get(url)
-        time.sleep(3)
+        with browser_pool.session() as driver:
+            wait = WebDriverWait(driver, wait_timeout, poll_frequency=0.2)
+            driver.get(site_config["target_url"])
 
-        for i in range(months_to_collect):
-            try:
-                WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.ID, selectors['ym_display_id']))
-                )
-                ym_element = driver.find_element(By.ID, selectors['ym_display_id'])
-                current_ym = ym_element.text.strip()
-            except Exception as e:
-                print(f"   [!] 월 정보 로딩 지연: {e}")
-                current_ym = f"Unknown_Month_{i}"
+            current_ym, current_rows, old_row = None, None, None
+            for i in range(months):
+                try:
+                    snapshot = wait.until(month_loaded(current_ym, current_rows, old_row))
+                except TimeoutException:
+                    if i == 0:
+                        print("   [!] 월 정보 로딩 지연")
+                        snapshot = driver.execute_script(ROWS_SCRIPT, selectors)
+                        snapshot["ym"] = snapshot["ym"] or f"Unknown_Month_{i}"
+                    elif driver.execute_script(ROWS_SCRIPT, selectors)["ym"] in ("", current_ym):
+                        print("   [Info] 다음 달로 넘어가지 않음 (마지막 페이지)")
+                        break
+                    else:
+                        # 월 표시만 바뀌고 행이 새로 그려지지 않음 → 이전 달 행을 새 달로 올리지 않도록 실패 처리
+                        raise TimeoutException(f"{current_ym} 다음 달의 행이 갱신되지 않음")
+
+                current_ym, current_rows = snapshot["ym"], snapshot["rows"]
+                print(f"   Now Scanning: {current_ym} ... {len(current_rows)}건")
+                all_events.extend(_to_events(current_rows, site_name, current_ym))
+
+                if i == months - 1:
+                    break
+
+                # 클릭 전 첫 행 요소 (다음 달 행이 새로 그려졌는지 staleness로 확인)
+                first_rows = driver.find_elements(By.CSS_SELECTOR, selectors["row_container"])
+                old_row = first_rows[0] if first_rows else None
+                try:
+                    driver.find_element(By.CLASS_NAME, selectors['next_btn_class']).click()
+                except NoSuchElementException:
+                    print("   [Info] 다음 달 버튼 없음 또는 마지막 페이지")
+                    break
+    except Exception as e:
+        # 브라우저는 풀에서 빠지고 다음 사이트는 새 브라우저로 수집
+        print(f"   [Error] 크롤링 중 치명적 오류: {e}")
+        return all_events, False
 
-            print(f"   Now Scanning: {current_ym} ...")
+    return all_events, True
 
-            rows = driver.find_elements(By.CSS_SELECTOR, selectors['row_container'])
 
-            for row in rows:
-                try:
-                    title_el = row.find_element(By.CSS_SELECTOR, selectors['title'])
-                    date_el = row.find_element(By.CSS_SELECTOR, selectors['date'])
-                    try:
-                        place = row.find_element(By.CSS_SELECTOR, selectors['place']).text.strip()
-                    except:
-                        place = "장소 미정"
-
-                    event_data = {
-                        "site": site_name,
-                        "year_month": current_ym,
-                        "title": title_el.text.strip(),
-                        "period": date_el.text.strip(),
-                        "place": place,
-                        "link": title_el.get_attribute("href")
-                    }
-                    all_events.append(event_data)
-                except:
-                    continue
-
-            if i == months_to_collect - 1:
-                break
-
-            try:
-                next_btn = driver.find_element(By.CLASS_NAME, selectors['next_btn_class'])
-                next_btn.click()
-
-                WebDriverWait(driver, 10).until(
-                    lambda d: d.find_element(By.ID, selectors['ym_display_id']).text != current_ym
-                )
-                time.sleep(1)
-            except:
-                print("   [Info] 다음 달 버튼 없음 또는 마지막 페이지")
-                break
+def crawl_calendar_site(site_config, months_override=None) -> tuple[list[dict], bool]:
+    """Returns: (이벤트 목록, 수집이 오류 없이 끝났는지)"""
 
+    site_name = site_config.get("site_name", "Unknown_Site")
+    months_to_collect = months_override if months_override else site_config.get("months_to_collect", 3)
+
+    use_http = bool(site_config.get("month_url"))
+    mode = "HTTP" if use_http else "Browser"
+    print(f"\n🚀 [{site_name}] 크롤링 시작 ({months_to_collect}개월, {mode})")
+
+    try:
+        if use_http:
+            # 받지 못한 달은 결과에서 빠질 뿐이라 (그 달 파일은 갱신 안 됨) 나머지 달은 그대로 반영
+            all_events, complete = crawl_calendar_http(site_config, months_to_collect), True
+        else:
+            all_events, complete = crawl_calendar_browser(site_config, months_to_collect)
     except Exception as e:
         print(f"   [Error] 크롤링 중 치명적 오류: {e}")
-    finally:
-        try:
-            driver.quit()
-        except:
-            pass
+        all_events, complete = [], False
 
-    print(f"   ✅ 수집 완료: 총 {len(all_events)}건")
-    return all_events
+    if complete:
+        print(f"   ✅ 수집 완료: 총 {len(all_events)}건")
+    else:
+        print(f"   ⚠️ 수집 중단: {len(all_events)}건까지 수집 (업로드 생략)")
+    return all_events, complete
 
 
 # =====================================================
@@ -155,72 +284,48 @@ def group_events_by_month(events, site_name):
 
 
 # =====================================================
-# 3. 개별 파일 단위 업데이트
+# 3. 개별 파일 단위 업데이트 (공용 업로드 엔진 사용)
 # =====================================================
-def upload_single_chunk(filename: str, content: str, store_name: str) -> tuple[str, bool, str]:
-    temp_file = None
-    try:
-        # 임시 파일 생성
-        with tempfile.NamedTemporaryFile(mode='w', encoding='utf-8', suffix='.md', delete=False) as f:
-            f.write(content)
-            temp_file = f.name
+# genai 클라이언트/업로드 엔진은 처음 쓸 때 생성 (수집만 할 때는 API 키가 필요 없음)
+_engine: UploadEngine | None = None
 
-        # 업로드
-        op = client.file_search_stores.upload_to_file_search_store(
-            file=temp_file,
-            file_search_store_name=store_name,
-            config={"display_name": filename, "mime_type": "text/markdown"}
-        )
 
-        while not op.done:
-            time.sleep(1)
-            op = client.operations.get(op)
-
-        return (filename, True, "")
-
-    except Exception as e:
-        return (filename, False, str(e))
-
-    finally:
-        if temp_file and os.path.exists(temp_file):
-            try:
-                os.unlink(temp_file)
-            except:
-                pass
+def get_engine() -> UploadEngine:
+    global _engine
+    if _engine is None:
+        _engine = UploadEngine(genai.Client(api_key=config_data.GOOGLE_API_KEY), **config_data.UPLOAD_ENGINE)
+    return _engine
 
 
 def update_specific_files(store_name: str, chunks: list[tuple[str, str]]):
     """
     chunks: [(filename, content), ...]
+    새 버전을 먼저 올리고, 업로드에 성공한 파일만 기존 문서를 삭제
     """
     if not chunks:
         return
 
     print(f"\n🔄 [Store Update] {len(chunks)}개 월별 파일 갱신 시작...")
 
-    pager = client.file_search_stores.documents.list(parent=store_name)
-    existing_docs = {d.display_name: d.name for d in pager}
-
-    for filename, content in chunks:
-        # 기존 파일 있으면 삭제
-        if filename in existing_docs:
-            doc_id = existing_docs[filename]
-            print(f"   🗑️ 교체 중 (기존 삭제): {filename}")
-            try:
-                client.file_search_stores.documents.delete(
-                    name=doc_id, config={"force": True}
-                )
-                time.sleep(1)
-            except Exception as e:
-                print(f"      ㄴ 삭제 실패: {e}")
-
-        # 새 파일 업로드
-        print(f"   📤 업로드: {filename}")
-        d_name, ok, msg = upload_single_chunk(filename, content, store_name)
-        if ok:
-            print(f"      ✅ 완료")
-        else:
-            print(f"      ❌ 실패: {msg}")
+    engine = get_engine()
+    pager = engine.client.file_search_stores.documents.list(parent=store_name)
+    existing_docs: dict[str, list[str]] = {}
+    for d in pager:
+        existing_docs.setdefault(d.display_name, []).append(d.name)
+
+    results = engine.upload_chunks(chunks, store_name, indent="   ")
+
+    replaced = [
+        doc_id
+        for filename, result in results.items() if result["success"]
+        for doc_id in existing_docs.get(filename, [])
+    ]
+    if replaced:
+        print(f"   🗑️ 이전 버전 {len(replaced)}개 삭제 중...")
+        engine.delete_documents(replaced)
+
+    # 챗봇 답변 캐시 무효화 (스토어 버전 갱신)
+    bump_store_version(store_name)
 
 
 # =====================================================
@@ -231,6 +336,8 @@ def run_calendar_pipeline(auto_mode=None):
 
     print(f"=== 📅 Monthly Calendar Update ===")
     print(f"[✔] Target Store: {store_name}\n")
+    engine = get_engine()
+    engine.reset_metrics()
 
     if auto_mode:
         print(f"🤖 자동 모드(스케줄러)로 실행합니다: 옵션 {auto_mode}")
@@ -247,11 +354,18 @@ def run_calendar_pipeline(auto_mode=None):
         print("[❌] 설정 없음")
         return
 
-    for site_conf in calendars:
-        # 1. 크롤링 (Headless 모드로 실행됨)
-        events = crawl_calendar_site(site_conf, months_override=override_months)
+    # 1. 크롤링 (브라우저 풀 크기만큼 사이트 동시 수집, 브라우저는 사이트 간 재사용)
+    try:
+        with ThreadPoolExecutor(max_workers=browser_pool.size) as pool:
+            crawled = list(pool.map(lambda conf: crawl_calendar_site(conf, months_override=override_months), calendars))
+    finally:
+        browser_pool.close()
 
-        if events:
+    for site_conf, (events, complete) in zip(calendars, crawled):
+        if not complete:
+            # 중간에 실패한 달의 행이 일부만 있을 수 있으므로 스토어의 기존 데이터를 덮어쓰지 않음
+            print(f"   ⚠️ [{site_conf.get('site_name', 'Unknown')}] 수집이 중간에 실패해 업로드 생략 (기존 데이터 유지)")
+        elif events:
             # 2. 월별 데이터를 메모리에서 그룹핑
             chunks = group_events_by_month(events, site_conf.get("site_name", "Unknown"))
 
@@ -261,6 +375,7 @@ def run_calendar_pipeline(auto_mode=None):
             print(f"   ⚠️ 데이터 없음")
 
     print("\n🎉 캘린더 업데이트 완료!")
+    print(f"   업로드: {engine.report()}")
 
 
 if __name__ == "__main__":
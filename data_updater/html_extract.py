@@ -0,0 +1,314 @@
+import re
+import json
+
+import lxml.html
+from bs4 import BeautifulSoup
+
+
+# =========================================
+# 본문 추출 엔진 (web_updater.extract_content에서 사용)
+# =========================================
+# extract_text(html, config_item) → (title, 정제된 본문 줄 목록)
+# - lxml로 파싱하고 content_selector 영역만 한 번 순회하면서 바로 줄 단위 출력 생성
+#   (잡동사니/제거 selector 요소는 지우지 않고 순회에서 건너뜀, 표는 만나는 자리에서 JSON 줄로 출력)
+# - selector가 단순 형태(tag/.class/#id 조합과 자손·자식 결합자)가 아니거나 파싱에 실패하면 BeautifulSoup 경로 사용
+# 두 경로의 출력은 같아야 한다 (bench_extract로 확인).
+
+JUNK_TAGS = {"script", "style", "nav", "footer", "header", "iframe", "noscript", "form", "link", "meta"}
+
+DEFAULT_REMOVE_SELECTORS = [".list_btn", ".btn_area", ".sns_share", ".prev_next", ".file_area", ".view_nav"]
+
+SKIP_LINES = {"본문으로 바로가기", "TOP", "List", "글자크기", "SNS공유", "인쇄", "닫기", "목록"}
+SKIP_PREFIXES = ("작성자", "작성일", "조회수")
+
+
+def _clean_lines(lines: list[str], text: str):
+    """text를 줄 단위로 정제해서 lines에 추가"""
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line in SKIP_LINES or line.startswith(SKIP_PREFIXES):
+            continue
+        lines.append(line)
+
+
+def _table_lines(tbl_dict: dict) -> list[str]:
+    """표 JSON을 본문 줄로 (기존 출력과 같도록 indent=2 후 줄별 strip)"""
+    lines = ["[TABLE]"]
+    _clean_lines(lines, json.dumps(tbl_dict, ensure_ascii=False, indent=2))
+    return lines
+
+
+# =========================================
+# 1. 단순 CSS selector → XPath
+# =========================================
+_COMPOUND = re.compile(r"^(?P<tag>[a-zA-Z][\w-]*|\*)?(?P<rest>(?:[.#][\w-]+)*)$")
+
+
+def css_to_xpath(selector: str) -> str | None:
+    """
+    tag / .class / #id 조합과 자손(공백)·자식(>) 결합자만 지원, 그 외에는 None
+    Returns: 문맥 노드 기준 XPath (descendant::...)
+    """
+    tokens = selector.replace(">", " > ").split()
+    if not tokens or tokens[0] == ">" or tokens[-1] == ">":
+        return None
+
+    parts = []
+    axis = "descendant::"
+    for token in tokens:
+        if token == ">":
+            if axis == "child::":
+                return None
+            axis = "child::"
+            continue
+
+        m = _COMPOUND.match(token)
+        if not m or (not m.group("tag") and not m.group("rest")):
+            return None
+
+        conditions = []
+        for kind, name in re.findall(r"([.#])([\w-]+)", m.group("rest")):
+            if kind == ".":
+                conditions.append(f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')")
+            else:
+                conditions.append(f"@id='{name}'")
+
+        step = axis + (m.group("tag") or "*").lower()
+        if conditions:
+            step += "[" + " and ".join(conditions) + "]"
+        parts.append(step)
+        axis = "descendant::"
+
+    return "/".join(parts)
+
+
+# =========================================
+# 2. lxml 경로
+# =========================================
+def _is_element(node) -> bool:
+    return isinstance(node.tag, str)
+
+
+def _strings(el, skip: set):
+    """BeautifulSoup get_text와 같은 순서로 텍스트 노드 나열 (주석/건너뛸 요소 제외, tail은 포함)"""
+    if el.text and _is_element(el):
+        yield el.text
+    for child in el:
+        if _is_element(child) and child.tag not in JUNK_TAGS and child not in skip:
+            yield from _strings(child, skip)
+        if child.tail:
+            yield child.tail
+
+
+def _inside(el, skip: set) -> bool:
+    while el is not None:
+        if el.tag in JUNK_TAGS or el in skip:
+            return True
+        el = el.getparent()
+    return False
+
+
+def _first_visible(root, xpath: str, skip: set):
+    for el in root.xpath(xpath):
+        if not _inside(el, skip):
+            return el
+    return None
+
+
+def _cell_text(el, skip: set) -> str:
+    # get_text(strip=True)와 동일
+    return "".join(s.strip() for s in _strings(el, skip) if s.strip())
+
+
+def _table_to_dict(table, skip: set) -> dict:
+    """web_updater.table_to_structured_data와 같은 규칙 (lxml 요소용)"""
+    headers = [_cell_text(th, skip) for th in table.iterdescendants("th")]
+
+    trs = list(table.iterdescendants("tr"))
+    if not headers and trs:
+        headers = [_cell_text(td, skip) for td in trs[0].iterdescendants("td")]
+
+    start_idx = 0
+    if next(table.iterdescendants("thead"), None) is not None or \
+            (trs and next(trs[0].iterdescendants("th"), None) is not None):
+        start_idx = 1
+
+    rows = []
+    for tr in trs[start_idx:]:
+        row = {}
+        for i, td in enumerate(tr.iterdescendants("td", "th")):
+            key = headers[i] if i < len(headers) else f"col_{i}"
+            row[key] = _cell_text(td, skip).replace("\n", " ")
+        if row:
+            rows.append(row)
+
+    return {"headers": headers, "rows": rows}
+
+
+def _walk(el, skip: set, lines: list[str]):
+    if el.text and _is_element(el):
+        _clean_lines(lines, el.text)
+    for child in el:
+        if _is_element(child) and child.tag not in JUNK_TAGS and child not in skip:
+            if child.tag == "table":
+                tbl_dict = _table_to_dict(child, skip)
+                if tbl_dict["headers"] or tbl_dict["rows"]:
+                    lines.extend(_table_lines(tbl_dict))
+            else:
+                _walk(child, skip, lines)
+        if child.tail:
+            _clean_lines(lines, child.tail)
+
+
+def extract_text_lxml(html: str, config_item: dict | None = None) -> tuple[str, list[str]] | None:
+    """Returns: (title, lines) / selector를 지원하지 못하면 None (BeautifulSoup 경로로)"""
+    config_item = config_item or {}
+    selector = config_item.get("content_selector")
+    removes = list(config_item.get("remove_selectors", [])) + DEFAULT_REMOVE_SELECTORS
+
+    xpaths = [css_to_xpath(sel) for sel in ([selector] if selector else []) + removes]
+    if None in xpaths:
+        return None
+
+    try:
+        root = lxml.html.document_fromstring(html)
+    except Exception:
+        return None
+
+    target = root
+    if selector:
+        found = _first_visible(root, xpaths.pop(0), set())
+        if found is not None:
+            target = found
+
+    # 제거 selector는 본문 영역 안에서만 (순회 때 건너뜀)
+    skip = set()
+    for xpath in xpaths:
+        skip.update(target.xpath(xpath))
+
+    lines: list[str] = []
+    _walk(target, skip, lines)
+
+    # 제목 추출
+    title = "No Title"
+    for xpath in (css_to_xpath(".subject"), "descendant::h3"):
+        found = _first_visible(root, xpath, skip)
+        if found is not None:
+            title = "".join(_strings(found, skip)).strip()
+            break
+    else:
+        found = next(root.iter("title"), None)
+        if found is not None:
+            title = "".join(_strings(found, skip)).strip()
+
+    return title, lines
+
+
+# =========================================
+# 3. BeautifulSoup 경로 (기존 방식)
+# =========================================
+def table_to_structured_data(table_soup):
+    """HTML 표를 JSON 구조(헤더 + 행 리스트)로 변환"""
+    headers = [th.get_text(strip=True) for th in table_soup.find_all("th")]
+
+    if not headers:
+        first_tr = table_soup.find("tr")
+        if first_tr:
+            headers = [td.get_text(strip=True) for td in first_tr.find_all("td")]
+
+    rows = []
+    trs = table_soup.find_all("tr")
+
+    start_idx = 0
+    if table_soup.find("thead") or (trs and trs[0].find("th")):
+        start_idx = 1
+
+    for tr in trs[start_idx:]:
+        tds = tr.find_all(["td", "th"])
+        if not tds:
+            continue
+
+        row = {}
+        for i, td in enumerate(tds):
+            if i < len(headers):
+                key = headers[i]
+            else:
+                key = f"col_{i}"
+
+            cell_text = td.get_text(strip=True).replace("\n", " ")
+            row[key] = cell_text
+
+        if row:
+            rows.append(row)
+
+    return {"headers": headers, "rows": rows}
+
+
+def extract_text_bs4(html: str, config_item: dict | None = None) -> tuple[str, list[str]]:
+    soup = BeautifulSoup(html, "html.parser")
+
+    # 글로벌 잡동사니 제거
+    for tag in soup(list(JUNK_TAGS)):
+        tag.decompose()
+
+    target_element = soup
+
+    # 특정 영역 선택 + 제거 selector 적용
+    if config_item:
+        selector = config_item.get("content_selector")
+        if selector:
+            found = soup.select_one(selector)
+            if found:
+                target_element = found
+
+        removes = list(config_item.get("remove_selectors", []))
+        removes.extend(DEFAULT_REMOVE_SELECTORS)
+        for rm_sel in removes:
+            for tag in target_element.select(rm_sel):
+                tag.decompose()
+
+    # 표(Table)를 JSON 문자열로 변환하여 본문에 심기
+    tables_to_inject: list[tuple[str, str]] = []
+
+    for idx, table in enumerate(target_element.find_all("table")):
+        placeholder = f"___TABLE_JSON_INJECT_{idx}___"
+        try:
+            tbl_dict = table_to_structured_data(table)
+
+            if not tbl_dict['headers'] and not tbl_dict['rows']:
+                table.decompose()
+                continue
+
+            json_str = json.dumps(tbl_dict, ensure_ascii=False, indent=2)
+            formatted_table_str = f"\n\n[TABLE]\n{json_str}\n\n"
+
+            tables_to_inject.append((placeholder, formatted_table_str))
+            table.replace_with(soup.new_string(placeholder))
+
+        except Exception:
+            pass
+
+    # 제목 추출
+    title = "No Title"
+    if soup.select_one(".subject"):
+        title = soup.select_one(".subject").get_text().strip()
+    elif soup.select_one("h3"):
+        title = soup.select_one("h3").get_text().strip()
+    elif soup.title:
+        title = soup.title.get_text().strip()
+
+    # 텍스트 추출 (Placeholder 포함된 상태)
+    text = target_element.get_text(separator="\n")
+
+    # Placeholder를 실제 JSON 문자열로 치환
+    for placeholder, json_str in tables_to_inject:
+        text = text.replace(placeholder, json_str)
+
+    lines: list[str] = []
+    _clean_lines(lines, text)
+    return title, lines
+
+
+def extract_text(html: str, config_item: dict | None = None) -> tuple[str, list[str]]:
+    """Returns: (title, 정제된 본문 줄 목록)"""
+    return extract_text_lxml(html, config_item) or extract_text_bs4(html, config_item)
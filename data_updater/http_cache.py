@@ -0,0 +1,122 @@
+import zlib
+import hashlib
+import threading
+
+from app.db import db_connection, db_transaction
+
+
+# =========================================
+# HTTP 조건부 요청 캐시 (SQLite)
+# =========================================
+# URL별로 ETag / Last-Modified / 본문 해시와 본문(압축)을 저장해 두고,
+# 다음 요청에 If-None-Match / If-Modified-Since를 붙인다.
+# 304 응답이거나 본문 해시가 같으면 "변경 없음"으로 보고 호출 측에서 파싱·청킹·업로드를 생략한다.
+#
+# 새로 받은 응답은 바로 저장하지 않고 대기(pending)시켰다가, 스토어 동기화가 성공한 뒤
+# commit() 해야 기록된다. 업로드가 실패한 데이터가 다음 실행에서 "변경 없음"으로 건너뛰어지지 않도록.
+def init_http_cache():
+    with db_transaction() as conn:
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS http_cache (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body_hash TEXT NOT NULL,
+                content_type TEXT,
+                body BLOB,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+
+
+class HttpCache:
+    def __init__(self):
+        self._pending: dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def _load(self, key: str):
+        with db_connection() as conn:
+            return conn.execute(
+                'SELECT etag, last_modified, body_hash, content_type, body FROM http_cache WHERE url = ?',
+                (key,)
+            ).fetchone()
+
+    def conditional_headers(self, key: str) -> dict:
+        """저장된 검증자(ETag/Last-Modified)로 조건부 요청 헤더 생성"""
+        row = self._load(key)
+        headers = {}
+        if row:
+            etag, last_modified = row[0], row[1]
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def resolve(self, key: str, res, text: str | None = None, content: bytes | None = None) -> dict | None:
+        """
+        응답(200/304)을 캐시와 대조
+
+        res: requests.Response (conditional_headers로 보낸 요청의 응답)
+        text: 디코딩한 본문 (200일 때, 생략하면 res.text)
+        content: 원본 바이트 (stream=True로 이미 읽은 경우, 생략하면 res.content)
+
+        Returns: {"text", "content_type", "changed"} / 304인데 캐시가 없으면 None
+        """
+        row = self._load(key)
+
+        if res.status_code == 304:
+            if not row:
+                return None
+            _, _, _, content_type, body = row
+            return {
+                "text": zlib.decompress(body).decode("utf-8") if body else "",
+                "content_type": content_type or "",
+                "changed": False,
+            }
+
+        text = res.text if text is None else text
+        body_hash = hashlib.sha256(res.content if content is None else content).hexdigest()
+        content_type = res.headers.get("Content-Type", "")
+
+        with self._lock:
+            self._pending[key] = (
+                res.headers.get("ETag"),
+                res.headers.get("Last-Modified"),
+                body_hash,
+                content_type,
+                zlib.compress(text.encode("utf-8")),
+            )
+
+        return {
+            "text": text,
+            "content_type": content_type,
+            "changed": row is None or row[2] != body_hash,
+        }
+
+    def commit(self, keys: list[str] | None = None):
+        """대기 중인 응답을 캐시에 기록 (keys 생략 시 전부)"""
+        with self._lock:
+            keys = list(self._pending) if keys is None else [k for k in keys if k in self._pending]
+            entries = [(k, *self._pending.pop(k)) for k in keys]
+
+        if not entries:
+            return
+        with db_transaction() as conn:
+            conn.executemany('''
+                INSERT OR REPLACE INTO http_cache
+                (url, etag, last_modified, body_hash, content_type, body, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            ''', entries)
+
+    def discard(self, keys: list[str] | None = None):
+        """동기화 실패 시 대기 중인 응답 버림 (다음 실행에서 다시 변경으로 처리)"""
+        with self._lock:
+            if keys is None:
+                self._pending.clear()
+            else:
+                for k in keys:
+                    self._pending.pop(k, None)
+
+
+init_http_cache()
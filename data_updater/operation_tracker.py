@@ -0,0 +1,173 @@
+import time
+import threading
+from concurrent.futures import Future
+
+
+# =========================================
+# 장기 실행 작업(Operation) 추적기
+# =========================================
+# 업로드마다 스레드 하나가 1초 간격으로 폴링하던 방식 대신,
+# 백그라운드 스레드 하나가 대기 중인 모든 작업을 돌아가며 폴링한다.
+# 작업별로 폴링 간격을 지수적으로 늘리고(backoff), 마감 시간이 지나면 타임아웃 처리한다.
+class OperationTracker:
+    def __init__(self, client, initial_interval: float = 1.0, max_interval: float = 15.0,
+                 backoff: float = 1.5, timeout: float = 600.0):
+        """
+        client: genai.Client (client.operations.get 사용)
+        initial_interval: 첫 폴링까지 대기 시간 (초)
+        max_interval: 폴링 간격 상한 (초)
+        backoff: 폴링할 때마다 간격에 곱할 배수
+        timeout: 기본 마감 시간 (초, track 호출 시 변경 가능)
+        """
+        self.client = client
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.timeout = timeout
+
+        self._pending: dict[int, dict] = {}
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._next_id = 0
+
+        self._stats = {"completed": 0, "failed": 0, "timeouts": 0, "polls": 0, "latencies": []}
+
+    def track(self, op, label: str, timeout: float | None = None, started_at: float | None = None) -> Future:
+        """
+        작업을 추적 목록에 추가
+
+        Returns: Future → {"label", "success", "error", "document_name", "latency", "polls"}
+        """
+        now = time.monotonic()
+        entry = {
+            "op": op,
+            "label": label,
+            "future": Future(),
+            "started_at": started_at if started_at is not None else now,
+            "deadline": now + (timeout if timeout is not None else self.timeout),
+            "interval": self.initial_interval,
+            "next_poll": now + self.initial_interval,
+            "polls": 0,
+        }
+
+        if op.done:
+            self._finish(entry, op)
+            return entry["future"]
+
+        with self._cond:
+            self._next_id += 1
+            self._pending[self._next_id] = entry
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="operation-tracker", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+        return entry["future"]
+
+    def pending_count(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._pending:
+                    self._thread = None
+                    return
+
+                now = time.monotonic()
+                due = [(key, e) for key, e in self._pending.items() if e["next_poll"] <= now]
+                if not due:
+                    wait = min(e["next_poll"] for e in self._pending.values()) - now
+                    self._cond.wait(timeout=max(wait, 0.01))
+                    continue
+
+                for key, _ in due:
+                    del self._pending[key]
+
+            # 폴링은 잠금 밖에서 (그동안 새 작업 추가 가능)
+            requeue = []
+            for key, entry in due:
+                if self._poll(entry):
+                    requeue.append((key, entry))
+
+            if requeue:
+                with self._cond:
+                    self._pending.update(requeue)
+
+    def _poll(self, entry: dict) -> bool:
+        """작업 상태를 한 번 조회, 아직 진행 중이면 True (다시 대기열로)"""
+        now = time.monotonic()
+        entry["polls"] += 1
+        with self._cond:
+            self._stats["polls"] += 1
+
+        try:
+            op = self.client.operations.get(entry["op"])
+            entry["op"] = op
+        except Exception as e:
+            # 일시적인 조회 실패는 마감 전까지 다음 폴링에서 다시 시도
+            if now >= entry["deadline"]:
+                self._finish(entry, None, error=f"상태 조회 실패: {e}")
+                return False
+            op = None
+
+        if op is not None and op.done:
+            self._finish(entry, op)
+            return False
+
+        if now >= entry["deadline"]:
+            timeout = entry["deadline"] - entry["started_at"]
+            self._finish(entry, None, error=f"타임아웃 ({timeout:.0f}초)", timed_out=True)
+            return False
+
+        entry["interval"] = min(entry["interval"] * self.backoff, self.max_interval)
+        entry["next_poll"] = min(now + entry["interval"], entry["deadline"])
+        return True
+
+    def _finish(self, entry: dict, op, error: str | None = None, timed_out: bool = False):
+        latency = time.monotonic() - entry["started_at"]
+
+        if error is None and getattr(op, "error", None):
+            error = str(op.error)
+
+        document_name = None
+        if error is None:
+            response = getattr(op, "response", None)
+            document_name = getattr(response, "document_name", None) if response else None
+
+        with self._cond:
+            if error is None:
+                self._stats["completed"] += 1
+                self._stats["latencies"].append(latency)
+            else:
+                self._stats["failed"] += 1
+                if timed_out:
+                    self._stats["timeouts"] += 1
+
+        entry["future"].set_result({
+            "label": entry["label"],
+            "success": error is None,
+            "error": error or "",
+            "document_name": document_name,
+            "latency": latency,
+            "polls": entry["polls"],
+        })
+
+    def stats(self) -> dict:
+        with self._cond:
+            latencies = sorted(self._stats["latencies"])
+            stats = {k: v for k, v in self._stats.items() if k != "latencies"}
+
+        if latencies:
+            stats["latency_avg"] = sum(latencies) / len(latencies)
+            stats["latency_p50"] = latencies[len(latencies) // 2]
+            stats["latency_max"] = latencies[-1]
+        return stats
+
+    def summary(self) -> str:
+        s = self.stats()
+        text = f"완료 {s['completed']} / 실패 {s['failed']} (타임아웃 {s['timeouts']}) / 폴링 {s['polls']}회"
+        if "latency_avg" in s:
+            text += f" / 지연 평균 {s['latency_avg']:.1f}s, 중앙값 {s['latency_p50']:.1f}s, 최대 {s['latency_max']:.1f}s"
+        return text
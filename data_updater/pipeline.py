@@ -0,0 +1,98 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+# =========================================
+# 단계별 파이프라인 실행기
+# =========================================
+# 항목들을 여러 단계(stage)에 흘려보낸다. 단계마다 스레드 풀(작업자 수 제한)이 있고,
+# 앞 단계가 끝난 항목은 다른 항목을 기다리지 않고 바로 다음 단계에 투입된다.
+# 예) API 수집(동시 4) → 파싱/청킹(1) → 스토어 동기화(1): 한 API를 업로드하는 동안 다른 API를 받는다.
+#
+# - 단계 함수가 None을 반환하면 그 항목은 거기서 끝 (실패/변경 없음 등은 단계 함수가 직접 기록)
+# - 단계 함수에서 예외가 나면 errors에 (단계, 항목, 예외)로 남기고 그 항목은 중단
+# - report(): 단계별 처리 수, 작업 시간(합계/평균/최대), 대기 시간, 구간(첫 시작~마지막 종료)
+class StagedPipeline:
+    def __init__(self, stages: list[tuple[str, object, int]]):
+        """
+        stages: [(단계 이름, 함수(item) → 다음 단계 입력 또는 None, 작업자 수), ...]
+        """
+        self.stages = stages
+        self.errors: list[tuple[str, object, Exception]] = []
+        self._cond = threading.Condition()
+        self._pending = 0
+        self._started_at = 0.0
+        self._finished_at = 0.0
+        self._stats = {name: self._new_stat() for name, _, _ in stages}
+
+    @staticmethod
+    def _new_stat() -> dict:
+        return {"count": 0, "busy": 0.0, "max": 0.0, "wait": 0.0, "first": None, "last": None}
+
+    def _record(self, name: str, queued_at: float, started: float, ended: float):
+        with self._cond:
+            stat = self._stats[name]
+            stat["count"] += 1
+            stat["busy"] += ended - started
+            stat["max"] = max(stat["max"], ended - started)
+            stat["wait"] += started - queued_at
+            stat["first"] = started if stat["first"] is None else min(stat["first"], started)
+            stat["last"] = ended if stat["last"] is None else max(stat["last"], ended)
+
+    def _submit(self, pools: list, idx: int, item):
+        with self._cond:
+            self._pending += 1
+        pools[idx].submit(self._run_stage, pools, idx, item, time.monotonic())
+
+    def _run_stage(self, pools: list, idx: int, item, queued_at: float):
+        name, fn, _ = self.stages[idx]
+        started = time.monotonic()
+        try:
+            result = fn(item)
+        except Exception as e:
+            self.errors.append((name, item, e))
+            result = None
+        self._record(name, queued_at, started, time.monotonic())
+
+        # 다음 단계 투입을 먼저 하고 pending을 줄여야 run()이 일찍 끝나지 않음
+        if result is not None and idx + 1 < len(self.stages):
+            self._submit(pools, idx + 1, result)
+
+        with self._cond:
+            self._pending -= 1
+            if self._pending == 0:
+                self._cond.notify_all()
+
+    def run(self, items: list):
+        self._started_at = time.monotonic()
+        pools = [
+            ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix=f"stage-{name}")
+            for name, _, workers in self.stages
+        ]
+        try:
+            for item in items:
+                self._submit(pools, 0, item)
+            with self._cond:
+                while self._pending:
+                    self._cond.wait()
+        finally:
+            for pool in pools:
+                pool.shutdown(wait=True)
+            self._finished_at = time.monotonic()
+
+    def report(self) -> str:
+        elapsed = max(self._finished_at - self._started_at, 1e-6)
+        lines = [f"전체 {elapsed:.1f}s"]
+        for name, _, workers in self.stages:
+            stat = self._stats[name]
+            if not stat["count"]:
+                lines.append(f"  - {name} (x{workers}): 0건")
+                continue
+            span = stat["last"] - stat["first"]
+            lines.append(
+                f"  - {name} (x{workers}): {stat['count']}건 · 작업 {stat['busy']:.1f}s "
+                f"(평균 {stat['busy'] / stat['count']:.2f}s, 최대 {stat['max']:.2f}s) · "
+                f"대기 {stat['wait']:.1f}s · 구간 {span:.1f}s ({span / elapsed:.0%})"
+            )
+        return "\n".join(lines)
@@ -0,0 +1,215 @@
+import json
+import zlib
+import hashlib
+
+from app.db import db_connection, db_transaction
+
+
+# =========================================
+# 1. 업로드 매니페스트 (SQLite)
+# =========================================
+# 스토어에 올린 파트 파일별 콘텐츠 해시를 기록해 두고,
+# 다음 실행 때 바뀐/새로 생긴/사라진 파트만 업로드·삭제한다.
+def init_manifest():
+    with db_transaction() as conn:
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS upload_manifest (
+                store_name TEXT NOT NULL,
+                filename TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                document_name TEXT,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (store_name, filename)
+            )
+        ''')
+
+        # api_updater 레코드 → 파트 배정 인덱스 (레코드가 추가돼도 기존 파트 구성이 유지되도록)
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS record_index (
+                store_name TEXT NOT NULL,
+                source TEXT NOT NULL,
+                record_id TEXT NOT NULL,
+                part_num INTEGER NOT NULL,
+                record_hash TEXT NOT NULL,
+                PRIMARY KEY (store_name, source, record_id)
+            )
+        ''')
+
+        # web_updater 게시글 인덱스 (이미 본 글 판별 + 파트 배정 + 파트 재생성용 본문)
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS article_index (
+                store_name TEXT NOT NULL,
+                source TEXT NOT NULL,
+                url TEXT NOT NULL,
+                part_num INTEGER NOT NULL,
+                content_hash TEXT NOT NULL,
+                title TEXT,
+                body BLOB,
+                first_seen TEXT,
+                last_changed TEXT,
+                PRIMARY KEY (store_name, source, url)
+            )
+        ''')
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def load_manifest(store_name: str, prefix: str) -> dict[str, tuple[str, str | None]]:
+    """
+    Returns: {filename: (content_hash, document_name)} (filename이 prefix로 시작하는 항목)
+    """
+    with db_connection() as conn:
+        rows = conn.execute('''
+            SELECT filename, content_hash, document_name FROM upload_manifest
+            WHERE store_name = ? AND substr(filename, 1, ?) = ?
+        ''', (store_name, len(prefix), prefix)).fetchall()
+    return {filename: (h, doc_name) for filename, h, doc_name in rows}
+
+
+def record_uploads(store_name: str, entries: list[tuple[str, str, str | None]]):
+    """
+    entries: [(filename, content_hash, document_name), ...]
+    """
+    if not entries:
+        return
+    with db_transaction() as conn:
+        conn.executemany('''
+            INSERT OR REPLACE INTO upload_manifest
+            (store_name, filename, content_hash, document_name, updated_at)
+            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+        ''', [(store_name, fn, h, doc_name) for fn, h, doc_name in entries])
+
+
+def remove_entries(store_name: str, filenames: list[str]):
+    if not filenames:
+        return
+    with db_transaction() as conn:
+        conn.executemany(
+            'DELETE FROM upload_manifest WHERE store_name = ? AND filename = ?',
+            [(store_name, fn) for fn in filenames]
+        )
+
+
+def load_record_index(store_name: str, source: str) -> dict[str, tuple[int, str]]:
+    """
+    Returns: {record_id: (part_num, record_hash)}
+    """
+    with db_connection() as conn:
+        rows = conn.execute('''
+            SELECT record_id, part_num, record_hash FROM record_index
+            WHERE store_name = ? AND source = ?
+        ''', (store_name, source)).fetchall()
+    return {rid: (part, h) for rid, part, h in rows}
+
+
+def save_record_index(store_name: str, source: str, entries: dict[str, tuple[int, str]]):
+    """
+    entries: {record_id: (part_num, record_hash)} - source의 인덱스를 통째로 교체
+    """
+    with db_transaction() as conn:
+        conn.execute('DELETE FROM record_index WHERE store_name = ? AND source = ?', (store_name, source))
+        conn.executemany('''
+            INSERT INTO record_index (store_name, source, record_id, part_num, record_hash)
+            VALUES (?, ?, ?, ?, ?)
+        ''', [(store_name, source, rid, part, h) for rid, (part, h) in entries.items()])
+
+
+def load_article_index(store_name: str, source: str) -> dict[str, dict]:
+    """
+    Returns: {url: {"part_num", "content_hash", "title", "chunks", "first_seen", "last_changed"}}
+    """
+    with db_connection() as conn:
+        rows = conn.execute('''
+            SELECT url, part_num, content_hash, title, body, first_seen, last_changed FROM article_index
+            WHERE store_name = ? AND source = ?
+        ''', (store_name, source)).fetchall()
+    return {
+        url: {
+            "part_num": part,
+            "content_hash": h,
+            "title": title,
+            "chunks": json.loads(zlib.decompress(body)) if body else [],
+            "first_seen": first_seen,
+            "last_changed": last_changed,
+        }
+        for url, part, h, title, body, first_seen, last_changed in rows
+    }
+
+
+def save_articles(store_name: str, source: str, entries: dict[str, dict]):
+    """
+    entries: {url: load_article_index와 같은 형식} - 새 글/수정된 글만 추가·갱신
+    """
+    if not entries:
+        return
+    with db_transaction() as conn:
+        conn.executemany('''
+            INSERT OR REPLACE INTO article_index
+            (store_name, source, url, part_num, content_hash, title, body, first_seen, last_changed)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', [
+            (store_name, source, url, e["part_num"], e["content_hash"], e["title"],
+             zlib.compress(json.dumps(e["chunks"], ensure_ascii=False).encode("utf-8")),
+             e["first_seen"], e["last_changed"])
+            for url, e in entries.items()
+        ])
+
+
+# =========================================
+# 2. 동기화 계획
+# =========================================
+def plan_store_sync(store_name: str, chunks: list[tuple[str, str]], prefix: str,
+                    existing_docs: list[tuple[str, str]], normalize=None, keep_missing: bool = False) -> dict:
+    """
+    chunks: 이번 실행에서 생성한 [(filename, content), ...]
+    existing_docs: 스토어에 있는 [(display_name, document_name), ...] (prefix 일치 항목)
+    normalize: 해시 전에 content에 적용할 함수 (수집일처럼 매번 바뀌는 값 제거용)
+    keep_missing: True면 이번 실행에 없는 파트를 지우지 않음 (일부만 다시 만든 실행에서 기존 파트 보호)
+
+    Returns: {
+        "upload": [(filename, content, content_hash), ...]  # 새 파트 / 내용이 바뀐 파트
+        "replace": {filename: [document_name, ...]},        # 업로드 성공 후 지울 이전 버전
+        "delete": [document_name, ...],                     # 사라진 파트 / 중복 문서
+        "removed": [filename, ...],                         # 매니페스트에서 지울 파트
+        "unchanged": [filename, ...],
+    }
+    """
+    manifest = load_manifest(store_name, prefix)
+
+    docs_by_name: dict[str, list[str]] = {}
+    for display_name, doc_name in existing_docs:
+        docs_by_name.setdefault(display_name, []).append(doc_name)
+
+    plan = {"upload": [], "replace": {}, "delete": [], "removed": [], "unchanged": []}
+    new_names = set()
+
+    for filename, content in chunks:
+        new_names.add(filename)
+        h = content_hash(normalize(content) if normalize else content)
+        docs = docs_by_name.get(filename, [])
+        recorded = manifest.get(filename)
+
+        if recorded and recorded[0] == h and docs:
+            # 매니페스트에 기록된 문서가 남아 있으면 그대로 두고 나머지(중복)만 삭제
+            keep = recorded[1] if recorded[1] in docs else docs[0]
+            plan["delete"].extend(d for d in docs if d != keep)
+            plan["unchanged"].append(filename)
+        else:
+            plan["upload"].append((filename, content, h))
+            if docs:
+                plan["replace"][filename] = docs
+
+    # 이번 실행에 없는 파트 (예: 데이터가 줄어 part 수가 감소)
+    if keep_missing:
+        return plan
+    for display_name, docs in docs_by_name.items():
+        if display_name not in new_names:
+            plan["delete"].extend(docs)
+    plan["removed"] = [fn for fn in manifest if fn not in new_names]
+
+    return plan
+
+
+init_manifest()
@@ -0,0 +1,309 @@
+import io
+import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import httpx
+from google.genai import errors as genai_errors
+
+from data_updater.operation_tracker import OperationTracker
+
+
+# =========================================
+# 1. 요청 속도 제한 (토큰 버킷)
+# =========================================
+class TokenBucket:
+    def __init__(self, rate_per_sec: float, burst: int):
+        """
+        rate_per_sec: 초당 채워지는 토큰 수 (= 평균 요청 속도)
+        burst: 버킷 크기 (순간적으로 몰아 보낼 수 있는 요청 수)
+        """
+        self.rate = rate_per_sec
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """토큰 하나를 얻을 때까지 대기"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if now >= self._paused_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait = max(self._paused_until - now, (1 - self._tokens) / self.rate)
+            time.sleep(wait)
+
+    def pause(self, seconds: float):
+        """쿼터 초과 응답을 받으면 모든 요청을 잠시 멈춤"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+
+
+# =========================================
+# 2. 적응형 동시성 제한 (AIMD)
+# =========================================
+class AdaptiveConcurrency:
+    def __init__(self, initial: int, minimum: int = 1, maximum: int = 16, increase_after: int = 10):
+        """
+        쓰로틀링(429/쿼터)을 받으면 동시 요청 수를 절반으로 줄이고,
+        increase_after번 연속 성공하면 1씩 늘린다.
+        """
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = min(max(initial, self.minimum), self.maximum)
+        self.increase_after = increase_after
+
+        self._active = 0
+        self._streak = 0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            while self._active >= self.limit:
+                self._cond.wait()
+            self._active += 1
+
+    def release(self, success: bool, throttled: bool = False):
+        with self._cond:
+            self._active -= 1
+            if throttled:
+                self.limit = max(self.minimum, self.limit // 2)
+                self._streak = 0
+            elif success:
+                self._streak += 1
+                if self._streak >= self.increase_after and self.limit < self.maximum:
+                    self.limit += 1
+                    self._streak = 0
+            self._cond.notify_all()
+
+
+# =========================================
+# 3. 오류 분류
+# =========================================
+RETRYABLE_STATUS_CODES = (408, 429, 500, 502, 503, 504)
+
+
+def is_throttled(e: Exception) -> bool:
+    code = getattr(e, "code", None)
+    status = str(getattr(e, "status", "") or "")
+    text = str(e).lower()
+    return code == 429 or status == "RESOURCE_EXHAUSTED" or "quota" in text or "rate limit" in text
+
+
+def is_retryable(e: Exception) -> bool:
+    if is_throttled(e):
+        return True
+    if isinstance(e, genai_errors.APIError):
+        return e.code in RETRYABLE_STATUS_CODES
+    return isinstance(e, (httpx.TransportError, ConnectionError, TimeoutError))
+
+
+# 요청이 서버에 닿기 전에 실패한 연결 단계 오류
+CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout, ConnectionRefusedError)
+
+
+def is_retryable_upload(e: Exception) -> bool:
+    """
+    업로드는 멱등이 아니므로 서버가 처리하지 않은 것이 확실한 오류만 재시도 (쓰로틀링, 연결 단계 실패)
+    5xx/타임아웃/응답 유실은 서버가 문서를 만들었을 수 있어 재시도하면 같은 display_name 문서가 중복됨
+    → 이번 실행은 실패로 두고, 다음 실행의 동기화가 남은 문서를 이전 버전으로 교체·삭제
+    """
+    return is_throttled(e) or isinstance(e, CONNECT_ERRORS)
+
+
+# =========================================
+# 4. 업로드 엔진
+# =========================================
+class UploadEngine:
+    """
+    FileSearchStore 업로드/삭제 공용 엔진 (api/web/calendar 업데이터 공용)
+    - 모든 요청은 토큰 버킷 + 적응형 동시성 제한을 거친다
+    - 재시도 가능한 오류는 지터를 넣은 지수 백오프로 재시도, 쓰로틀링이면 전체 속도를 낮춘다
+    - 인덱싱 완료 대기는 OperationTracker가 한 스레드에서 모아서 폴링
+    - 실행 단위 처리량 통계 (파일 수, 바이트, 초당 처리량, 재시도/쓰로틀링 횟수)
+    """
+
+    def __init__(self, client, rate_per_sec: float = 2.0, burst: int = 5, initial_concurrency: int = 5,
+                 min_concurrency: int = 1, max_concurrency: int = 10, max_retries: int = 5,
+                 base_delay: float = 1.0, max_delay: float = 60.0, timeout: float = 600):
+        self.client = client
+        self.bucket = TokenBucket(rate_per_sec, burst)
+        self.concurrency = AdaptiveConcurrency(initial_concurrency, min_concurrency, max_concurrency)
+        self.max_workers = max_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.timeout = timeout
+
+        self._metrics_lock = threading.Lock()
+        self.reset_metrics()
+
+    # ---------- 통계 ----------
+    def reset_metrics(self):
+        with self._metrics_lock:
+            self.metrics = {
+                "started_at": time.monotonic(),
+                "uploaded": 0,
+                "failed": 0,
+                "deleted": 0,
+                "bytes": 0,
+                "requests": 0,
+                "retries": 0,
+                "throttled": 0,
+                "latencies": [],
+            }
+
+    def _count(self, **increments):
+        with self._metrics_lock:
+            for key, value in increments.items():
+                self.metrics[key] += value
+
+    def report(self) -> str:
+        with self._metrics_lock:
+            m = dict(self.metrics)
+            latencies = sorted(m.pop("latencies"))
+
+        elapsed = max(time.monotonic() - m["started_at"], 1e-6)
+        text = (
+            f"업로드 {m['uploaded']} / 실패 {m['failed']} / 삭제 {m['deleted']} · "
+            f"{m['bytes'] / 1024:.0f}KB · {elapsed:.1f}s "
+            f"({m['uploaded'] / elapsed:.2f} files/s, {m['bytes'] / 1024 / elapsed:.1f} KB/s) · "
+            f"요청 {m['requests']} / 재시도 {m['retries']} / 쓰로틀링 {m['throttled']} · "
+            f"동시성 {self.concurrency.limit}"
+        )
+        if latencies:
+            text += f" · 인덱싱 지연 중앙값 {latencies[len(latencies) // 2]:.1f}s, 최대 {latencies[-1]:.1f}s"
+        return text
+
+    # ---------- 요청 실행 ----------
+    def call(self, fn, *args, retry_if=is_retryable, **kwargs):
+        """
+        속도/동시성 제한과 재시도를 적용해 API 요청 실행
+        retry_if: 예외 → 재시도 여부 (기본 is_retryable)
+        """
+        attempt = 0
+        while True:
+            self.bucket.acquire()
+            self.concurrency.acquire()
+            self._count(requests=1)
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                throttled = is_throttled(e)
+                self.concurrency.release(success=False, throttled=throttled)
+
+                if not retry_if(e) or attempt >= self.max_retries:
+                    raise
+
+                # full jitter: 0 ~ min(max_delay, base * 2^attempt)
+                delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+                if throttled:
+                    self._count(throttled=1)
+                    self.bucket.pause(delay)
+                self._count(retries=1)
+                attempt += 1
+                time.sleep(delay)
+                continue
+
+            self.concurrency.release(success=True)
+            return result
+
+    def _start_upload(self, filename: str, content: str, store_name: str, mime_type: str):
+        """메모리의 콘텐츠를 바로 업로드 요청 (임시 파일 없음), Returns: (operation, 시작 시각)"""
+        data = content.encode("utf-8")
+        started_at = time.monotonic()
+
+        # 재시도 때마다 처음부터 읽도록 시도마다 새 스트림 생성
+        op = self.call(
+            lambda: self.client.file_search_stores.upload_to_file_search_store(
+                file=io.BytesIO(data),
+                file_search_store_name=store_name,
+                config={"display_name": filename, "mime_type": mime_type},
+            ),
+            retry_if=is_retryable_upload,
+        )
+        return op, started_at
+
+    def upload_chunks(self, chunks: list[tuple[str, str]], store_name: str,
+                      mime_type: str = "text/markdown", indent: str = "     ") -> dict[str, dict]:
+        """
+        chunks: [(filename, content), ...]
+        Returns: {filename: {"success", "error", "document_name", "latency", "polls"}}
+        """
+        results: dict[str, dict] = {}
+        if not chunks:
+            return results
+
+        tracker = OperationTracker(self.client, timeout=self.timeout)
+        op_futures = []
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            future_to_chunk = {
+                executor.submit(self._start_upload, fname, content, store_name, mime_type): (fname, content)
+                for fname, content in chunks
+            }
+
+            for future in as_completed(future_to_chunk):
+                fname, content = future_to_chunk[future]
+                try:
+                    op, started_at = future.result()
+                except Exception as e:
+                    print(f"{indent}❌ {fname} - {e}")
+                    results[fname] = {"success": False, "error": str(e), "document_name": None, "latency": 0.0, "polls": 0}
+                    self._count(failed=1)
+                    continue
+                self._count(bytes=len(content.encode("utf-8")))
+                op_futures.append(tracker.track(op, fname, started_at=started_at))
+
+        for future in as_completed(op_futures):
+            result = future.result()
+            fname = result["label"]
+            results[fname] = result
+
+            if result["success"]:
+                print(f"{indent}✅ {fname} ({result['latency']:.1f}s)")
+                self._count(uploaded=1)
+                with self._metrics_lock:
+                    self.metrics["latencies"].append(result["latency"])
+            else:
+                print(f"{indent}❌ {fname} - {result['error']}")
+                self._count(failed=1)
+
+        ok = sum(1 for r in results.values() if r["success"])
+        print(f"{indent}→ 업로드 완료: 성공 {ok}/{len(chunks)} · 인덱싱 {tracker.summary()}")
+        return results
+
+    def delete_documents(self, doc_names: list[str]) -> int:
+        """문서 병렬 삭제 (속도 제한/재시도 적용), Returns: 삭제 성공 수"""
+        if not doc_names:
+            return 0
+
+        deleted = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(
+                    self.call,
+                    self.client.file_search_stores.documents.delete,
+                    name=d_id,
+                    config={"force": True},
+                ): d_id
+                for d_id in doc_names
+            }
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                    deleted += 1
+                except Exception as e:
+                    print(f"      ㄴ 삭제 실패 ({futures[future]}): {e}")
+
+        self._count(deleted=deleted)
+        return deleted
@@ -0,0 +1,212 @@
+import time
+import threading
+from contextlib import contextmanager
+from urllib.parse import urljoin, urlsplit
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import requests
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup
+
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120 Safari/537.36"
+    )
+}
+
+
+# =========================================
+# 1. 호스트별 동시 요청 제한 + 요청 간격 (politeness)
+# =========================================
+class HostLimiter:
+    def __init__(self, per_host: int, delay: float):
+        """
+        per_host: 호스트당 동시 요청 수
+        delay: 같은 호스트로 요청을 시작하는 최소 간격 (초)
+        """
+        self.per_host = max(1, per_host)
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._hosts: dict[str, dict] = {}
+
+    def _state(self, host: str) -> dict:
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = {"sem": threading.Semaphore(self.per_host), "next_start": 0.0}
+            return self._hosts[host]
+
+    @contextmanager
+    def slot(self, url: str):
+        state = self._state(urlsplit(url).netloc)
+        state["sem"].acquire()
+        try:
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, state["next_start"])
+                state["next_start"] = start + self.delay
+            if start > now:
+                time.sleep(start - now)
+            yield
+        finally:
+            state["sem"].release()
+
+
+# =========================================
+# 2. 크롤러 (keep-alive 세션 + 목록/본문 스트리밍 파이프라인)
+# =========================================
+class WebCrawler:
+    """
+    - requests.Session 하나를 공유해 호스트별 연결을 재사용 (keep-alive)
+    - 모든 요청은 HostLimiter를 거쳐 호스트별 동시성/간격 제한
+    - crawl_list_pages: 목록 페이지를 병렬로 읽으면서 새 링크가 나오는 즉시 본문 추출에 투입,
+      새 링크가 없는 목록 페이지를 만나면 이후 페이지는 요청하지 않음
+    """
+
+    def __init__(self, per_host: int = 4, delay: float = 0.2, timeout: float = 10, max_workers: int = 10,
+                 cache=None):
+        """
+        cache: HttpCache (지정하면 조건부 요청을 보내고 304/본문 해시로 변경 여부 판단)
+        """
+        self.timeout = timeout
+        self.cache = cache
+        self.max_workers = max_workers
+        self.limiter = HostLimiter(per_host, delay)
+
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def fetch(self, url: str) -> dict:
+        """
+        URL → {"text", "content_type", "changed"} (실패 시 예외)
+        changed: 캐시가 없거나, 마지막 동기화 이후 본문이 바뀌었으면 True
+        """
+        headers = self.cache.conditional_headers(url) if self.cache else None
+        with self.limiter.slot(url):
+            res = self.session.get(url, headers=headers, timeout=self.timeout)
+
+        if res.status_code != 304:
+            res.raise_for_status()
+            res.encoding = res.apparent_encoding
+
+        if self.cache:
+            page = self.cache.resolve(url, res)
+            if page is not None:
+                return page
+            res.raise_for_status()
+
+        return {"text": res.text, "content_type": res.headers.get("Content-Type", ""), "changed": True}
+
+    def fetch_page(self, url: str) -> dict | None:
+        """fetch와 같지만 실패 시 메시지 출력 후 None"""
+        try:
+            return self.fetch(url)
+        except Exception as e:
+            print(f"    [❌] 접속 실패 ({url}): {e}")
+            return None
+
+    def get_soup(self, url: str):
+        """URL → BeautifulSoup"""
+        page = self.fetch_page(url)
+        return BeautifulSoup(page["text"], "html.parser") if page else None
+
+    def find_links(self, list_url: str, link_pattern: str) -> list[str] | None:
+        """목록 페이지에서 link_pattern을 포함한 링크 추출 (페이지 순서 유지), 요청 실패 시 None"""
+        links, _ = self._find_links(list_url, link_pattern)
+        return links
+
+    def _find_links(self, list_url: str, link_pattern: str) -> tuple[list[str] | None, bool]:
+        page = self.fetch_page(list_url)
+        if not page:
+            return None, True
+        soup = BeautifulSoup(page["text"], "html.parser")
+
+        found_links = []
+        seen = set()
+        for a_tag in soup.find_all("a", href=True):
+            href = a_tag["href"]
+            if link_pattern in href:
+                full_url = urljoin(list_url, href)
+                if full_url not in seen:
+                    seen.add(full_url)
+                    found_links.append(full_url)
+        return found_links, page["changed"]
+
+    def crawl_list_pages(self, page_urls: list[str], link_pattern: str, extract, seen: set[str] | None = None,
+                         stop_on_empty: bool = True, known: set[str] | None = None) -> tuple[list, bool]:
+        """
+        page_urls: 순서대로 읽을 목록 페이지 URL
+        extract: 상세 링크 → 결과 (None이면 버림)
+        seen: 이미 처리한 링크 (새 링크 판정에 사용, 함수 안에서 갱신됨)
+        stop_on_empty: 새 링크가 하나도 없는 목록 페이지를 만나면 그 뒤 페이지는 요청하지 않음
+        known: 이전 실행에서 수집한 링크 (본문 추출은 하되 새 링크로 세지 않음 → 이미 본 글에 닿으면 조기 종료)
+
+        Returns: (extract 결과 리스트 (None 제외, 완료 순서), 읽은 목록 페이지 중 바뀐 페이지가 있는지)
+        """
+        seen = seen if seen is not None else set()
+        results = []
+        total_pages = len(page_urls)
+        stop_at = total_pages
+        next_page = 0
+        pages_read = 0
+        links_found = 0
+        lists_changed = False
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            list_futures: dict = {}
+            detail_futures: set = set()
+
+            # 목록 페이지는 호스트 동시성만큼만 미리 요청 (조기 종료 시 낭비 최소화)
+            # 이미 본 글 기준으로 멈출 때는 한 페이지씩 (본문 추출은 계속 병렬)
+            window = 1 if known else self.limiter.per_host
+
+            def fill_list_window():
+                nonlocal next_page
+                while next_page < stop_at and len(list_futures) < window:
+                    future = pool.submit(self._find_links, page_urls[next_page], link_pattern)
+                    list_futures[future] = next_page
+                    next_page += 1
+
+            fill_list_window()
+            while list_futures or detail_futures:
+                done, _ = wait(set(list_futures) | detail_futures, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    if future in list_futures:
+                        idx = list_futures.pop(future)
+                        pages_read += 1
+                        links, changed = future.result()
+                        lists_changed = lists_changed or changed
+                        page_links = [link for link in links or [] if link not in seen]
+                        seen.update(page_links)
+                        new_links = [link for link in page_links if not known or link not in known]
+                        links_found += len(new_links)
+
+                        # 링크는 바로 본문 추출에 투입 (모든 목록 페이지를 기다리지 않음)
+                        for link in page_links:
+                            detail_futures.add(pool.submit(extract, link))
+
+                        # 요청 실패(None)는 조기 종료 사유로 보지 않음
+                        if links is not None and not new_links and stop_on_empty and idx + 1 < stop_at:
+                            stop_at = idx + 1
+                            print(f"\n    --> {idx + 1}번째 목록 페이지에 새 링크 없음, 이후 목록 생략")
+                    else:
+                        detail_futures.discard(future)
+                        try:
+                            result = future.result()
+                        except Exception as e:
+                            print(f"\n    [❌] 본문 추출 실패: {e}", end="")
+                            result = None
+                        if result:
+                            results.append(result)
+
+                print(f"\r    목록 {pages_read}/{total_pages} · 링크 {links_found} · 본문 {len(results)}",
+                      end="", flush=True)
+                fill_list_window()
+
+        print()
+        return results, lists_changed
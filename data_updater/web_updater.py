@@ -1,16 +1,18 @@
 import re
-import json
 import time
-import os
-import tempfile
-import requests
-from urllib.parse import urljoin
-from bs4 import BeautifulSoup
 from google import genai
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # config_data에서 설정 가져오기
 import config_data
+from app.db import bump_store_version
+from data_updater.upload_engine import UploadEngine
+from data_updater.web_crawler import WebCrawler
+from data_updater.http_cache import HttpCache
+from data_updater.html_extract import extract_text
+from data_updater.sync_manifest import (
+    plan_store_sync, record_uploads, remove_entries,
+    content_hash, load_manifest, load_article_index, save_articles,
+)
 
 client = genai.Client(api_key=config_data.GOOGLE_API_KEY)
 
@@ -18,65 +20,22 @@ client = genai.Client(api_key=config_data.GOOGLE_API_KEY)
 # =========================================
 # 1. 공통 유틸
 # =========================================
+# 목록/본문 요청은 keep-alive 세션을 공유하는 크롤러 하나로 처리 (호스트별 동시성/간격 제한)
+# 조건부 요청 캐시로 지난 동기화 이후 바뀌지 않은 페이지를 판별
+http_cache = HttpCache()
+crawler = WebCrawler(**config_data.WEB_CRAWLER, cache=http_cache)
+
+
 def get_soup(url: str):
     """URL → BeautifulSoup"""
-    try:
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120 Safari/537.36"
-            )
-        }
-        res = requests.get(url, headers=headers, timeout=10)
-        res.raise_for_status()
-        if res.encoding and res.encoding.lower() == "iso-8859-1":
-            res.encoding = res.apparent_encoding
-        else:
-            res.encoding = res.apparent_encoding
-        return BeautifulSoup(res.text, "html.parser")
-    except Exception as e:
-        print(f"    [❌] 접속 실패 ({url}): {e}")
-        return None
+    return crawler.get_soup(url)
 
 
 # =========================================
-# 2. 표(JSON) 구조 변환
+# 2. 본문/표 추출 엔진 (data_updater.html_extract)
 # =========================================
-def table_to_structured_data(table_soup):
-    """HTML 표를 JSON 구조(헤더 + 행 리스트)로 변환"""
-    headers = [th.get_text(strip=True) for th in table_soup.find_all("th")]
-
-    if not headers:
-        first_tr = table_soup.find("tr")
-        if first_tr:
-            headers = [td.get_text(strip=True) for td in first_tr.find_all("td")]
-
-    rows = []
-    trs = table_soup.find_all("tr")
-
-    start_idx = 0
-    if table_soup.find("thead") or (trs and trs[0].find("th")):
-        start_idx = 1
-
-    for tr in trs[start_idx:]:
-        tds = tr.find_all(["td", "th"])
-        if not tds:
-            continue
-
-        row = {}
-        for i, td in enumerate(tds):
-            if i < len(headers):
-                key = headers[i]
-            else:
-                key = f"col_{i}"
-
-            cell_text = td.get_text(strip=True).replace("\n", " ")
-            row[key] = cell_text
-
-        if row:
-            rows.append(row)
-
-    return {"headers": headers, "rows": rows}
+# lxml로 파싱해 content_selector 영역만 한 번 순회하면서 본문 줄과 표(JSON 블록)를 바로 만든다.
+# 지원하지 않는 selector는 기존 BeautifulSoup 경로(table_to_structured_data 포함)로 처리.
 
 
 # =========================================
@@ -177,79 +136,19 @@ def final_chunking(title: str, content: str) -> list[str]:
 # =========================================
 # 5. 상세 페이지 파싱 (표 → 본문 삽입 로직 적용)
 # =========================================
-def extract_content(url: str, config_item: dict | None = None):
-    soup = get_soup(url)
-    if not soup:
+def extract_content(url: str, config_item: dict | None = None, skip_unchanged: bool = False):
+    """
+    skip_unchanged: 지난 동기화 이후 바뀌지 않은 페이지면 파싱하지 않고 {"url", "changed": False}만 반환
+    Returns: {"title", "url", "chunks", "crawled_at", "chunk_count", "changed"} / 실패 시 None
+    """
+    page = crawler.fetch_page(url)
+    if not page:
         return None
+    if skip_unchanged and not page["changed"]:
+        return {"url": url, "changed": False}
 
-    # 글로벌 잡동사니 제거
-    for tag in soup(["script", "style", "nav", "footer", "header", "iframe", "noscript", "form", "link", "meta"]):
-        tag.decompose()
-
-    target_element = soup
-
-    # 특정 영역 선택 + 제거 selector 적용
-    if config_item:
-        selector = config_item.get("content_selector")
-        if selector:
-            found = soup.select_one(selector)
-            if found:
-                target_element = found
-
-        removes = list(config_item.get("remove_selectors", []))
-        removes.extend([".list_btn", ".btn_area", ".sns_share", ".prev_next", ".file_area", ".view_nav"])
-        for rm_sel in removes:
-            for tag in target_element.select(rm_sel):
-                tag.decompose()
-
-    # 표(Table)를 JSON 문자열로 변환하여 본문에 심기
-    tables_to_inject: list[tuple[str, str]] = []
-
-    for idx, table in enumerate(target_element.find_all("table")):
-        placeholder = f"___TABLE_JSON_INJECT_{idx}___"
-        try:
-            tbl_dict = table_to_structured_data(table)
-
-            if not tbl_dict['headers'] and not tbl_dict['rows']:
-                table.decompose()
-                continue
-
-            json_str = json.dumps(tbl_dict, ensure_ascii=False, indent=2)
-            formatted_table_str = f"\n\n[TABLE]\n{json_str}\n\n"
-
-            tables_to_inject.append((placeholder, formatted_table_str))
-            table.replace_with(soup.new_string(placeholder))
-
-        except Exception:
-            pass
-
-    # 제목 추출
-    title = "No Title"
-    if soup.select_one(".subject"):
-        title = soup.select_one(".subject").get_text().strip()
-    elif soup.select_one("h3"):
-        title = soup.select_one("h3").get_text().strip()
-    elif soup.title:
-        title = soup.title.get_text().strip()
-
-    # 텍스트 추출 (Placeholder 포함된 상태)
-    text = target_element.get_text(separator="\n")
-
-    # Placeholder를 실제 JSON 문자열로 치환
-    for placeholder, json_str in tables_to_inject:
-        text = text.replace(placeholder, json_str)
-
-    # 라인 정제
-    lines: list[str] = []
-    skip_keywords = ["본문으로 바로가기", "TOP", "List", "글자크기", "SNS공유", "인쇄", "닫기", "목록"]
-
-    for line in text.splitlines():
-        line = line.strip()
-        if not line or line in skip_keywords:
-            continue
-        if line.startswith(("작성자", "작성일", "조회수")):
-            continue
-        lines.append(line)
+    # content_selector 영역만 한 번 순회하며 본문 줄 생성 (표는 JSON 블록으로)
+    title, lines = extract_text(page["text"], config_item)
 
     clean_body = "\n".join(lines)
 
@@ -269,6 +168,7 @@ def extract_content(url: str, config_item: dict | None = None):
         "chunks": chunks,
         "crawled_at": time.strftime("%Y-%m-%d"),
         "chunk_count": len(chunks),
+        "changed": page["changed"],
     }
 
 
@@ -276,23 +176,27 @@ def extract_content(url: str, config_item: dict | None = None):
 # 6. 목록 페이지 크롤링
 # =========================================
 def crawl_list_page(list_url: str, link_pattern: str):
-    soup = get_soup(list_url)
-    if not soup:
-        return []
-
-    found_links = set()
-    for a_tag in soup.find_all("a", href=True):
-        href = a_tag["href"]
-        if link_pattern in href:
-            full_url = urljoin(list_url, href)
-            found_links.add(full_url)
-
-    return list(found_links)
+    return crawler.find_links(list_url, link_pattern)
 
 
 # =========================================
 # 7. 메모리에서 콘텐츠 생성 (파일 저장 안 함)
 # =========================================
+def format_records(records: list[dict]) -> str:
+    md_lines: list[str] = []
+
+    for item in records:
+        for chunk in item["chunks"]:
+            md_lines.append("### Record")
+            md_lines.append(f"**Title:** {item['title']}")
+            md_lines.append(f"**Link:** {item['url']}")
+            md_lines.append(f"**Date:** {item['crawled_at']} (수집일)")
+            md_lines.append(f"**Chunk:**\n{chunk}")
+            md_lines.append("\n---\n")
+
+    return "\n".join(md_lines)
+
+
 def create_web_content_chunks(records: list[dict], basename: str, batch_size: int = 40) -> list[tuple[str, str]]:
     """
     Returns: [(filename, content), ...]
@@ -300,97 +204,163 @@ def create_web_content_chunks(records: list[dict], basename: str, batch_size: in
     chunks = []
 
     for i in range(0, len(records), batch_size):
-        subset = records[i : i + batch_size]
-        md_lines: list[str] = []
-
-        for item in subset:
-            for chunk in item["chunks"]:
-                md_lines.append("### Record")
-                md_lines.append(f"**Title:** {item['title']}")
-                md_lines.append(f"**Link:** {item['url']}")
-                md_lines.append(f"**Date:** {item['crawled_at']} (수집일)")
-                md_lines.append(f"**Chunk:**\n{chunk}")
-                md_lines.append("\n---\n")
-
         part = i // batch_size + 1
         filename = f"{basename}_part{part}.md"
-        content = "\n".join(md_lines)
-        chunks.append((filename, content))
+        chunks.append((filename, format_records(records[i : i + batch_size])))
 
     return chunks
 
 
+# 게시판 글은 인덱스(article_index)에 저장해 두고, 파트 파일을 인덱스에서 다시 만든다.
+# 새 글은 마지막 파트에 이어 붙이고(가득 차면 다음 파트), 수정된 글은 원래 파트에서 교체 →
+# 새 글/수정 글이 들어간 파트만 내용이 바뀌어 업로드된다.
+def article_hash(record: dict) -> str:
+    return content_hash(record["title"] + "\n" + "\n".join(record["chunks"]))
+
+
+def merge_articles(index: dict[str, dict], records: list[dict], batch_size: int = 40) -> dict[str, dict]:
+    """
+    index: load_article_index 결과
+    records: 이번에 추출한 글 (변경 없어 파싱을 생략한 글은 "chunks"가 없음)
+
+    Returns: {url: 인덱스 항목} - 새 글/수정된 글만
+    """
+    today = time.strftime("%Y-%m-%d")
+    updates: dict[str, dict] = {}
+    new_records = []
+
+    for rec in records:
+        if "chunks" not in rec:
+            continue
+
+        h = article_hash(rec)
+        old = index.get(rec["url"])
+        if old is None:
+            new_records.append((rec, h))
+        elif old["content_hash"] != h:
+            updates[rec["url"]] = {**old, "content_hash": h, "title": rec["title"],
+                                   "chunks": rec["chunks"], "last_changed": today}
+
+    counts: dict[int, int] = {}
+    for entry in index.values():
+        counts[entry["part_num"]] = counts.get(entry["part_num"], 0) + 1
+    head = max(counts, default=1)
+
+    for rec, h in sorted(new_records, key=lambda x: x[0]["url"]):
+        if counts.get(head, 0) >= batch_size:
+            head += 1
+        counts[head] = counts.get(head, 0) + 1
+        updates[rec["url"]] = {
+            "part_num": head, "content_hash": h, "title": rec["title"], "chunks": rec["chunks"],
+            "first_seen": today, "last_changed": today,
+        }
+
+    return updates
+
+
+def create_indexed_chunks(index: dict[str, dict], basename: str) -> list[tuple[str, str]]:
+    """인덱스의 글을 파트별로 모아 [(filename, content), ...] 생성"""
+    parts: dict[int, list[dict]] = {}
+    for url, entry in sorted(index.items()):
+        parts.setdefault(entry["part_num"], []).append({
+            "title": entry["title"], "url": url, "chunks": entry["chunks"], "crawled_at": entry["last_changed"],
+        })
+
+    return [(f"{basename}_part{part}.md", format_records(records)) for part, records in sorted(parts.items())]
+
+
 # =========================================
 # 8. 업로드 및 스토어 동기화
 # =========================================
-def upload_single_chunk(filename: str, content: str, store_name: str) -> tuple[str, bool, str]:
-    temp_file = None
-    try:
-        with tempfile.NamedTemporaryFile(mode='w', encoding='utf-8', suffix='.md', delete=False) as f:
-            f.write(content)
-            temp_file = f.name
-
-        op = client.file_search_stores.upload_to_file_search_store(
-            file=temp_file,
-            file_search_store_name=store_name,
-            config={"display_name": filename, "mime_type": "text/markdown"},
-        )
+# 업로드/삭제는 공용 업로드 엔진 사용 (속도 제한/적응형 동시성/재시도)
+engine = UploadEngine(client, **config_data.UPLOAD_ENGINE)
 
-        while not op.done:
-            time.sleep(1)
-            op = client.operations.get(op)
 
-        return (filename, True, "")
+# 수집일 줄은 실행마다 바뀌므로 변경 감지(해시)에서 제외
+CRAWLED_AT_LINE = re.compile(r"^\*\*Date:\*\* .* \(수집일\)$", re.MULTILINE)
 
-    except Exception as e:
-        return (filename, False, str(e))
 
-    finally:
-        if temp_file and os.path.exists(temp_file):
-            try:
-                os.unlink(temp_file)
-            except:
-                pass
+def strip_crawled_at(content: str) -> str:
+    return CRAWLED_AT_LINE.sub("", content)
 
 
-def update_store_files(store_name: str, chunks: list[tuple[str, str]], base_name_pattern: str):
-    print(f"   [Store Update] '{base_name_pattern}' 동기화 시작")
-
+def list_store_docs(store_name: str, prefix: str) -> list[tuple[str, str]]:
+    """Returns: 스토어에서 display_name이 prefix로 시작하는 [(display_name, document_name), ...]"""
     pager = client.file_search_stores.documents.list(parent=store_name)
-    docs_to_delete: list[str] = []
 
     try:
         all_docs = list(pager)
     except Exception:
         all_docs = []
 
+    existing_docs: list[tuple[str, str]] = []
     for doc in all_docs:
-        d_name = getattr(doc, "display_name", "")
-        if d_name.startswith(base_name_pattern + "_part"):
-            docs_to_delete.append(doc.name)
-
-    if docs_to_delete:
-        print(f"   → 기존 파일 {len(docs_to_delete)}개 삭제 중...")
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            for d_id in docs_to_delete:
-                executor.submit(
-                    client.file_search_stores.documents.delete,
-                    name=d_id,
-                    config={"force": True},
-                )
-        time.sleep(2)
-
-    print("   → 새 파일 업로드 중...")
-    with ThreadPoolExecutor(max_workers=5) as executor:
-        futures = [executor.submit(upload_single_chunk, fn, ct, store_name) for fn, ct in chunks]
-        for fut in as_completed(futures):
-            name, ok, msg = fut.result()
-            if ok:
-                print(f"   ✅ {name}")
-            else:
-                print(f"   ❌ {name} - {msg}")
+        d_name = getattr(doc, "display_name", "") or ""
+        if d_name.startswith(prefix):
+            existing_docs.append((d_name, doc.name))
+    return existing_docs
+
+
+def update_store_files(store_name: str, chunks: list[tuple[str, str]], base_name_pattern: str,
+                       keep_missing: bool = False) -> bool:
+    """
+    keep_missing: True면 chunks에 없는 기존 파트는 삭제하지 않음
+    Returns: 모든 변경 파트 업로드에 성공했으면 True
+    """
+    print(f"   [Store Update] '{base_name_pattern}' 동기화 시작")
+    prefix = base_name_pattern + "_part"
+    existing_docs = list_store_docs(store_name, prefix)
+
+    # 매니페스트(콘텐츠 해시)와 비교해 바뀐 파트만 처리
+    plan = plan_store_sync(store_name, chunks, prefix, existing_docs, normalize=strip_crawled_at,
+                           keep_missing=keep_missing)
+    print(f"   → 변경 {len(plan['upload'])}개 / 유지 {len(plan['unchanged'])}개 / 삭제 {len(plan['delete'])}개")
+
+    if not plan["upload"] and not plan["delete"]:
+        print("   [✔] 변경 없음 (업로드 생략)\n")
+        return True
+
+    if plan["delete"]:
+        print(f"   → 불필요한 파일 {len(plan['delete'])}개 삭제 중...")
+        engine.delete_documents(plan["delete"])
+    remove_entries(store_name, plan["removed"])
+
+    uploaded: dict[str, str | None] = {}
+    if plan["upload"]:
+        print("   → 변경된 파일 업로드 중...")
+        results = engine.upload_chunks([(fn, ct) for fn, ct, _ in plan["upload"]], store_name, indent="   ")
+        uploaded = {fn: r["document_name"] for fn, r in results.items() if r["success"]}
+
+        # 업로드 성공한 파트의 이전 버전 삭제
+        replaced = [d for fn in uploaded for d in plan["replace"].get(fn, [])]
+        if replaced:
+            print(f"   → 이전 버전 {len(replaced)}개 삭제 중...")
+            engine.delete_documents(replaced)
+
+        record_uploads(store_name, [(fn, h, uploaded[fn]) for fn, _, h in plan["upload"] if fn in uploaded])
+
+    # 챗봇 답변 캐시 무효화 (스토어 버전 갱신)
+    bump_store_version(store_name)
 
     print("   [✔] 동기화 완료\n")
+    return len(uploaded) == len(plan["upload"])
+
+
+def cleanup_legacy_parts(store_name: str, base_name_pattern: str):
+    """
+    이전 방식(데일리마다 _recent 재생성)으로 올린 파트가 남아 있으면 스토어에서 정리
+    매니페스트가 생기기 전에 올린 파트도 있으므로 스토어 문서 목록으로 판단
+    """
+    prefix = base_name_pattern + "_part"
+    try:
+        legacy_docs = list_store_docs(store_name, prefix)
+        if legacy_docs:
+            print(f"   → 이전 방식 파트 정리: {base_name_pattern} ({len(legacy_docs)}개)")
+            engine.delete_documents([doc_name for _, doc_name in legacy_docs])
+            bump_store_version(store_name)
+        remove_entries(store_name, list(load_manifest(store_name, prefix)))
+    except Exception as e:
+        print(f"   [⚠️] 이전 방식 파트 정리 실패 (다음 실행에서 다시 시도): {e}")
 
 
 # =========================================
@@ -405,6 +375,7 @@ def run_web_pipeline(auto_mode=None):
         return
 
     print(f"[✔] Target Store: {store_name}\n")
+    engine.reset_metrics()
 
     if auto_mode:
         print(f"🤖 자동 모드(스케줄러)로 실행합니다: 옵션 {auto_mode}")
@@ -427,84 +398,98 @@ def run_web_pipeline(auto_mode=None):
             continue
 
         # 모드에 따른 페이지 범위 및 파일명 설정
+        # 게시판 글은 _archive 하나에 누적 (데일리는 앞쪽 몇 페이지만, 이미 본 글에 닿으면 중단)
+        source_daily = is_daily
+        index = None
         if pagination:
-            daily_limit = pagination.get("daily_limit", 5)
-            full_end = pagination.get("end_page", 1)
-
-            if is_daily:
-                target_name = f"{original_name}_recent"
-                p_start = 1
-                p_end = daily_limit
-            else:
-                target_name = f"{original_name}_archive"
-                p_start = daily_limit + 1
-                p_end = full_end
+            target_name = f"{original_name}_archive"
+            index = load_article_index(store_name, target_name)
+            # 글 인덱스가 없으면(첫 실행/업그레이드 직후) 데일리로 만든 파트가 기존 아카이브를 덮어쓰므로 전체 수집
+            if is_daily and not index:
+                print(f"[ℹ] {target_name}: 글 인덱스가 없어 이번에는 전체 수집으로 실행합니다")
+                source_daily = False
+            p_start = 1
+            p_end = pagination.get("daily_limit", 5) if source_daily else pagination.get("end_page", 1)
         else:
             target_name = original_name
             p_start = 1
             p_end = 1
 
         print(f"=== Web Crawling: {target_name} (Page {p_start}~{p_end}) ===")
-        crawled_data_list: list[dict] = []
+        updates: dict[str, dict] = {}
 
         # [TYPE 1] 목록형 게시판 크롤링
+        # 목록 페이지를 병렬로 읽으면서 나온 링크를 바로 본문 추출로 넘김 (새 링크가 없으면 조기 종료)
         if crawl_type == "list" and link_pattern:
             if pagination:
-                target_links = set()
                 param = pagination.get("param", "nPage")
+                page_urls = [f"{base_url}&{param}={page_num}" for page_num in range(p_start, p_end + 1)]
+            else:
+                page_urls = [base_url]
+
+            # 이미 본 글은 조건부 요청으로 수정 여부만 확인, 데일리 모드는 이미 본 글만 있는 페이지에서 중단
+            if index is None:
+                index = load_article_index(store_name, target_name)
+            crawled_data_list, _ = crawler.crawl_list_pages(
+                page_urls, link_pattern,
+                lambda link: extract_content(link, item, skip_unchanged=link in index),
+                known=set(index) if source_daily else None,
+            )
 
-                for page_num in range(p_start, p_end + 1):
-                    page_url = f"{base_url}&{param}={page_num}"
-                    print(f"\r    Reading List... [Page {page_num}/{p_end}]", end="", flush=True)
-
-                    links = crawl_list_page(page_url, link_pattern)
-                    target_links.update(links)
-                    time.sleep(0.3)
+            updates = merge_articles(index, crawled_data_list)
+            new_count = sum(1 for url in updates if url not in index)
+            print(f"    → 새 글 {new_count}개 / 수정 {len(updates) - new_count}개 / 기존 {len(index)}개")
+
+            if not updates:
+                http_cache.commit()
+                if index:
+                    print("    → 새 글/수정된 글 없음 (업로드 생략)\n")
+                    if pagination:
+                        cleanup_legacy_parts(store_name, f"{original_name}_recent")
+                else:
+                    print("    → 수집된 데이터가 없습니다.\n")
+                continue
 
-                print(f"\n    --> {len(target_links)}개 상세 링크 확보")
-            else:
-                target_links = set(crawl_list_page(base_url, link_pattern))
-
-            detail_links = list(target_links)
-            if detail_links:
-                print(f"    2단계: 본문 크롤링 ({len(detail_links)}개)...")
-
-                with ThreadPoolExecutor(max_workers=10) as executor:
-                    future_to_url = {
-                        executor.submit(extract_content, link, item): link
-                        for link in detail_links
-                    }
-
-                    count = 0
-                    for future in as_completed(future_to_url):
-                        result = future.result()
-                        if result:
-                            crawled_data_list.append(result)
-                            count += 1
-                            if count % 10 == 0:
-                                print(f"\r    - 진행: {count}/{len(detail_links)}", end="", flush=True)
-                print()
+            index.update(updates)
+            chunks = create_indexed_chunks(index, target_name)
 
         # [TYPE 2] 단일 페이지 크롤링
         else:
             print("    단일 페이지 수집 중...")
-            result = extract_content(base_url, item)
-            if result:
-                crawled_data_list.append(result)
-
-        # 메모리에서 청크 생성 및 업로드
-        if crawled_data_list:
-            print(f"    → {len(crawled_data_list)}개 데이터 저장 및 동기화")
-            try:
-                chunks = create_web_content_chunks(crawled_data_list, basename=target_name)
-                if chunks:
-                    update_store_files(store_name, chunks, base_name_pattern=target_name)
-            except Exception as e:
-                print(f"    [❌] 에러 발생: {e}")
+            result = extract_content(base_url, item, skip_unchanged=True)
+            if not result:
+                http_cache.discard()
+                print("    → 수집된 데이터가 없습니다.\n")
+                continue
+
+            # 지난 동기화 이후 바뀌지 않았으면 청킹·업로드 생략
+            if not result["changed"]:
+                http_cache.commit()
+                print("    → 변경 없음 (HTTP 캐시: 304/본문 해시 일치, 업로드 생략)\n")
+                continue
+
+            chunks = create_web_content_chunks([result], basename=target_name)
+
+        # 메모리에서 만든 청크 동기화
+        synced = False
+        try:
+            # 데일리는 인덱스에 없는 기존 파트를 지우지 않음 (아카이브는 추가/교체로만 늘어남)
+            synced = update_store_files(store_name, chunks, base_name_pattern=target_name,
+                                        keep_missing=source_daily)
+        except Exception as e:
+            print(f"    [❌] 에러 발생: {e}")
+
+        # 동기화가 끝까지 성공한 경우에만 인덱스/캐시 갱신 (실패분은 다음 실행에서 다시 처리)
+        if synced:
+            save_articles(store_name, target_name, updates)
+            http_cache.commit()
+            if pagination:
+                cleanup_legacy_parts(store_name, f"{original_name}_recent")
         else:
-            print("    → 수집된 데이터가 없습니다.\n")
+            http_cache.discard()
 
     print("🎉 Web Pipeline 완료")
+    print(f"   업로드: {engine.report()}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,152 @@
+import re
+import codecs
+
+from lxml import etree
+
+
+# =========================================
+# XML 아이템 스트리밍 추출 (api_updater)
+# =========================================
+# 응답을 받는 대로 조각(feed)을 넣으면 <items><item>…</item></items>의 item이 닫힐 때마다
+# xmltodict와 같은 모양의 dict로 바꿔 handler에 넘기고, 트리에서 떼어내 메모리를 비운다.
+# 전체 응답을 중첩 dict로 만들지 않고, 다운로드가 끝나기 전에 앞쪽 레코드 처리가 시작된다.
+# (lxml 풀 파서에 item/메타 태그의 end 이벤트만 요청 → 나머지 요소는 C 레벨에서 처리)
+#
+# 캐시에 저장할 문자열이 필요하므로 바이트는 점진적 디코더로 문자열로 바꿔 넣는다.
+_XML_ENCODING = re.compile(rb"""<\?xml[^>]*encoding=["']([\w.:-]+)["']""")
+
+
+def _local(tag: str) -> str:
+    return etree.QName(tag).localname
+
+
+def element_to_dict(el):
+    """
+    ElementTree 요소 → xmltodict.parse 결과와 같은 값
+    (속성은 "@이름", 자식이 있을 때 텍스트는 "#text", 반복 태그는 리스트, 빈 요소는 None)
+    """
+    item = {f"@{k}": v for k, v in el.attrib.items()} or None
+    tails = []
+    for child in el:
+        if child.tail:
+            tails.append(child.tail)
+        if not isinstance(child.tag, str):
+            continue  # 주석/처리 명령
+
+        value = element_to_dict(child)
+        key = _local(child.tag)
+        if item is None:
+            item = {}
+        if key in item:
+            if isinstance(item[key], list):
+                item[key].append(value)
+            else:
+                item[key] = [item[key], value]
+        else:
+            item[key] = value
+
+    data = ((el.text or "") + "".join(tails)).strip()
+    if item is None:
+        return data or None
+    if data:
+        item["#text"] = data
+    return item
+
+
+def detect_encoding(content_type: str, head: bytes) -> str:
+    """Content-Type charset → XML 선언 → utf-8 순으로 인코딩 결정"""
+    m = re.search(r"charset=([\w.:-]+)", content_type or "", re.I)
+    if m:
+        return m.group(1)
+    m = _XML_ENCODING.search(head[:200])
+    if m:
+        return m.group(1).decode("ascii")
+    return "utf-8"
+
+
+class XmlItemStream:
+    def __init__(self, handler, content_type: str = "", item_tag: str = "item", container_tag: str = "items",
+                 meta_tags: tuple[str, ...] = ("totalCount",)):
+        """
+        handler: item dict → 저장할 값 (records에 순서대로 쌓임)
+        content_type: 응답 Content-Type (feed_bytes의 인코딩 판단에 사용)
+        meta_tags: item 밖에서 값을 기록해 둘 태그 (예: totalCount)
+        """
+        self.handler = handler
+        self.item_tag = item_tag
+        self.container_tag = container_tag
+        self.meta_tags = meta_tags
+
+        self.records: list = []
+        self.meta: dict[str, str] = {}
+        self.failed = False
+
+        self._parser = etree.XMLPullParser(events=("end",), tag=(item_tag, *meta_tags))
+        self._decoder = None
+        self._head = b""
+        self._content_type = content_type
+
+    def feed_bytes(self, chunk: bytes) -> str:
+        """바이트 조각을 디코딩해 넣음, Returns: 디코딩한 문자열 (캐시 저장용)"""
+        if self._decoder is None:
+            # XML 선언이 다 들어올 때까지 모았다가 인코딩 결정
+            self._head += chunk
+            if len(self._head) < 200 and b"?>" not in self._head:
+                return ""
+            self._start_decoder()
+            chunk, self._head = self._head, b""
+        text = self._decoder.decode(chunk)
+        self.feed(text)
+        return text
+
+    def _start_decoder(self):
+        encoding = detect_encoding(self._content_type, self._head)
+        try:
+            self._decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        except LookupError:
+            self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    def flush_bytes(self) -> str:
+        if self._decoder is None:
+            self._start_decoder()
+            text = self._decoder.decode(self._head, final=True)
+            self._head = b""
+        else:
+            text = self._decoder.decode(b"", final=True)
+        self.feed(text)
+        return text
+
+    def feed(self, text: str):
+        if self.failed or not text:
+            return
+        try:
+            self._parser.feed(text)
+            self._drain()
+        except etree.XMLSyntaxError:
+            self.failed = True
+
+    def _drain(self):
+        for _, el in self._parser.read_events():
+            if el.tag in self.meta_tags:
+                self.meta[el.tag] = (el.text or "").strip()
+                continue
+
+            parent = el.getparent()
+            if parent is None or _local(parent.tag) != self.container_tag:
+                continue
+            self.records.append(self.handler(element_to_dict(el)))
+
+            # 처리한 item과 앞서 처리한 형제들을 트리에서 제거
+            el.clear()
+            while el.getprevious() is not None:
+                del parent[0]
+
+    def close(self) -> bool:
+        """Returns: 파싱이 끝까지 성공했고 item을 하나 이상 찾았으면 True"""
+        if not self.failed:
+            try:
+                self._parser.close()
+                self._drain()
+            except etree.XMLSyntaxError:
+                self.failed = True
+        return not self.failed and bool(self.records)
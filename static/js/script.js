@@ -1076,7 +1076,7 @@ async function performSearch() {
 
         console.log('Sending request:', requestData);
 
-        const response = await fetch('/api/search', {
+        const response = await fetch('/api/search/stream', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
@@ -1084,13 +1084,35 @@ async function performSearch() {
             body: JSON.stringify(requestData)
         });
 
-        const data = await response.json();
+        const contentType = response.headers.get('Content-Type') || '';
+        if (!contentType.includes('text/event-stream')) {
+            const data = await response.json();
+            console.error('Search failed:', data.error);
+            throw new Error(data.error);
+        }
+
+        // Render tokens as they arrive
+        let textDiv = null;
+        let resultText = '';
+        const data = await readSearchStream(response, (token) => {
+            if (!textDiv) {
+                searchLoading.style.display = 'none';
+                textDiv = addMessageToChat('model', '');
+            }
+            resultText += token;
+            textDiv.textContent = resultText;
+            chatHistory.scrollTop = chatHistory.scrollHeight;
+        });
 
         console.log('Response:', data);
 
         if (data.success) {
-            // Add AI response to conversation history and UI
-            addMessageToChat('model', data.result);
+            const finalText = data.result || resultText;
+            if (textDiv) {
+                textDiv.textContent = finalText;
+            } else {
+                addMessageToChat('model', finalText);
+            }
 
             // Update conversation history for Gemini API
             state.conversationHistory.push({
@@ -1099,7 +1121,7 @@ async function performSearch() {
             });
             state.conversationHistory.push({
                 role: 'model',
-                parts: [data.result]
+                parts: [finalText]
             });
 
             console.log('Conversation history updated:', state.conversationHistory);
@@ -1107,6 +1129,9 @@ async function performSearch() {
             showToast('검색 완료', 'success');
         } else {
             console.error('Search failed:', data.error);
+            if (textDiv) {
+                textDiv.closest('.chat-message').remove();
+            }
             throw new Error(data.error);
         }
     } catch (error) {
@@ -1122,6 +1147,46 @@ async function performSearch() {
     }
 }
 
+async function readSearchStream(response, onToken) {
+    // Parse Server-Sent Events from /api/search/stream
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder('utf-8');
+    let buffer = '';
+    let finalData = { success: false, error: 'Stream ended unexpectedly' };
+
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const rawEvent = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+
+            let eventType = 'message';
+            const dataLines = [];
+            rawEvent.split('\n').forEach(line => {
+                if (line.startsWith('event:')) {
+                    eventType = line.slice(6).trim();
+                } else if (line.startsWith('data:')) {
+                    dataLines.push(line.slice(5).trim());
+                }
+            });
+            if (dataLines.length === 0) continue;
+
+            const payload = JSON.parse(dataLines.join('\n'));
+            if (eventType === 'token') {
+                onToken(payload.text);
+            } else if (eventType === 'done' || eventType === 'error') {
+                finalData = payload;
+            }
+        }
+    }
+
+    return finalData;
+}
+
 function addMessageToChat(role, text) {
     if (!chatHistory) return;
 
@@ -1174,6 +1239,8 @@ function addMessageToChat(role, text) {
 
     // Scroll to bottom
     chatHistory.scrollTop = chatHistory.scrollHeight;
+
+    return textDiv;
 }
 
 function clearConversation() {
@@ -1681,6 +1748,7 @@ let mapClickState = {
 const pathResult = document.getElementById('pathResult');
 const pathLoading = document.getElementById('pathLoading');
 const pathImage = document.getElementById('pathImage');
+const pathImageContainer = document.getElementById('pathImageContainer');
 const pathDistance = document.getElementById('pathDistance');
 const closePathResultBtn = document.getElementById('closePathResultBtn');
 const resetMapBtn = document.getElementById('resetMapBtn');
@@ -1692,6 +1760,7 @@ const initialMapImage = document.getElementById('initialMapImage');
 const facilityPathResult = document.getElementById('facilityPathResult');
 const facilityPathLoading = document.getElementById('facilityPathLoading');
 const facilityPathImage = document.getElementById('facilityPathImage');
+const facilityPathImageContainer = document.getElementById('facilityPathImageContainer');
 const facilityPathDistance = document.getElementById('facilityPathDistance');
 const closeFacilityPathResultBtn = document.getElementById('closeFacilityPathResultBtn');
 const resetFacilityMapBtn = document.getElementById('resetFacilityMapBtn');
@@ -1749,11 +1818,25 @@ async function handleMapClick(event) {
     const y = event.clientY - rect.top;
 
     // 이미지 크기에 대한 실제 좌표 계산
-    const scaleX = 953 / rect.width;
-    const scaleY = 676 / rect.height;
-    const actualX = x * scaleX;
-    const actualY = y * scaleY;
+    const scaleX = MAP_COORD_SIZE[0] / rect.width;
+    const scaleY = MAP_COORD_SIZE[1] / rect.height;
+
+    await handleMapCoords(x * scaleX, y * scaleY);
+}
 
+// 경로 오버레이(SVG) 클릭 핸들러 - 확대된 화면 좌표를 지도 좌표로 변환
+async function handleRouteOverlayClick(event) {
+    const svg = event.currentTarget;
+    const point = svg.createSVGPoint();
+    point.x = event.clientX;
+    point.y = event.clientY;
+    const mapPoint = point.matrixTransform(svg.getScreenCTM().inverse());
+
+    await handleMapCoords(mapPoint.x, mapPoint.y);
+}
+
+// 지도 좌표 기준 클릭 처리
+async function handleMapCoords(actualX, actualY) {
     const lang = state.currentLanguage || 'ko';
 
     if (mapClickState.mode === 'wayfinding') {
@@ -1775,6 +1858,116 @@ async function handleMapClick(event) {
     }
 }
 
+// 지도 좌표계 크기 및 경로 오버레이 설정 (서버 렌더러와 동일한 기준)
+const MAP_COORD_SIZE = [953, 676];
+const ROUTE_OUTPUT_SIZE = [1162, 693];
+const ROUTE_MARKER_PIXELS = 65;
+const POINTS_TO_PIXELS = 150 / 72;
+const MAP_IMAGE_URL = '/static/map/올공맵.png';
+const MASCOT_IMAGE_URL = '/static/images/mascot_profile.png';
+const SVG_NS = 'http://www.w3.org/2000/svg';
+
+function createSvgElement(tag, attrs) {
+    const element = document.createElementNS(SVG_NS, tag);
+    Object.entries(attrs).forEach(([key, value]) => element.setAttribute(key, value));
+    return element;
+}
+
+// 벡터 경로 그리기 (지도 이미지 위 SVG 오버레이, viewBox = 확대 영역)
+function renderRouteVector(container, imageElement, route) {
+    const bounds = route.bounds;
+    const width = bounds.max_x - bounds.min_x;
+    const height = bounds.max_y - bounds.min_y;
+
+    // 서버 PNG와 같은 선 두께/마커 크기가 되도록 출력 배율로 환산 (지도 좌표 단위)
+    const scale = Math.min(ROUTE_OUTPUT_SIZE[0] / width, ROUTE_OUTPUT_SIZE[1] / height);
+    const strokeWidth = Math.max(1, route.line_width * POINTS_TO_PIXELS) / scale;
+    const markerRadius = ROUTE_MARKER_PIXELS / 2 / scale;
+
+    let svg = container.querySelector('svg.route-overlay');
+    if (!svg) {
+        svg = createSvgElement('svg', { class: 'route-overlay', preserveAspectRatio: 'xMidYMid meet' });
+        svg.addEventListener('click', handleRouteOverlayClick);
+        container.appendChild(svg);
+    }
+    svg.setAttribute('viewBox', `${bounds.min_x} ${bounds.min_y} ${width} ${height}`);
+    svg.replaceChildren();
+
+    // 배경 (지도 밖 영역은 흰색) + 지도 이미지
+    svg.appendChild(createSvgElement('rect', {
+        x: bounds.min_x, y: bounds.min_y, width: width, height: height, fill: '#ffffff'
+    }));
+    svg.appendChild(createSvgElement('image', {
+        href: MAP_IMAGE_URL, x: 0, y: 0,
+        width: MAP_COORD_SIZE[0], height: MAP_COORD_SIZE[1],
+        preserveAspectRatio: 'none'
+    }));
+
+    // 경로 ([x0, y0, x1, y1, ...])
+    const coords = route.path;
+    const points = [];
+    for (let i = 0; i + 1 < coords.length; i += 2) {
+        points.push(`${coords[i]},${coords[i + 1]}`);
+    }
+    svg.appendChild(createSvgElement('polyline', {
+        points: points.join(' '),
+        fill: 'none',
+        stroke: '#ff0000',
+        'stroke-opacity': route.line_alpha,
+        'stroke-width': strokeWidth,
+        'stroke-linejoin': 'round',
+        'stroke-linecap': 'round'
+    }));
+
+    // 출발지/도착지 마커 (원형 액자 마스코트)
+    if (coords.length >= 2) {
+        const markers = [
+            { x: coords[0], y: coords[1], color: '#3399ff', id: 'start' },
+            { x: coords[coords.length - 2], y: coords[coords.length - 1], color: '#33ff99', id: 'end' }
+        ];
+        const defs = createSvgElement('defs', {});
+        svg.appendChild(defs);
+
+        markers.forEach(marker => {
+            const clipId = `${container.id}-${marker.id}-clip`;
+            const clipPath = createSvgElement('clipPath', { id: clipId });
+            clipPath.appendChild(createSvgElement('circle', { cx: marker.x, cy: marker.y, r: markerRadius }));
+            defs.appendChild(clipPath);
+
+            svg.appendChild(createSvgElement('circle', {
+                cx: marker.x, cy: marker.y, r: markerRadius, fill: '#ffffff'
+            }));
+            svg.appendChild(createSvgElement('image', {
+                href: MASCOT_IMAGE_URL,
+                x: marker.x - markerRadius, y: marker.y - markerRadius,
+                width: markerRadius * 2, height: markerRadius * 2,
+                'clip-path': `url(#${clipId})`,
+                preserveAspectRatio: 'xMidYMid slice'
+            }));
+            svg.appendChild(createSvgElement('circle', {
+                cx: marker.x, cy: marker.y, r: markerRadius,
+                fill: 'none', stroke: marker.color, 'stroke-width': markerRadius * 0.16
+            }));
+        });
+    }
+
+    svg.style.display = 'block';
+    if (imageElement) imageElement.style.display = 'none';
+}
+
+// 경로 결과 표시 (vector: SVG 오버레이, image: 서버 렌더링 PNG)
+function displayRouteResult(container, imageElement, data) {
+    if (data.format === 'vector' && data.route) {
+        renderRouteVector(container, imageElement, data.route);
+        return;
+    }
+
+    const svg = container.querySelector('svg.route-overlay');
+    if (svg) svg.style.display = 'none';
+    imageElement.src = `data:image/png;base64,${data.image}`;
+    imageElement.style.display = 'block';
+}
+
 // 좌표 기반 경로 찾기
 async function findPathFromCoords() {
     if (!mapClickState.startCoords || !mapClickState.endCoords) return;
@@ -1792,7 +1985,8 @@ async function findPathFromCoords() {
                 start_x: mapClickState.startCoords.x,
                 start_y: mapClickState.startCoords.y,
                 end_x: mapClickState.endCoords.x,
-                end_y: mapClickState.endCoords.y
+                end_y: mapClickState.endCoords.y,
+                format: 'vector'
             })
         });
 
@@ -1803,7 +1997,7 @@ async function findPathFromCoords() {
 
         if (data.success) {
             pathDistance.textContent = `${data.distance.toFixed(2)} km`;
-            pathImage.src = `data:image/png;base64,${data.image}`;
+            displayRouteResult(pathImageContainer, pathImage, data);
 
             // 초기 지도 숨기고 결과 표시
             if (initialMap) initialMap.style.display = 'none';
@@ -1855,7 +2049,8 @@ async function findNearestFacility(x, y) {
                 x: x,
                 y: y,
                 category: searchParams.category,
-                name_pattern: searchParams.name_pattern
+                name_pattern: searchParams.name_pattern,
+                format: 'vector'
             })
         });
 
@@ -1866,7 +2061,7 @@ async function findNearestFacility(x, y) {
 
         if (data.success) {
             facilityPathDistance.textContent = `${data.distance.toFixed(2)} km`;
-            facilityPathImage.src = `data:image/png;base64,${data.image}`;
+            displayRouteResult(facilityPathImageContainer, facilityPathImage, data);
 
             // 초기 지도 숨기고 결과 표시
             if (initialFacilityMap) initialFacilityMap.style.display = 'none';
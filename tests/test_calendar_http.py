@@ -0,0 +1,76 @@
+import re
+import threading
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from data_updater import calendar_updater as cu
+
+SELECTORS = {
+    "row_container": "#rowSpace tr",
+    "title": "a.title",
+    "date": "span.date",
+    "place": "td:nth-child(3)",
+    "ym_display_id": "spanYmd",
+    "next_btn_class": "btn_next",
+}
+
+
+class MonthPage(BaseHTTPRequestHandler):
+    """/cal/{year}/{month} → 그 달의 일정 2건 (캘린더 사이트 대역)"""
+
+    def do_GET(self):
+        m = re.fullmatch(r"/cal/(\d{4})/(\d{1,2})", self.path)
+        if not m:
+            self.send_error(404)
+            return
+        ym = f"{m.group(1)}.{int(m.group(2)):02d}"
+        rows = "".join(
+            f'<tr><td><a class="title" href="/view/{ym}/{i}">공연 {ym}-{i}</a></td>'
+            f'<td><span class="date">{ym}.1{i}</span></td><td>체조경기장</td></tr>'
+            for i in range(2)
+        )
+        body = f'<html><body><span id="spanYmd">{ym}</span><table id="rowSpace">{rows}</table></body></html>'
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def calendar_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MonthPage)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_crawl_month_pages_over_http(calendar_server):
+    site = {
+        "site_name": "LocalConcert",
+        "target_url": f"{calendar_server}/cal",
+        "month_url": f"{calendar_server}/cal/{{year}}/{{month}}",
+        "selectors": SELECTORS,
+    }
+
+    events, complete = cu.crawl_calendar_site(site, months_override=2)
+
+    today = date.today()
+    next_year, next_month = divmod(today.month, 12)
+    expected_months = [f"{today.year}.{today.month:02d}", f"{today.year + next_year}.{next_month + 1:02d}"]
+
+    assert complete is True
+    assert sorted({e["year_month"] for e in events}) == sorted(expected_months)
+    assert len(events) == 4
+    first = next(e for e in events if e["year_month"] == expected_months[0])
+    assert first["title"] == f"공연 {expected_months[0]}-0"
+    assert first["place"] == "체조경기장"
+    assert first["link"] == f"{calendar_server}/view/{expected_months[0]}/0"
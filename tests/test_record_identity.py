@@ -0,0 +1,70 @@
+import os
+
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+
+import pytest
+
+from data_updater import api_updater as au
+
+
+def make_record(local_id: int, day: int, category: str = "CAT01") -> dict:
+    return au.normalize_record({
+        "title": f"사진 {local_id}",
+        "regDate": f"2024-01-{day:02d}",
+        "categoryCode": category,
+        "valid": "Y",
+        "no": "1",
+        "localId": f"PH{local_id}",
+    })
+
+
+@pytest.fixture
+def record_index(monkeypatch):
+    """record_index 테이블 대신 메모리 dict 사용"""
+    store: dict[str, tuple[int, str]] = {}
+    monkeypatch.setattr(au, "load_record_index", lambda store_name, source: dict(store))
+    monkeypatch.setattr(au, "save_record_index", lambda store_name, source, entries: store.update(entries) or None)
+    return store
+
+
+def test_shared_category_code_is_not_identity():
+    record = make_record(1, 1)
+    assert au.record_identity(record) == "localId=PH1"
+
+
+def test_source_id_key_takes_priority():
+    record = au.normalize_record({"title": "공연", "categoryCode": "CAT01", "perfNo": "P-77", "localId": "L1"})
+    assert au.record_identity(record, id_key="perfNo") == "perfNo=P-77"
+
+
+def test_shared_code_without_id_falls_back_to_link():
+    record = au.normalize_record({"title": "공지", "categoryCode": "CAT01", "url": "http://x/1"})
+    assert au.record_identity(record) == "link=http://x/1"
+
+
+def test_insert_keeps_part_assignment(record_index):
+    records = au.sort_records_by_date([make_record(i, i % 28 + 1) for i in range(30)])
+    au.create_stable_chunks(records, basename="src", store_name="S", batch_size=10)
+    before = dict(record_index)
+
+    # 같은 분류 코드를 가진 최신 레코드가 맨 앞에 끼어들어도 기존 레코드의 식별자/파트는 그대로
+    records = au.sort_records_by_date(records + [make_record(100, 28)])
+    au.create_stable_chunks(records, basename="src", store_name="S", batch_size=10)
+
+    assert {rid: record_index[rid] for rid in before} == before
+    assert len(record_index) == len(before) + 1
+
+
+def test_duplicate_identity_is_stable_across_inserts(record_index):
+    # 식별 필드 없이 같은 링크를 공유하는 레코드는 내용 해시로 구분 (날짜 순번으로 밀리지 않음)
+    def shared_link(n: int, day: int) -> dict:
+        return au.normalize_record({"title": f"행사 {n}", "regDate": f"2024-02-{day:02d}", "url": "http://x/list"})
+
+    records = au.sort_records_by_date([shared_link(i, i + 1) for i in range(5)])
+    au.create_stable_chunks(records, basename="src", store_name="S", batch_size=2)
+    before = dict(record_index)
+
+    records = au.sort_records_by_date(records + [shared_link(99, 20)])
+    au.create_stable_chunks(records, basename="src", store_name="S", batch_size=2)
+
+    assert {rid: record_index[rid] for rid in before} == before